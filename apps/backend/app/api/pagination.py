@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from app.persistence.async_repositories import Keyset
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Opaque; pass back as `after` to get the next page. None on the last page.
+    next_cursor: str | None
+
+
+class PageParams:
+    """`?limit=&after=` query parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(default=50, ge=1, le=200, description="maximum number of items"),
+        after: str | None = Query(default=None, description="next_cursor of the previous page"),
+    ) -> None:
+        self.limit = limit
+        self.after = decode_cursor(after) if after else None
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, row_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def build_page(
+    rows: Sequence[R], params: PageParams, key: Callable[[R], Keyset], item: Callable[[R], T]
+) -> Page[T]:
+    """Page from up to `limit + 1` fetched rows; the extra row only signals that more exist."""
+
+    rows = rows[: params.limit + 1]
+    next_cursor = encode_cursor(*key(rows[params.limit - 1])) if len(rows) > params.limit else None
+    return Page(items=[item(row) for row in rows[: params.limit]], next_cursor=next_cursor)
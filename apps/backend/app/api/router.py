@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from app.api.routes import commands, executions, projects
+from app.api.routes import commands, executions, metrics, plans, projects
 
 
 api_router = APIRouter()
 
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
+api_router.include_router(plans.router, prefix="/plans", tags=["plans"])
 api_router.include_router(commands.router, prefix="/commands", tags=["commands"])
 api_router.include_router(executions.router, prefix="/executions", tags=["executions"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -1,26 +1,73 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Annotated
 
-from app.persistence.db import session_scope
-from app.persistence.repositories import (
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from rq import Queue
+from rq.job import Job
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.pagination import Page, PageParams, build_page
+from app.common.settings import settings
+from app.persistence.async_repositories import (
     create_execution,
+    create_executions,
+    get_archived_execution,
     get_execution,
+    get_execution_log_cursor,
     get_plan,
+    get_plans,
+    list_execution_log_chunks,
+    list_executions,
+    read_archived_log,
+    read_execution_log,
     update_plan_status,
+    update_plan_statuses,
 )
-from app.queue.queue import get_queue
-
+from app.persistence.db import get_session
+from app.persistence.log_codec import IDENTITY, decompress_log_bytes
+from app.persistence.models import ArchivedExecution
+from app.queue.events import (
+    TERMINAL_STATUSES,
+    ExecutionEvent,
+    ExecutionEventBroker,
+    ExecutionEventPublisher,
+)
+from app.queue.queue import get_queue, lane_for_plan
+from app.queue.redis_conn import get_async_redis
 
 router = APIRouter()
 
+STREAM_ID_PATTERN = re.compile(r"\d+-\d+")
+
 
 class ApproveResponse(BaseModel):
     execution_id: int
     rq_job_id: str
 
 
+class BatchApproveRequest(BaseModel):
+    plan_ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class BatchApproveResult(BaseModel):
+    plan_id: int
+    status_code: int  # what POST /approve/{plan_id} would have returned
+    detail: str | None = None
+    execution_id: int | None = None
+    rq_job_id: str | None = None
+
+
+class BatchApproveResponse(BaseModel):
+    results: list[BatchApproveResult]
+
+
 class ExecutionResponse(BaseModel):
     id: int
     plan_id: int
@@ -28,35 +75,360 @@ class ExecutionResponse(BaseModel):
     logs: str
 
 
+class ExecutionSummary(BaseModel):
+    id: int
+    plan_id: int
+    project_id: int | None
+    command: str | None
+    status: str
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class ExecutionStatusResponse(BaseModel):
+    id: int
+    plan_id: int
+    status: str
+    started_at: datetime | None
+    finished_at: datetime | None
+    log_cursor: int | None
+
+
+class ExecutionLogPage(BaseModel):
+    execution_id: int
+    status: str
+    lines: list[str]
+    byte_offset: int | None
+    next_cursor: int | None
+    has_more: bool
+
+
+async def _archived_or_404(session: AsyncSession, execution_id: int) -> ArchivedExecution:
+    # Executions moved to cold storage by the archiver are still served, read-only.
+    archived = await get_archived_execution(session, execution_id)
+    if archived is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return archived
+
+
+def _accepts_encoding(accept_encoding: str | None, encoding: str) -> bool:
+    # Accept-Encoding: "gzip, deflate, br, zstd" or "gzip;q=1.0, *;q=0".
+    accepted: dict[str, bool] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        accepted[name.strip().lower()] = params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return accepted.get(encoding, accepted.get("*", False))
+
+
+def _enqueue_execution(execution_id: int, lane: str) -> Job:
+    queue = get_queue(lane)
+    # Published first: an idle worker may report "running" before enqueue() returns.
+    ExecutionEventPublisher(queue.connection).publish_status(execution_id, "queued")
+    return queue.enqueue("app.queue.tasks.execute_plan", execution_id)
+
+
+def _enqueue_executions(executions: list[tuple[int, str]]) -> list[Job]:
+    # One pipeline for the "queued" events, one more for every job in every lane.
+    queues = {lane: get_queue(lane) for _, lane in executions}
+    connection = next(iter(queues.values())).connection
+    execution_ids = [execution_id for execution_id, _ in executions]
+    # Published first: an idle worker may report "running" before the jobs pipeline returns.
+    ExecutionEventPublisher(connection).publish_status_many(execution_ids, "queued")
+    jobs: dict[int, Job] = {}
+    with connection.pipeline() as pipe:
+        for lane, queue in queues.items():
+            lane_ids = [execution_id for execution_id, job_lane in executions if job_lane == lane]
+            enqueued = queue.enqueue_many(
+                [Queue.prepare_data("app.queue.tasks.execute_plan", (execution_id,)) for execution_id in lane_ids],
+                pipeline=pipe,
+            )
+            jobs.update(zip(lane_ids, enqueued, strict=True))
+        pipe.execute()
+    return [jobs[execution_id] for execution_id in execution_ids]
+
+
+@router.get("", response_model=Page[ExecutionSummary])
+async def list_executions_endpoint(
+    page: Annotated[PageParams, Depends()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    project_id: int | None = None,
+    status: str | None = None,
+) -> Page[ExecutionSummary]:
+    rows = await list_executions(
+        session, project_id=project_id, status=status, after=page.after, limit=page.limit + 1
+    )
+    return build_page(
+        rows,
+        page,
+        key=lambda row: (row[0].created_at, row[0].id or 0),
+        item=lambda row: ExecutionSummary(
+            id=row[0].id or 0,
+            plan_id=row[0].plan_id,
+            project_id=row[0].project_id,
+            command=row[1],
+            status=row[0].status,
+            created_at=row[0].created_at,
+            started_at=row[0].started_at,
+            finished_at=row[0].finished_at,
+        ),
+    )
+
+
 @router.post("/approve/{plan_id}", response_model=ApproveResponse)
-def approve_plan(plan_id: int) -> ApproveResponse:
-    with session_scope() as session:
-        plan = get_plan(session, plan_id)
-        if plan is None:
-            raise HTTPException(status_code=404, detail="Plan not found")
+async def approve_plan(plan_id: int, session: Annotated[AsyncSession, Depends(get_session)]) -> ApproveResponse:
+    plan = await get_plan(session, plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
 
-        if plan.status != "pending_approval":
-            raise HTTPException(status_code=409, detail=f"Plan status is {plan.status}")
+    if plan.status != "pending_approval":
+        raise HTTPException(status_code=409, detail=f"Plan status is {plan.status}")
 
-        update_plan_status(session, plan, "approved")
-        execution = create_execution(session, plan_id)
+    await update_plan_status(session, plan, "approved")
+    execution = await create_execution(session, plan_id)
+    # The worker may pick the job up immediately; it must see the execution row.
+    await session.commit()
 
-    queue = get_queue()
-    job = queue.enqueue("app.queue.tasks.execute_plan", execution.id)
+    # RQ and the event publisher use blocking Redis clients; keep them off the event loop.
+    job = await run_in_threadpool(_enqueue_execution, execution.id or 0, lane_for_plan(plan))
 
     return ApproveResponse(execution_id=execution.id or 0, rq_job_id=job.id)
 
 
-@router.get("/{execution_id}", response_model=ExecutionResponse)
-def get_execution_endpoint(execution_id: int) -> ExecutionResponse:
-    with session_scope() as session:
-        execution = get_execution(session, execution_id)
-        if execution is None:
-            raise HTTPException(status_code=404, detail="Execution not found")
+@router.post("/approve", response_model=BatchApproveResponse)
+async def approve_plans(
+    body: BatchApproveRequest, session: Annotated[AsyncSession, Depends(get_session)]
+) -> BatchApproveResponse:
+    """Approve many plans at once, e.g. a release train.
+
+    Every approvable plan moves to `approved` in one transaction and all jobs,
+    whatever their priority lane, are enqueued in one Redis pipeline. Plans
+    that cannot be approved are reported per plan and do not stop the others.
+    """
 
+    plans = await get_plans(session, body.plan_ids)
+    results: dict[int, BatchApproveResult] = {}
+    approvable = []
+    for plan_id in body.plan_ids:
+        if plan_id in results:  # listed twice: approve once
+            continue
+        plan = plans.get(plan_id)
+        if plan is None:
+            results[plan_id] = BatchApproveResult(plan_id=plan_id, status_code=404, detail="Plan not found")
+        elif plan.status != "pending_approval":
+            results[plan_id] = BatchApproveResult(
+                plan_id=plan_id, status_code=409, detail=f"Plan status is {plan.status}"
+            )
+        else:
+            results[plan_id] = BatchApproveResult(plan_id=plan_id, status_code=200)
+            approvable.append(plan)
+
+    if approvable:
+        await update_plan_statuses(session, approvable, "approved")
+        executions = await create_executions(session, approvable)
+        # The worker may pick the jobs up immediately; it must see the execution rows.
+        await session.commit()
+
+        lanes = [
+            (execution.id or 0, lane_for_plan(plan))
+            for execution, plan in zip(executions, approvable, strict=True)
+        ]
+        jobs = await run_in_threadpool(_enqueue_executions, lanes)
+        for plan, (execution_id, _), job in zip(approvable, lanes, jobs, strict=True):
+            results[plan.id].execution_id = execution_id
+            results[plan.id].rq_job_id = job.id
+
+    return BatchApproveResponse(results=list(results.values()))
+
+
+@router.get("/{execution_id}", response_model=ExecutionResponse)
+async def get_execution_endpoint(
+    execution_id: int, session: Annotated[AsyncSession, Depends(get_session)]
+) -> ExecutionResponse:
+    execution = await get_execution(session, execution_id)
+    if execution is None:
+        archived = await _archived_or_404(session, execution_id)
         return ExecutionResponse(
-            id=execution.id or 0,
-            plan_id=execution.plan_id,
-            status=execution.status,
-            logs=execution.logs or "",
+            id=archived.id, plan_id=archived.plan_id, status=archived.status, logs=read_archived_log(archived)
+        )
+
+    return ExecutionResponse(
+        id=execution.id or 0,
+        plan_id=execution.plan_id,
+        status=execution.status,
+        logs=await read_execution_log(session, execution),
+    )
+
+
+def get_event_broker(request: Request) -> ExecutionEventBroker:
+    broker = getattr(request.app.state, "event_broker", None)
+    if broker is None:
+        broker = ExecutionEventBroker(get_async_redis())
+        request.app.state.event_broker = broker
+    return broker
+
+
+@router.get("/{execution_id}/stream")
+async def stream_execution_endpoint(
+    execution_id: int,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    broker: Annotated[ExecutionEventBroker, Depends(get_event_broker)],
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    """Server-Sent Events feed of `log` and `status` events for one execution.
+
+    Event ids are Redis Stream ids; browsers send the last one back as
+    `Last-Event-ID` on reconnect and the stream resumes after it.
+    """
+
+    if last_event_id and not STREAM_ID_PATTERN.fullmatch(last_event_id):
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    execution = await get_execution(session, execution_id)
+    archived = await _archived_or_404(session, execution_id) if execution is None else None
+    status = archived.status if archived is not None else execution.status
+
+    # A finished execution with nothing left to replay would never see another
+    # event: answer from the database instead of subscribing.
+    if status in TERMINAL_STATUSES and not await broker.replay(execution_id, last_event_id):
+        events = [ExecutionEvent(id=None, type="status", data={"status": status})]
+        if not (last_event_id and await broker.has_events(execution_id)):
+            # The stream expired (otherwise the viewer has already seen every line).
+            if archived is not None:
+                snapshot = read_archived_log(archived)
+            else:
+                snapshot = await read_execution_log(session, execution)
+            events.insert(0, ExecutionEvent(id=None, type="log", data={"lines": snapshot.splitlines()}))
+
+        async def snapshot_stream() -> AsyncIterator[str]:
+            for event in events:
+                yield event.to_sse()
+
+        return StreamingResponse(
+            snapshot_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
         )
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event in broker.subscribe(
+            execution_id,
+            last_event_id=last_event_id,
+            heartbeat=settings.event_stream_heartbeat_seconds,
+        ):
+            yield ": keepalive\n\n" if event is None else event.to_sse()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{execution_id}/status", response_model=ExecutionStatusResponse)
+async def get_execution_status_endpoint(
+    execution_id: int, session: Annotated[AsyncSession, Depends(get_session)]
+) -> ExecutionStatusResponse:
+    execution = await get_execution(session, execution_id)
+    if execution is None:
+        archived = await _archived_or_404(session, execution_id)
+        return ExecutionStatusResponse(
+            id=archived.id,
+            plan_id=archived.plan_id,
+            status=archived.status,
+            started_at=archived.started_at,
+            finished_at=archived.finished_at,
+            # The archived log is one blob; /logs serves it as chunk 0.
+            log_cursor=0 if archived.log_size else None,
+        )
+
+    return ExecutionStatusResponse(
+        id=execution.id or 0,
+        plan_id=execution.plan_id,
+        status=execution.status,
+        started_at=execution.started_at,
+        finished_at=execution.finished_at,
+        log_cursor=await get_execution_log_cursor(session, execution_id),
+    )
+
+
+@router.get("/{execution_id}/logs", response_model=ExecutionLogPage)
+async def get_execution_logs_endpoint(
+    execution_id: int,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    after: int | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=200, ge=1, le=1000, description="maximum number of log chunks"),
+) -> ExecutionLogPage:
+    """Return only the log written after `after`.
+
+    Reads go through the (execution_id, seq) index, so the cost is proportional
+    to the returned delta rather than to the total log size. A page holds at
+    most `limit` chunks and LOG_PAGE_MAX_BYTES of log, but always one chunk.
+    """
+
+    execution = await get_execution(session, execution_id)
+    if execution is None:
+        archived = await _archived_or_404(session, execution_id)
+        first_page = after is None or after < 0
+        return ExecutionLogPage(
+            execution_id=execution_id,
+            status=archived.status,
+            lines=read_archived_log(archived).splitlines() if first_page else [],
+            byte_offset=0 if first_page else None,
+            next_cursor=0 if first_page else after,
+            has_more=False,
+        )
+
+    # Fetch one extra chunk to learn whether another page follows.
+    max_bytes = settings.log_page_max_bytes
+    fetched = await list_execution_log_chunks(
+        session, execution_id, after_seq=after, limit=limit + 1, max_bytes=max_bytes
+    )
+    chunks = fetched[:1]
+    for chunk in fetched[1:limit]:
+        if chunk.byte_offset + len(chunk.payload.encode("utf-8")) > fetched[0].byte_offset + max_bytes:
+            break
+        chunks.append(chunk)
+    has_more = len(fetched) > len(chunks)
+
+    lines: list[str] = []
+    for chunk in chunks:
+        lines.extend(chunk.payload.splitlines())
+
+    return ExecutionLogPage(
+        execution_id=execution_id,
+        status=execution.status,
+        lines=lines,
+        byte_offset=chunks[0].byte_offset if chunks else None,
+        next_cursor=chunks[-1].seq if chunks else after,
+        has_more=has_more,
+    )
+
+
+@router.get("/{execution_id}/logs/raw", response_class=Response)
+async def get_execution_raw_log_endpoint(
+    execution_id: int,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """The whole log as plain text.
+
+    A finished execution's log is stored compressed; when the client accepts
+    that encoding the stored bytes are sent as they are, with
+    `Content-Encoding`, and the client decompresses them.
+    """
+
+    execution = await get_execution(session, execution_id)
+    if execution is None:
+        archived = await _archived_or_404(session, execution_id)
+        blob, encoding = archived.log_blob, archived.log_encoding
+    elif execution.log_chunks and await get_execution_log_cursor(session, execution_id) == execution.log_chunks[-1][0]:
+        blob, encoding = execution.log_blob, execution.log_encoding
+    else:
+        # Still running (or lines were appended after it finished): assemble the text.
+        blob, encoding = (await read_execution_log(session, execution)).encode("utf-8"), IDENTITY
+
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != IDENTITY and _accepts_encoding(accept_encoding, encoding):
+        headers["Content-Encoding"] = encoding
+    elif encoding != IDENTITY:
+        blob = decompress_log_bytes(blob, encoding)
+    return Response(blob, media_type="text/plain; charset=utf-8", headers=headers)
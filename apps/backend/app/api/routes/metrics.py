@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.queue.redis_conn import get_redis
+from app.services.deployers.throttle import read_http_metrics
+
+router = APIRouter()
+
+PROVIDERS = ["vercel", "render"]
+
+
+class ProviderHttpMetrics(BaseModel):
+    requests: int
+    throttled: int
+    throttle_wait_ms: int
+    rate_limited: int
+    retries: int
+    retries_exhausted: int
+
+
+@router.get("/deployers", response_model=dict[str, ProviderHttpMetrics])
+def deployer_metrics_endpoint(redis: Annotated[Redis, Depends(get_redis)]) -> dict[str, ProviderHttpMetrics]:
+    """Provider HTTP counters summed across worker processes (flushed every few seconds)."""
+
+    try:
+        metrics = read_http_metrics(redis, PROVIDERS)
+    except RedisError as exc:
+        raise HTTPException(status_code=503, detail=f"Metrics unavailable: {exc}") from exc
+    return {provider: ProviderHttpMetrics(**asdict(values)) for provider, values in metrics.items()}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.pagination import Page, PageParams, build_page
+from app.persistence.async_repositories import list_plans
+from app.persistence.db import get_session
+from app.persistence.models import Plan
+
+router = APIRouter()
+
+
+class PlanSummary(BaseModel):
+    id: int
+    project_id: int
+    raw_command: str
+    action: str
+    version: str | None
+    environments: list[str]
+    status: str
+    created_at: datetime
+
+
+def _summary(plan: Plan) -> PlanSummary:
+    return PlanSummary(
+        id=plan.id or 0,
+        project_id=plan.project_id,
+        raw_command=plan.raw_command,
+        action=plan.action,
+        version=plan.version,
+        environments=plan.environments,
+        status=plan.status,
+        created_at=plan.created_at,
+    )
+
+
+@router.get("", response_model=Page[PlanSummary])
+async def list_plans_endpoint(
+    page: Annotated[PageParams, Depends()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    project_id: int | None = None,
+    status: str | None = None,
+    environment: str | None = Query(default=None, description="only plans deploying to this environment"),
+) -> Page[PlanSummary]:
+    plans = await list_plans(
+        session,
+        project_id=project_id,
+        status=status,
+        environment=environment,
+        after=page.after,
+        limit=page.limit + 1,
+    )
+    return build_page(plans, page, key=lambda p: (p.created_at, p.id or 0), item=_summary)
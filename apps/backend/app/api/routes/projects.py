@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.persistence.db import session_scope
-from app.persistence.repositories import create_project, list_projects
+from app.api.pagination import Page, PageParams, build_page
+from app.persistence.async_repositories import create_project, list_projects
+from app.persistence.db import get_session
 
 
 router = APIRouter()
@@ -24,20 +28,24 @@ class ProjectResponse(BaseModel):
 
 
 @router.post("", response_model=ProjectResponse)
-def create_project_endpoint(payload: ProjectCreateRequest) -> ProjectResponse:
+async def create_project_endpoint(
+    payload: ProjectCreateRequest, session: Annotated[AsyncSession, Depends(get_session)]
+) -> ProjectResponse:
     if not payload.repo_path and not payload.repo_url:
         raise HTTPException(status_code=400, detail="Provide repo_path or repo_url")
 
-    with session_scope() as session:
-        project = create_project(session, payload.name, payload.repo_path, payload.repo_url)
-        return ProjectResponse(id=project.id or 0, name=project.name, repo_path=project.repo_path, repo_url=project.repo_url)
-
-
-@router.get("", response_model=list[ProjectResponse])
-def list_projects_endpoint() -> list[ProjectResponse]:
-    with session_scope() as session:
-        projects = list_projects(session)
-        return [
-            ProjectResponse(id=p.id or 0, name=p.name, repo_path=p.repo_path, repo_url=p.repo_url)
-            for p in projects
-        ]
+    project = await create_project(session, payload.name, payload.repo_path, payload.repo_url)
+    return ProjectResponse(id=project.id or 0, name=project.name, repo_path=project.repo_path, repo_url=project.repo_url)
+
+
+@router.get("", response_model=Page[ProjectResponse])
+async def list_projects_endpoint(
+    page: Annotated[PageParams, Depends()], session: Annotated[AsyncSession, Depends(get_session)]
+) -> Page[ProjectResponse]:
+    projects = await list_projects(session, after=page.after, limit=page.limit + 1)
+    return build_page(
+        projects,
+        page,
+        key=lambda p: (p.created_at, p.id or 0),
+        item=lambda p: ProjectResponse(id=p.id or 0, name=p.name, repo_path=p.repo_path, repo_url=p.repo_url),
+    )
@@ -36,10 +36,75 @@ class Settings(BaseSettings):
     # Storage
     data_dir: Path = Path("./data")
     database_url: str = "sqlite:///./data/dev.db"  # maps to DATABASE_URL
+    # Apply pending schema migrations when the API/tracker starts. Turn off
+    # where migrations are run as a deploy step (`python -m app.persistence.schema upgrade`).
+    db_auto_migrate: bool = True
+
+    # SQLite tuning (ignored for other databases). "performance" applies the
+    # pragmas below on every connection; "default" leaves SQLite's defaults.
+    sqlite_profile: str = "performance"  # performance | default
+    sqlite_journal_mode: str = "WAL"  # readers no longer block on the worker's writes
+    sqlite_synchronous: str = "NORMAL"  # safe with WAL; fsync at checkpoints only
+    sqlite_busy_timeout_ms: int = 5000  # wait this long for a lock before "database is locked"
+    sqlite_cache_size_kib: int = 64 * 1024  # page cache per connection
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+
+    # Postgres / pooled connections (ignored for SQLite). Each process (API,
+    # every worker, tracker) has its own pool of up to size + overflow
+    # connections, sync and async engines separately; keep the total under
+    # the server's max_connections.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0  # wait for a free pooled connection before erroring
+    db_pool_recycle_seconds: int = 1800  # reconnect before idle/NAT timeouts drop the socket
+    # Pre-ping costs a round trip per checkout. Recycling plus TCP keepalives
+    # catches most dead connections; a disconnect error invalidates the pool.
+    db_pool_pre_ping: bool = False
+    # Open a connection per session instead, e.g. behind PgBouncer in
+    # transaction mode; also used by the tests, where each TestClient request
+    # runs on its own event loop and asyncpg connections cannot cross loops.
+    db_disable_pool: bool = False
+    db_statement_timeout_ms: int = 30_000  # per statement; 0 disables
+    db_idle_in_transaction_timeout_ms: int = 60_000  # 0 disables
+    db_log_read_batch_rows: int = 500  # log chunks fetched per round trip when streaming a full log
+
+    # Execution logs
+    log_flush_bytes: int = 64 * 1024
+    log_flush_interval_ms: int = 250
+    log_page_max_bytes: int = 1024 * 1024  # per /logs page; a page always holds at least one chunk
+    event_stream_maxlen: int = 10_000  # entries kept per execution event stream
+    event_stream_ttl_seconds: int = 24 * 3600
+    event_stream_heartbeat_seconds: float = 15.0
+    process_output_buffer_bytes: int = 1024 * 1024  # in-memory cap per subprocess before spilling
+    log_compression: str = "zstd"  # zstd | gzip | none; zstd falls back to gzip if not installed
+    log_compression_level: int = 3  # zstd level
+
+    # Archival: finished executions (and plans with no executions left) older
+    # than this move to the archive tables with their logs compressed.
+    archive_after_days: int = 30  # 0 disables archival
+    archive_batch_size: int = 200  # executions moved per transaction
+    archive_interval_seconds: float = 3600.0  # `python -m app.queue.archiver --loop`
 
     # Queue
     redis_url: str = "redis://localhost:6379"
-    rq_queue_name: str = "ai-devops"
+    rq_queue_name: str = "ai-devops"  # prefix of the lanes: ai-devops:critical|default|bulk
+    queue_critical_environments: str = "production"  # plans targeting any of these jump the queue
+    queue_critical_actions: str = "rollback"
+    queue_bulk_environments: str = "dev,preview"  # plans targeting only these yield to everything else
+    redis_max_connections: int = 50  # per process, shared by every get_redis() client
+    redis_pool_timeout_seconds: float = 5.0  # wait for a free connection before failing
+    redis_socket_keepalive: bool = True
+    redis_connect_timeout_seconds: float = 5.0
+    redis_health_check_interval_seconds: int = 30  # PING connections idle longer than this before use
+
+    # Worker supervisor (python -m app.queue.worker --processes auto)
+    worker_min_processes: int = 1
+    worker_max_processes: int = 0  # 0 = one per CPU core
+    worker_scale_up_wait_seconds: float = 2.0  # add workers once the oldest queued job waited this long
+    worker_scale_down_idle_seconds: float = 60.0  # stop idle workers once the queues stayed empty this long
+    worker_supervisor_interval_seconds: float = 1.0
+    worker_mode: str = "fork"  # fork | warm: run jobs in the worker process, no per-job fork
+    worker_recycle_after_jobs: int = 500  # a warm worker exits (and is restarted) after this many jobs; 0 never
 
     # LLM
     llm_provider: str = "OPENAI"  # OLLAMA | OPENAI | GEMINI
@@ -60,6 +125,32 @@ class Settings(BaseSettings):
     vercel_project_id: str | None = None
     render_api_key: str | None = None
     render_service_id: str | None = None
+    http_timeout_seconds: float = 60.0
+    http_max_connections: int = 20  # per provider base URL
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http_http2: bool = False  # requires the optional `h2` package
+    http_rate_limit_backend: str = "redis"  # redis (shared by all processes) | local
+    http_rate_limit_per_second: float = 10.0  # per provider; 0 disables client-side limiting
+    http_rate_limit_burst: int = 20
+    http_max_retries: int = 3
+    http_retry_base_delay_seconds: float = 0.5  # full-jitter exponential backoff base
+    http_retry_max_delay_seconds: float = 30.0  # longer Retry-After values fail instead of waiting
+    http_retry_budget_ratio: float = 0.1  # retry tokens earned back per successful request
+    provider_cache_backend: str = "memory"  # memory | redis (also shared across workers)
+    provider_cache_max_entries: int = 256
+    provider_cache_ttl_seconds: float = 300.0  # project/service metadata
+    provider_cache_latest_ttl_seconds: float = 60.0  # latest-deployment pointers (redeploy source)
+    deploy_max_parallelism: int = 4  # environments deployed concurrently per plan
+    deploy_gated_environments: str = "production"  # start only after all other environments succeed
+
+    # Deployment status tracker (python -m app.queue.tracker)
+    tracker_poll_interval_seconds: float = 2.0  # how often due deployments are looked up
+    tracker_initial_backoff_seconds: float = 5.0
+    tracker_max_backoff_seconds: float = 300.0
+    tracker_batch_size: int = 100  # deployments polled per tick
+    tracker_max_concurrency: int = 10  # concurrent provider requests when a provider cannot batch
+    tracker_timeout_seconds: float = 3600.0  # give up and mark the deployment failed
 
     # Safety
     dry_run: bool = True
@@ -75,9 +166,13 @@ def get_database_url() -> str:
     Supports:
     - sqlite:///./data/dev.db
     - file:./data/dev.db (common in JS ecosystems)
+    - postgres://... / postgresql://... (mapped to the psycopg 3 driver)
     """
 
     url = settings.database_url
+    scheme, sep, rest = url.partition("://")
+    if sep and scheme in ("postgres", "postgresql"):
+        return f"postgresql+psycopg://{rest}"
     if url.startswith("file:"):
         # Convert to SQLAlchemy SQLite URL
         path = url.removeprefix("file:")
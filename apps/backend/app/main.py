@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,13 +10,27 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
 from app.common.logging import configure_logging, logger
 from app.common.settings import settings
-from app.persistence.db import init_db
+from app.persistence.db import async_engine, init_db
+from app.queue.redis_conn import close_redis_pool
+from app.services.deployers import aclose_http_clients, close_http_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    broker = getattr(app.state, "event_broker", None)
+    if broker is not None:
+        await broker.close()
+    close_http_clients()
+    await aclose_http_clients()
+    close_redis_pool()
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
     configure_logging(os.getenv("LOG_LEVEL", "INFO"))
 
-    app = FastAPI(title="AI DevOps Commander API", version="0.0.1")
+    app = FastAPI(title="AI DevOps Commander API", version="0.0.1", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
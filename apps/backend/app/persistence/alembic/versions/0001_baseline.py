@@ -0,0 +1,122 @@
+"""baseline
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 04:58:58.775470
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_JSON = sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("repo_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("repo_url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_project_created_at_id", "project", ["created_at", "id"])
+
+    op.create_table(
+        "plan",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("raw_command", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("action", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("version", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("environments_json", _JSON, nullable=False),
+        sa.Column("post_steps_json", _JSON, nullable=False),
+        sa.Column("warnings_json", _JSON, nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_plan_project_id", "plan", ["project_id"])
+    op.create_index("ix_plan_created_at_id", "plan", ["created_at", "id"])
+    op.create_index("ix_plan_project_id_created_at_id", "plan", ["project_id", "created_at", "id"])
+    op.create_index("ix_plan_status_created_at_id", "plan", ["status", "created_at", "id"])
+
+    # Indexed "plans touching an environment" (not part of the models; see
+    # async_repositories._targets_environment).
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute('CREATE INDEX ix_plan_environments_json ON "plan" USING gin (environments_json jsonb_path_ops)')
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            'ALTER TABLE "plan" ADD COLUMN targets_production INTEGER GENERATED ALWAYS AS '
+            "(instr(environments_json, '\"production\"') > 0) VIRTUAL"
+        )
+        op.execute('CREATE INDEX ix_plan_targets_production_created_at_id ON "plan" (targets_production, created_at, id)')
+
+    op.create_table(
+        "execution",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("plan_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("logs", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_execution_plan_id", "execution", ["plan_id"])
+    op.create_index("ix_execution_created_at_id", "execution", ["created_at", "id"])
+    op.create_index("ix_execution_project_id_created_at_id", "execution", ["project_id", "created_at", "id"])
+    op.create_index("ix_execution_status_created_at_id", "execution", ["status", "created_at", "id"])
+
+    op.create_table(
+        "executionlogchunk",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("execution_id", sa.Integer(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("byte_offset", sa.Integer(), nullable=False),
+        sa.Column("payload", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("execution_id", "seq", name="uq_executionlogchunk_execution_seq"),
+    )
+
+    op.create_table(
+        "trackeddeployment",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("execution_id", sa.Integer(), nullable=False),
+        sa.Column("provider", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("environment", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("deployment_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("provider_status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("state", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_poll_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_checked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_trackeddeployment_execution_id", "trackeddeployment", ["execution_id"])
+    op.create_index("ix_trackeddeployment_state_next_poll_at", "trackeddeployment", ["state", "next_poll_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("trackeddeployment")
+    op.drop_table("executionlogchunk")
+    op.drop_table("execution")
+    op.drop_table("plan")
+    op.drop_table("project")
@@ -0,0 +1,38 @@
+"""compressed execution logs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 05:07:15.029167
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_JSON = sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+
+
+def upgrade() -> None:
+    op.add_column("execution", sa.Column("log_encoding", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column("execution", sa.Column("log_size", sa.Integer(), nullable=True))
+    op.add_column("execution", sa.Column("log_blob", sa.LargeBinary(), nullable=True))
+    op.add_column("execution", sa.Column("log_chunks_json", _JSON, nullable=True))
+
+
+def downgrade() -> None:
+    # SQLite can only drop columns by rebuilding the table.
+    with op.batch_alter_table("execution") as batch_op:
+        batch_op.drop_column("log_chunks_json")
+        batch_op.drop_column("log_blob")
+        batch_op.drop_column("log_size")
+        batch_op.drop_column("log_encoding")
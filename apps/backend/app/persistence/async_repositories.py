@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import cast, exists, func, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.persistence import repositories
+from app.persistence.log_codec import decompress_log
+from app.persistence.models import ArchivedExecution, Execution, ExecutionLogChunk, Plan, Project
+
+# Async variants of `repositories` for the API's AsyncSession. Reads on hot
+# request paths are native; writes run the sync implementation through
+# `AsyncSession.run_sync`, so the API and the worker share one copy of the
+# write logic.
+
+
+async def create_project(
+    session: AsyncSession, name: str, repo_path: str | None, repo_url: str | None
+) -> Project:
+    return await session.run_sync(repositories.create_project, name, repo_path, repo_url)
+
+
+# Position of the last row of a page: (created_at, id) of that row.
+Keyset = tuple[datetime, int]
+
+
+def _newest_first(statement, model, after: Keyset | None, limit: int):
+    # Keyset pagination: seek past the previous page instead of OFFSET, so the
+    # cost of a page does not grow with how far into the list it is.
+    if after is not None:
+        statement = statement.where(tuple_(model.created_at, model.id) < after)
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+async def list_projects(session: AsyncSession, *, after: Keyset | None = None, limit: int = 50) -> list[Project]:
+    return list((await session.exec(_newest_first(select(Project), Project, after, limit))).all())
+
+
+async def get_project(session: AsyncSession, project_id: int) -> Project | None:
+    return await session.get(Project, project_id)
+
+
+async def create_plan(
+    session: AsyncSession,
+    *,
+    project_id: int,
+    raw_command: str,
+    action: str,
+    version: str | None,
+    environments: list[str],
+    post_steps: list[str],
+    warnings: list[str],
+) -> Plan:
+    return await session.run_sync(
+        lambda sync_session: repositories.create_plan(
+            sync_session,
+            project_id=project_id,
+            raw_command=raw_command,
+            action=action,
+            version=version,
+            environments=environments,
+            post_steps=post_steps,
+            warnings=warnings,
+        )
+    )
+
+
+async def get_plan(session: AsyncSession, plan_id: int) -> Plan | None:
+    return await session.get(Plan, plan_id)
+
+
+async def get_plans(session: AsyncSession, plan_ids: list[int]) -> dict[int, Plan]:
+    """Plans by id, in one query; ids that do not exist are left out."""
+
+    plans = (await session.exec(select(Plan).where(Plan.id.in_(plan_ids)))).all()
+    return {plan.id: plan for plan in plans}
+
+
+def _targets_environment(dialect: str, environment: str):
+    # Indexed on both databases for production (see migrations._index_plan_environments).
+    if dialect == "postgresql":
+        return Plan.environments.op("@>")(cast([environment], JSONB))
+    if dialect == "sqlite" and environment == "production":
+        return literal_column('"plan".targets_production') == 1
+    values = func.json_each(Plan.environments).table_valued("value")
+    return exists().where(values.c.value == environment)
+
+
+async def list_plans(
+    session: AsyncSession,
+    *,
+    project_id: int | None = None,
+    status: str | None = None,
+    environment: str | None = None,
+    after: Keyset | None = None,
+    limit: int = 50,
+) -> list[Plan]:
+    statement = select(Plan)
+    if project_id is not None:
+        statement = statement.where(Plan.project_id == project_id)
+    if status is not None:
+        statement = statement.where(Plan.status == status)
+    if environment is not None:
+        statement = statement.where(_targets_environment(session.bind.dialect.name, environment))
+    return list((await session.exec(_newest_first(statement, Plan, after, limit))).all())
+
+
+async def update_plan_status(session: AsyncSession, plan: Plan, status: str) -> Plan:
+    return await session.run_sync(repositories.update_plan_status, plan, status)
+
+
+async def update_plan_statuses(session: AsyncSession, plans: list[Plan], status: str) -> None:
+    def update(sync_session) -> None:
+        for plan in plans:
+            repositories.update_plan_status(sync_session, plan, status)
+
+    await session.run_sync(update)
+
+
+async def create_execution(session: AsyncSession, plan_id: int) -> Execution:
+    return await session.run_sync(repositories.create_execution, plan_id)
+
+
+async def create_executions(session: AsyncSession, plans: list[Plan]) -> list[Execution]:
+    return await session.run_sync(repositories.create_executions, plans)
+
+
+async def get_execution(session: AsyncSession, execution_id: int) -> Execution | None:
+    return await session.get(Execution, execution_id)
+
+
+async def list_executions(
+    session: AsyncSession,
+    *,
+    project_id: int | None = None,
+    status: str | None = None,
+    after: Keyset | None = None,
+    limit: int = 50,
+) -> list[tuple[Execution, str | None]]:
+    """Executions newest first, each with the command text of its plan."""
+
+    statement = select(Execution, Plan.raw_command).outerjoin(Plan, Plan.id == Execution.plan_id)
+    if project_id is not None:
+        statement = statement.where(Execution.project_id == project_id)
+    if status is not None:
+        statement = statement.where(Execution.status == status)
+    return list((await session.exec(_newest_first(statement, Execution, after, limit))).all())
+
+
+async def list_execution_log_chunks(
+    session: AsyncSession,
+    execution_id: int,
+    *,
+    after_seq: int | None = None,
+    limit: int | None = None,
+    max_bytes: int | None = None,
+) -> list[ExecutionLogChunk]:
+    # The execution is normally in the identity map already (routes load it first).
+    execution = await session.get(Execution, execution_id)
+    folded = repositories.compressed_log_chunks(execution, after_seq=after_seq, limit=limit, max_bytes=max_bytes)
+    if limit is not None:
+        limit -= len(folded)
+    statement = repositories.select_log_chunks(execution_id, after_seq=after_seq, limit=limit, max_bytes=max_bytes)
+    return folded + list((await session.exec(statement)).all())
+
+
+async def get_execution_log_cursor(session: AsyncSession, execution_id: int) -> int | None:
+    """Sequence number of the newest chunk, or None if nothing was logged yet."""
+
+    cursor = (
+        await session.exec(
+            select(func.max(ExecutionLogChunk.seq)).where(ExecutionLogChunk.execution_id == execution_id)
+        )
+    ).one()
+    if cursor is None:
+        execution = await session.get(Execution, execution_id)
+        if execution is not None and execution.log_chunks:
+            cursor = execution.log_chunks[-1][0]
+    return cursor
+
+
+async def read_execution_log(session: AsyncSession, execution: Execution) -> str:
+    """Assemble the full log text, including any legacy inline `Execution.logs`."""
+
+    payloads = [execution.logs or "", repositories.read_compressed_log(execution)]
+    async for payload in await session.stream_scalars(repositories.select_log_payloads(execution.id or 0)):
+        payloads.append(payload)
+    return "".join(payloads)
+
+
+async def get_archived_execution(session: AsyncSession, execution_id: int) -> ArchivedExecution | None:
+    return await session.get(ArchivedExecution, execution_id)
+
+
+def read_archived_log(archived: ArchivedExecution) -> str:
+    return decompress_log(archived.log_blob, archived.log_encoding)
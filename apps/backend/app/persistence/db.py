@@ -1,27 +1,177 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.common.settings import get_database_url, settings
+from app.persistence.schema import ensure_schema
+
+
+def _sqlite_pragmas() -> list[str]:
+    if settings.sqlite_profile != "performance":
+        return [f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}"]
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _apply_sqlite_profile(db_engine: Engine) -> None:
+    pragmas = _sqlite_pragmas()
+
+    @event.listens_for(db_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _pool_options() -> dict:
+    if settings.db_disable_pool:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        # Reuse the most recently returned connection so surplus ones sit idle
+        # and get recycled instead of all staying half-warm.
+        "pool_use_lifo": True,
+    }
+
+
+def _postgres_server_settings() -> dict[str, str]:
+    server_settings = {}
+    if settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+    if settings.db_idle_in_transaction_timeout_ms:
+        server_settings["idle_in_transaction_session_timeout"] = str(settings.db_idle_in_transaction_timeout_ms)
+    return server_settings
+
+
+def _postgres_connect_args(*, async_driver: bool) -> dict:
+    server_settings = _postgres_server_settings()
+    if async_driver:  # asyncpg
+        return {"server_settings": server_settings}
+    # psycopg: session settings go in the startup packet, keepalives detect
+    # dead peers without a pre-ping round trip.
+    args: dict = {"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10, "keepalives_count": 3}
+    if server_settings:
+        args["options"] = " ".join(f"-c {name}={value}" for name, value in server_settings.items())
+    return args
+
+
+def create_db_engine(url: str) -> Engine:
+    """Engine for `url`.
+
+    SQLite connections get the configured SQLITE_PROFILE pragmas; other
+    databases get a pool sized by the DB_POOL_* settings and server-side
+    statement timeouts.
+    """
+
+    if not url.startswith("sqlite"):
+        return create_engine(url, connect_args=_postgres_connect_args(async_driver=False), **_pool_options())
+
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+        pool_pre_ping=True,
+    )
+    _apply_sqlite_profile(db_engine)
+    return db_engine
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its async driver (aiosqlite / asyncpg)."""
+
+    scheme, _, rest = url.partition(":")
+    if scheme in ("sqlite", "sqlite+pysqlite"):
+        return f"sqlite+aiosqlite:{rest}"
+    if scheme in ("postgres", "postgresql", "postgresql+psycopg", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg:{rest}"
+    return url
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """Async counterpart of `create_db_engine`, used by the API routes."""
+
+    async_url = get_async_database_url(url)
+    if not async_url.startswith("sqlite"):
+        return create_async_engine(
+            async_url, connect_args=_postgres_connect_args(async_driver=True), **_pool_options()
+        )
+
+    # aiosqlite defaults to NullPool, i.e. a new connection (thread + pragmas) per
+    # session. Pool them instead; no pre-ping is needed for a local file.
+    db_engine = create_async_engine(
+        async_url,
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000},
+        poolclass=AsyncAdaptedQueuePool,
+    )
+    _apply_sqlite_profile(db_engine.sync_engine)
+    return db_engine
 
 
 db_url = get_database_url()
 
-engine = create_engine(
-    db_url,
-    connect_args={"check_same_thread": False} if db_url.startswith("sqlite") else {},
-    pool_pre_ping=True,
-)
+engine = create_db_engine(db_url)
+
+async_engine = create_async_db_engine(db_url)
+
+# Objects stay usable after commit; lazy refreshes would need I/O outside an await.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 def init_db() -> None:
     settings.data_dir.mkdir(parents=True, exist_ok=True)
-    SQLModel.metadata.create_all(engine)
+    ensure_schema(engine)
 
 
 @contextmanager
-def session_scope() -> Session:
-    with Session(engine) as session:
+def session_scope() -> Iterator[Session]:
+    """One unit of work: commits when the block exits cleanly, rolls back if it raises.
+
+    Objects are not expired on commit, so long-lived worker sessions do not
+    re-SELECT rows they just wrote.
+    """
+
+    with Session(engine, expire_on_commit=False) as session:
+        try:
+            yield session
+        except BaseException:
+            session.rollback()
+            raise
+        session.commit()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+        await session.commit()
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one session per request, committed once after the route returns."""
+
+    async with async_session_scope() as session:
         yield session
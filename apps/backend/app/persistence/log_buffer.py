@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from sqlmodel import Session
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.persistence.models import Execution
+from app.persistence.repositories import append_execution_log_lines, set_execution_status
+
+
+class BufferedExecutionLog:
+    """Coalesces execution log lines into periodic chunk writes.
+
+    Lines are flushed as one chunk (one transaction) when the buffer reaches
+    `max_bytes`, when `flush_interval` seconds have passed since the last flush,
+    before every status change and when the context manager exits, including
+    on exceptions. Code that waits without writing (a silent build step, a
+    deployment in progress) calls `flush_if_due` from its wait loop, so lines
+    buffered before the wait do not sit there until the next write.
+
+    Each flush and status change is committed right away (other pending
+    changes in the session go with it) so viewers see progress live;
+    `on_flush`/`on_status` are called after that commit, e.g. to publish
+    live events.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        execution: Execution,
+        *,
+        max_bytes: int | None = None,
+        flush_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_flush: Callable[[list[str]], None] | None = None,
+        on_status: Callable[[str], None] | None = None,
+    ) -> None:
+        self._session = session
+        self._execution = execution
+        self._max_bytes = max_bytes if max_bytes is not None else settings.log_flush_bytes
+        self._flush_interval = (
+            flush_interval if flush_interval is not None else settings.log_flush_interval_ms / 1000
+        )
+        self._clock = clock
+        self._on_flush = on_flush
+        self._on_status = on_status
+        self._lines: list[str] = []
+        self._size = 0
+        self._last_flush = clock()
+        self._log = logger.bind(component="execution-log", execution_id=execution.id)
+
+    @property
+    def execution(self) -> Execution:
+        return self._execution
+
+    @property
+    def flush_interval(self) -> float:
+        return self._flush_interval
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        self._size += len(line.encode("utf-8")) + 1
+        if self._size >= self._max_bytes:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        if self._lines and self._clock() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            try:
+                append_execution_log_lines(self._session, self._execution, self._lines)
+                self._session.commit()
+            except Exception:
+                # Keep the buffered lines so a later flush can retry them.
+                self._session.rollback()
+                raise
+            lines, self._lines = self._lines, []
+            self._size = 0
+            if self._on_flush is not None:
+                self._on_flush(lines)
+        self._last_flush = self._clock()
+
+    def set_status(self, status: str) -> Execution:
+        self.flush()
+        execution = set_execution_status(self._session, self._execution, status)
+        self._session.commit()
+        if self._on_status is not None:
+            self._on_status(status)
+        return execution
+
+    def __enter__(self) -> BufferedExecutionLog:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+
+        # Do not mask the original exception if the final flush fails too.
+        try:
+            self.flush()
+        except Exception:  # noqa: BLE001
+            self._log.exception("execution_log_flush_failed", pending_lines=len(self._lines))
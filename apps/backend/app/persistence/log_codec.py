@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import gzip
+import io
+from typing import IO
+
+from app.common.settings import settings
+
+try:  # optional: better ratio and much faster than gzip on build logs
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+# Codecs for finished execution logs. The encoding names double as HTTP
+# Content-Encoding tokens ("zstd", "gzip"), so a stored blob can be sent to a
+# client that accepts it without recompressing.
+
+IDENTITY = "identity"
+
+
+def preferred_encoding() -> str:
+    """LOG_COMPRESSION, or gzip when zstd is configured but not installed."""
+
+    encoding = settings.log_compression
+    if encoding == "zstd" and zstandard is None:
+        return "gzip"
+    return encoding if encoding in ("zstd", "gzip") else IDENTITY
+
+
+def compress_log(text: str, encoding: str | None = None) -> tuple[bytes, str]:
+    """UTF-8 encode and compress `text`; returns the blob and the encoding used."""
+
+    encoding = encoding or preferred_encoding()
+    raw = text.encode("utf-8")
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.log_compression_level).compress(raw), encoding
+    if encoding == "gzip":
+        return gzip.compress(raw, compresslevel=6, mtime=0), encoding
+    return raw, IDENTITY
+
+
+def decompress_log_bytes(blob: bytes, encoding: str, size: int | None = None) -> bytes:
+    """The UTF-8 bytes of the log, or only its first `size` bytes.
+
+    A prefix is streamed out of the blob, so the rest is never decompressed.
+    """
+
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("log is zstd-compressed but the zstandard package is not installed")
+        if size is None:
+            return zstandard.ZstdDecompressor().decompress(blob)
+        with zstandard.ZstdDecompressor().stream_reader(blob) as reader:
+            return _read_exactly(reader, size)
+    if encoding == "gzip":
+        if size is None:
+            return gzip.decompress(blob)
+        with gzip.GzipFile(fileobj=io.BytesIO(blob)) as reader:
+            return _read_exactly(reader, size)
+    return blob if size is None else blob[:size]
+
+
+def _read_exactly(reader: IO[bytes], size: int) -> bytes:
+    parts: list[bytes] = []
+    while size > 0 and (part := reader.read(size)):
+        parts.append(part)
+        size -= len(part)
+    return b"".join(parts)
+
+
+def decompress_log(blob: bytes, encoding: str) -> str:
+    return decompress_log_bytes(blob, encoding).decode("utf-8")
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, SQLModel, select
+
+from app.common.logging import logger
+from app.persistence.models import Execution, ExecutionLogChunk, Plan
+
+PLAN_JSON_COLUMNS = ("environments_json", "post_steps_json", "warnings_json")
+
+# Schema of revision 0001. Adoption stamps that revision and later ones are
+# applied on top, so it must not create anything a later revision adds.
+_BASELINE_TABLES = ("project", "plan", "execution", "executionlogchunk", "trackeddeployment")
+_BASELINE_INDEXES = frozenset(
+    {
+        "ix_project_created_at_id",
+        "ix_plan_project_id",
+        "ix_plan_created_at_id",
+        "ix_plan_project_id_created_at_id",
+        "ix_plan_status_created_at_id",
+        "ix_execution_plan_id",
+        "ix_execution_created_at_id",
+        "ix_execution_project_id_created_at_id",
+        "ix_execution_status_created_at_id",
+        "ix_trackeddeployment_execution_id",
+        "ix_trackeddeployment_state_next_poll_at",
+    }
+)
+
+
+def _index_plan_environments(connection, plan_columns: dict[str, dict]) -> None:
+    # "Plans touching production" must not scan every plan. Postgres gets a GIN
+    # index for `environments_json @> '["production"]'` (any environment);
+    # SQLite cannot index into JSON, so it gets a generated column instead.
+    if connection.dialect.name == "postgresql":
+        for name in PLAN_JSON_COLUMNS:
+            if plan_columns[name]["type"].__class__.__name__ != "JSONB":
+                connection.execute(text(f'ALTER TABLE "plan" ALTER COLUMN {name} TYPE jsonb USING {name}::jsonb'))
+        connection.execute(
+            text(
+                'CREATE INDEX IF NOT EXISTS ix_plan_environments_json ON "plan" '
+                "USING gin (environments_json jsonb_path_ops)"
+            )
+        )
+    elif connection.dialect.name == "sqlite":
+        if "targets_production" not in plan_columns:
+            connection.execute(
+                text(
+                    'ALTER TABLE "plan" ADD COLUMN targets_production INTEGER GENERATED ALWAYS AS '
+                    "(instr(environments_json, '\"production\"') > 0) VIRTUAL"
+                )
+            )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_plan_targets_production_created_at_id "
+                'ON "plan" (targets_production, created_at, id)'
+            )
+        )
+
+
+def adopt_unversioned_schema(connection: Connection) -> None:
+    """Bring a database created by `create_all` (before versioned migrations) up to the baseline revision.
+
+    Older versions created tables at startup and never altered them, so the
+    columns and indexes added since then, and the legacy inline logs, are
+    dealt with here. The caller stamps the baseline afterwards.
+    """
+
+    tables = [SQLModel.metadata.tables[name] for name in _BASELINE_TABLES]
+    SQLModel.metadata.create_all(connection, tables=tables)
+    inspector = inspect(connection)
+    execution_columns = {column["name"] for column in inspector.get_columns("execution")}
+    plan_columns = {column["name"]: column for column in inspector.get_columns("plan")}
+
+    _index_plan_environments(connection, plan_columns)
+    if "project_id" not in execution_columns:
+        connection.execute(text("ALTER TABLE execution ADD COLUMN project_id INTEGER"))
+        connection.execute(
+            update(Execution).values(
+                project_id=select(Plan.project_id).where(Plan.id == Execution.plan_id).scalar_subquery()
+            )
+        )
+        logger.info("execution_project_id_backfilled")
+    for table in tables:
+        for index in table.indexes:
+            if index.name in _BASELINE_INDEXES:
+                index.create(connection, checkfirst=True)
+
+    with Session(bind=connection) as session:
+        migrate_legacy_execution_logs(session)
+
+
+def migrate_legacy_execution_logs(session: Session) -> int:
+    """Move inline `Execution.logs` text into `ExecutionLogChunk` rows.
+
+    The legacy text becomes the first chunk of the execution. Chunks that were
+    already written (e.g. by a newer worker) keep their order and have their
+    byte offsets shifted past the legacy text. Safe to run repeatedly.
+
+    Returns the number of executions migrated.
+    """
+
+    # Only the columns of the baseline schema: this runs before later revisions add theirs.
+    executions = session.exec(select(Execution.id, Execution.logs).where(Execution.logs != "")).all()
+    for execution_id, legacy in executions:
+        first = session.exec(
+            select(ExecutionLogChunk)
+            .where(ExecutionLogChunk.execution_id == execution_id)
+            .order_by(ExecutionLogChunk.seq)
+            .limit(1)
+        ).first()
+
+        seq = 0
+        if first is not None:
+            seq = first.seq - 1
+            session.execute(
+                update(ExecutionLogChunk)
+                .where(ExecutionLogChunk.execution_id == execution_id)
+                .values(byte_offset=ExecutionLogChunk.byte_offset + len(legacy.encode("utf-8")))
+            )
+
+        session.add(
+            ExecutionLogChunk(execution_id=execution_id, seq=seq, byte_offset=0, payload=legacy)
+        )
+        session.execute(update(Execution).where(Execution.id == execution_id).values(logs=""))
+
+    session.commit()
+    if executions:
+        logger.info("legacy_execution_logs_migrated", executions=len(executions))
+    return len(executions)
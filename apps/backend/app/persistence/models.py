@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
 
+from sqlalchemy import JSON, Column, DateTime, Index, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
 
@@ -10,33 +11,143 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# Aware UTC timestamps: timestamptz on Postgres, whose async driver rejects aware
+# values for plain timestamp columns. SQLite stores them as text either way.
+_TIMESTAMP = DateTime(timezone=True)
+
+# JSON text on SQLite, JSONB on Postgres; (de)serialized by SQLAlchemy on load/flush.
+_JSON = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _json_list(column_name: str):
+    return Field(default_factory=list, sa_column=Column(column_name, _JSON, nullable=False))
+
+
+# List endpoints page newest-first on (created_at, id); every filter they offer
+# has an index ending in those two columns, so a page is one index range scan.
+
+
 class Project(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (Index("ix_project_created_at_id", "created_at", "id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
     name: str
-    repo_path: Optional[str] = None
-    repo_url: Optional[str] = None
-    created_at: datetime = Field(default_factory=_utc_now)
+    repo_path: str | None = None
+    repo_url: str | None = None
+    created_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
 
 
 class Plan(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        Index("ix_plan_created_at_id", "created_at", "id"),
+        Index("ix_plan_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_plan_status_created_at_id", "status", "created_at", "id"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
     project_id: int = Field(index=True)
     raw_command: str
     action: str
-    version: Optional[str] = None
-    environments_json: str
-    post_steps_json: str
-    warnings_json: str = "[]"
+    version: str | None = None
+    # Attribute names are the decoded lists; the columns keep their original names.
+    environments: list[str] = _json_list("environments_json")
+    post_steps: list[str] = _json_list("post_steps_json")
+    warnings: list[str] = _json_list("warnings_json")
     status: str = "pending_approval"  # pending_approval|approved|running|failed|rolled_back|succeeded
-    created_at: datetime = Field(default_factory=_utc_now)
-    updated_at: datetime = Field(default_factory=_utc_now)
+    created_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+    updated_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
 
 
 class Execution(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        Index("ix_execution_created_at_id", "created_at", "id"),
+        Index("ix_execution_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_execution_status_created_at_id", "status", "created_at", "id"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    plan_id: int = Field(index=True)
+    project_id: int | None = None  # copied from the plan so history can be listed per project
+    status: str = "queued"  # queued|running|deploying|failed|succeeded|rolled_back
+    logs: str = ""  # legacy inline log, superseded by ExecutionLogChunk
+    started_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+    finished_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+    created_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+    # Set once the execution finishes: its chunks are folded into one compressed
+    # blob, and [seq, byte_offset] of each folded chunk is kept so log cursors
+    # handed out while it ran stay valid. None while the log is still in chunks.
+    log_encoding: str | None = None  # zstd | gzip (see log_codec)
+    log_size: int | None = None  # uncompressed UTF-8 bytes in log_blob
+    log_blob: bytes | None = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
+    log_chunks: list[list[int]] | None = Field(default=None, sa_column=Column("log_chunks_json", _JSON))
+
+
+class ExecutionLogChunk(SQLModel, table=True):
+    """Append-only slice of an execution log.
+
+    `byte_offset` is the position of `payload` (UTF-8) within the assembled log,
+    so readers can page through a log without loading the chunks before it.
+    """
+
+    __table_args__ = (UniqueConstraint("execution_id", "seq", name="uq_executionlogchunk_execution_seq"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    execution_id: int
+    seq: int
+    byte_offset: int
+    payload: str
+    created_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+
+
+class TrackedDeployment(SQLModel, table=True):
+    """A provider deployment that is still being polled to completion."""
+
+    __table_args__ = (Index("ix_trackeddeployment_state_next_poll_at", "state", "next_poll_at"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    execution_id: int = Field(index=True)
+    provider: str
+    environment: str
+    deployment_id: str
+    provider_status: str | None = None  # raw provider state, e.g. BUILDING / live
+    state: str = "pending"  # pending|succeeded|failed
+    attempts: int = 0  # polls since the provider status last changed
+    next_poll_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+    last_checked_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+    created_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+    finished_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+
+
+# Cold storage, filled by the archiver (app/services/archiver.py). Rows keep
+# their original ids so links and API lookups keep working.
+
+
+class ArchivedPlan(SQLModel, table=True):
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    project_id: int = Field(index=True)
+    raw_command: str
+    action: str
+    version: str | None = None
+    environments: list[str] = _json_list("environments_json")
+    post_steps: list[str] = _json_list("post_steps_json")
+    warnings: list[str] = _json_list("warnings_json")
+    status: str
+    created_at: datetime = Field(sa_type=_TIMESTAMP)
+    updated_at: datetime = Field(sa_type=_TIMESTAMP)
+    archived_at: datetime = Field(default_factory=_utc_now, sa_type=_TIMESTAMP)
+
+
+class ArchivedExecution(SQLModel, table=True):
+    """A finished execution with its whole log in one compressed blob."""
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
     plan_id: int = Field(index=True)
-    status: str = "queued"  # queued|running|failed|succeeded|rolled_back
-    logs: str = ""
-    started_at: Optional[datetime] = None
-    finished_at: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=_utc_now)
+    project_id: int | None = None
+    status: str
+    started_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+    finished_at: datetime | None = Field(default=None, sa_type=_TIMESTAMP)
+    created_at: datetime = Field(sa_type=_TIMESTAMP)
+    archived_at: datetime = Field(default_factory=_utc_now, index=True, sa_type=_TIMESTAMP)
+    log_encoding: str  # zstd | gzip | identity (see log_codec)
+    log_size: int  # uncompressed UTF-8 bytes
+    log_blob: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
+from itertools import pairwise
 
+from sqlalchemy import and_, delete, func, insert
 from sqlmodel import Session, select
 
-from app.persistence.models import Execution, Plan, Project
+from app.common.settings import settings
+from app.persistence.log_codec import (
+    IDENTITY,
+    compress_log,
+    decompress_log,
+    decompress_log_bytes,
+    preferred_encoding,
+)
+from app.persistence.models import Execution, ExecutionLogChunk, Plan, Project, TrackedDeployment
+
+# Repository functions only add/flush; the caller owns the transaction and
+# commits once per unit of work (see session_scope / get_session).
 
 
 def create_project(session: Session, name: str, repo_path: str | None, repo_url: str | None) -> Project:
     project = Project(name=name, repo_path=repo_path, repo_url=repo_url)
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    session.flush()
     return project
 
 
@@ -40,15 +51,14 @@ def create_plan(
         raw_command=raw_command,
         action=action,
         version=version,
-        environments_json=json.dumps(environments),
-        post_steps_json=json.dumps(post_steps),
-        warnings_json=json.dumps(warnings),
+        environments=environments,
+        post_steps=post_steps,
+        warnings=warnings,
         status="pending_approval",
         updated_at=datetime.now(timezone.utc),
     )
     session.add(plan)
-    session.commit()
-    session.refresh(plan)
+    session.flush()
     return plan
 
 
@@ -60,38 +70,275 @@ def update_plan_status(session: Session, plan: Plan, status: str) -> Plan:
     plan.status = status
     plan.updated_at = datetime.now(timezone.utc)
     session.add(plan)
-    session.commit()
-    session.refresh(plan)
     return plan
 
 
 def create_execution(session: Session, plan_id: int) -> Execution:
-    execution = Execution(plan_id=plan_id, status="queued")
+    plan = session.get(Plan, plan_id)  # usually already in the session's identity map
+    execution = Execution(plan_id=plan_id, project_id=plan.project_id if plan else None, status="queued")
     session.add(execution)
-    session.commit()
-    session.refresh(execution)
+    session.flush()
     return execution
 
 
+def create_executions(session: Session, plans: list[Plan]) -> list[Execution]:
+    """One queued execution per plan (plans must be distinct), in plan order.
+
+    A single multi-row INSERT ... RETURNING; a flush of new objects would
+    insert them one row at a time on SQLite. Rows are matched back to their
+    plans by plan_id because RETURNING order is not guaranteed.
+    """
+
+    if not plans:
+        return []
+    rows = session.scalars(
+        insert(Execution).returning(Execution),
+        [{"plan_id": plan.id, "project_id": plan.project_id, "status": "queued"} for plan in plans],
+    ).all()
+    by_plan = {execution.plan_id: execution for execution in rows}
+    return [by_plan[plan.id] for plan in plans]
+
+
 def get_execution(session: Session, execution_id: int) -> Execution | None:
     return session.get(Execution, execution_id)
 
 
+def _last_log_chunk(session: Session, execution_id: int) -> ExecutionLogChunk | None:
+    return session.exec(
+        select(ExecutionLogChunk)
+        .where(ExecutionLogChunk.execution_id == execution_id)
+        .order_by(ExecutionLogChunk.seq.desc())
+        .limit(1)
+    ).first()
+
+
+def append_execution_log_lines(
+    session: Session, execution: Execution, lines: list[str]
+) -> ExecutionLogChunk | None:
+    """Append `lines` as a single chunk.
+
+    Only the previous chunk is consulted (via the (execution_id, seq) index), so
+    the cost of an append does not depend on how much log already exists.
+    """
+
+    if not lines:
+        return None
+
+    execution_id = execution.id or 0
+    last = _last_log_chunk(session, execution_id)
+    if last is None and execution.log_chunks:
+        # Appending after the log was compressed: continue after the folded chunks.
+        seq, byte_offset = execution.log_chunks[-1][0] + 1, execution.log_size or 0
+    elif last is None:
+        seq, byte_offset = 0, 0
+    else:
+        seq = last.seq + 1
+        byte_offset = last.byte_offset + len(last.payload.encode("utf-8"))
+
+    chunk = ExecutionLogChunk(
+        execution_id=execution_id,
+        seq=seq,
+        byte_offset=byte_offset,
+        payload="".join(f"{line}\n" for line in lines),
+    )
+    session.add(chunk)
+    session.flush()
+    return chunk
+
+
 def append_execution_log(session: Session, execution: Execution, line: str) -> Execution:
-    execution.logs = (execution.logs or "") + line + "\n"
-    session.add(execution)
-    session.commit()
-    session.refresh(execution)
+    append_execution_log_lines(session, execution, [line])
     return execution
 
 
+def select_log_chunks(
+    execution_id: int,
+    *,
+    after_seq: int | None = None,
+    limit: int | None = None,
+    max_bytes: int | None = None,
+):
+    condition = ExecutionLogChunk.execution_id == execution_id
+    if after_seq is not None:
+        condition = and_(condition, ExecutionLogChunk.seq > after_seq)
+    statement = select(ExecutionLogChunk).where(condition)
+    if max_bytes is not None:
+        # Chunks starting up to `max_bytes` past the first one; the one that
+        # crosses the bound tells the caller that more follows.
+        first = select(ExecutionLogChunk.byte_offset).where(condition).order_by(ExecutionLogChunk.seq).limit(1)
+        statement = statement.where(ExecutionLogChunk.byte_offset <= first.scalar_subquery() + max_bytes)
+    statement = statement.order_by(ExecutionLogChunk.seq)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def compressed_log_chunks(
+    execution: Execution | None,
+    *,
+    after_seq: int | None = None,
+    limit: int | None = None,
+    max_bytes: int | None = None,
+) -> list[ExecutionLogChunk]:
+    """The chunks folded into a compressed log, rebuilt (unsaved) from the blob.
+
+    Lets chunk-based readers page through a finished execution exactly as they
+    did while it ran. Empty if the log is not compressed.
+    """
+
+    if execution is None or not execution.log_chunks or execution.log_blob is None:
+        return []
+    positions = [(seq, offset) for seq, offset in execution.log_chunks if after_seq is None or seq > after_seq]
+    positions = positions[:limit] if limit is not None else positions
+    if not positions:
+        return []
+    if max_bytes is not None:
+        positions = [(seq, offset) for seq, offset in positions if offset <= positions[0][1] + max_bytes]
+    # A folded chunk ends where the next one starts; the last one at the end of the blob.
+    ends = {seq: end for (seq, _), (_, end) in pairwise(execution.log_chunks)}
+    # Only the blob up to the end of the page is decompressed, once, and sliced as bytes.
+    raw = decompress_log_bytes(execution.log_blob, execution.log_encoding, ends.get(positions[-1][0]))
+    return [
+        ExecutionLogChunk(
+            execution_id=execution.id or 0,
+            seq=seq,
+            byte_offset=offset,
+            payload=raw[offset : ends.get(seq)].decode("utf-8"),
+        )
+        for seq, offset in positions
+    ]
+
+
+def list_execution_log_chunks(
+    session: Session,
+    execution_id: int,
+    *,
+    after_seq: int | None = None,
+    limit: int | None = None,
+    max_bytes: int | None = None,
+) -> list[ExecutionLogChunk]:
+    execution = session.get(Execution, execution_id)
+    folded = compressed_log_chunks(execution, after_seq=after_seq, limit=limit, max_bytes=max_bytes)
+    if limit is not None:
+        limit -= len(folded)
+    statement = select_log_chunks(execution_id, after_seq=after_seq, limit=limit, max_bytes=max_bytes)
+    return folded + list(session.exec(statement).all())
+
+
+def get_execution_log_cursor(session: Session, execution_id: int) -> int | None:
+    """Sequence number of the newest chunk, or None if nothing was logged yet."""
+
+    cursor = session.exec(
+        select(func.max(ExecutionLogChunk.seq)).where(ExecutionLogChunk.execution_id == execution_id)
+    ).one()
+    if cursor is None:
+        execution = session.get(Execution, execution_id)
+        if execution is not None and execution.log_chunks:
+            cursor = execution.log_chunks[-1][0]
+    return cursor
+
+
+def select_log_payloads(execution_id: int):
+    # Only the payload column, fetched in batches; on Postgres `yield_per`
+    # streams through a server-side cursor instead of buffering every row.
+    return (
+        select(ExecutionLogChunk.payload)
+        .where(ExecutionLogChunk.execution_id == execution_id)
+        .order_by(ExecutionLogChunk.seq)
+        .execution_options(yield_per=settings.db_log_read_batch_rows)
+    )
+
+
+def read_compressed_log(execution: Execution) -> str:
+    if execution.log_blob is None:
+        return ""
+    return decompress_log(execution.log_blob, execution.log_encoding)
+
+
+def read_execution_log(session: Session, execution: Execution) -> str:
+    """Assemble the full log text, including any legacy inline `Execution.logs`."""
+
+    return (
+        (execution.logs or "")
+        + read_compressed_log(execution)
+        + "".join(session.exec(select_log_payloads(execution.id or 0)))
+    )
+
+
+def compress_execution_log(session: Session, execution: Execution) -> bool:
+    """Fold the execution's chunks into its compressed blob and delete them.
+
+    Build output is repetitive, so this typically stores a fifth to a tenth
+    of the bytes. Returns False if there was nothing to fold or compression
+    is off (LOG_COMPRESSION=none).
+    """
+
+    encoding = preferred_encoding()
+    execution_id = execution.id or 0
+    chunks = session.exec(
+        select(ExecutionLogChunk.seq, ExecutionLogChunk.byte_offset, ExecutionLogChunk.payload)
+        .where(ExecutionLogChunk.execution_id == execution_id)
+        .order_by(ExecutionLogChunk.seq)
+    ).all()
+    if encoding == IDENTITY or not chunks:
+        return False
+
+    text = (execution.logs or "") + read_compressed_log(execution) + "".join(chunk.payload for chunk in chunks)
+    execution.log_blob, execution.log_encoding = compress_log(text, encoding)
+    execution.log_size = len(text.encode("utf-8"))
+    execution.log_chunks = (execution.log_chunks or []) + [[chunk.seq, chunk.byte_offset] for chunk in chunks]
+    execution.logs = ""
+    session.add(execution)
+    session.execute(delete(ExecutionLogChunk).where(ExecutionLogChunk.execution_id == execution_id))
+    return True
+
+
 def set_execution_status(session: Session, execution: Execution, status: str) -> Execution:
     execution.status = status
     if status == "running" and execution.started_at is None:
         execution.started_at = datetime.now(timezone.utc)
     if status in {"failed", "succeeded", "rolled_back"}:
         execution.finished_at = datetime.now(timezone.utc)
+        compress_execution_log(session, execution)
     session.add(execution)
-    session.commit()
-    session.refresh(execution)
     return execution
+
+
+def create_tracked_deployment(
+    session: Session,
+    *,
+    execution_id: int,
+    provider: str,
+    environment: str,
+    deployment_id: str,
+    provider_status: str | None = None,
+) -> TrackedDeployment:
+    tracked = TrackedDeployment(
+        execution_id=execution_id,
+        provider=provider,
+        environment=environment,
+        deployment_id=deployment_id,
+        provider_status=provider_status,
+    )
+    session.add(tracked)
+    session.flush()
+    return tracked
+
+
+def list_due_tracked_deployments(session: Session, now: datetime, limit: int) -> list[TrackedDeployment]:
+    """Pending deployments whose next poll is due, oldest first (uses the (state, next_poll_at) index)."""
+
+    return list(
+        session.exec(
+            select(TrackedDeployment)
+            .where(TrackedDeployment.state == "pending", TrackedDeployment.next_poll_at <= now)
+            .order_by(TrackedDeployment.next_poll_at)
+            .limit(limit)
+        ).all()
+    )
+
+
+def list_tracked_deployments(session: Session, execution_id: int) -> list[TrackedDeployment]:
+    return list(
+        session.exec(select(TrackedDeployment).where(TrackedDeployment.execution_id == execution_id)).all()
+    )
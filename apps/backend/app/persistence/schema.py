@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+from functools import cache
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.persistence.migrations import adopt_unversioned_schema
+
+# Versioned schema migrations (Alembic). Startup only compares the stored
+# revision with the newest script; applying migrations is a separate step
+# (`python -m app.persistence.schema upgrade`), run automatically at startup
+# only while DB_AUTO_MIGRATE is on.
+
+_SCRIPT_LOCATION = Path(__file__).parent / "alembic"
+
+# Revision that matches what `create_all` produced before migrations existed.
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(_SCRIPT_LOCATION))
+    return config
+
+
+@cache
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(db_engine: Engine) -> str | None:
+    """Revision stored in the database; None if it was never migrated."""
+
+    try:
+        with db_engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None  # no alembic_version table yet
+
+
+def upgrade(db_engine: Engine, revision: str = "head") -> None:
+    config = alembic_config()
+    unversioned = current_revision(db_engine) is None
+    with db_engine.begin() as connection:
+        config.attributes["connection"] = connection
+        if unversioned and inspect(connection).has_table("plan"):
+            adopt_unversioned_schema(connection)
+            command.stamp(config, BASELINE_REVISION)
+            logger.info("schema_adopted", revision=BASELINE_REVISION)
+        command.upgrade(config, revision)
+
+
+def ensure_schema(db_engine: Engine) -> None:
+    """Startup check: one query when the schema is already current."""
+
+    current, head = current_revision(db_engine), head_revision()
+    if current == head:
+        return
+    if not settings.db_auto_migrate:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}. "
+            "Run `python -m app.persistence.schema upgrade`."
+        )
+    upgrade(db_engine)
+    logger.info("schema_upgraded", from_revision=current, to_revision=head)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or inspect database schema migrations.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = sub.add_parser("upgrade", help="migrate the database to a revision (default: head)")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+    sub.add_parser("current", help="print the stored and the newest revision")
+    args = parser.parse_args()
+
+    from app.persistence.db import engine
+
+    settings.data_dir.mkdir(parents=True, exist_ok=True)
+    if args.command == "upgrade":
+        upgrade(engine, args.revision)
+    print(f"current: {current_revision(engine)}  head: {head_revision()}")
+
+
+if __name__ == "__main__":
+    main()
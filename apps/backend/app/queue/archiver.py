@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from app.common.logging import configure_logging, logger
+from app.common.settings import settings
+from app.persistence.db import init_db
+from app.services.archiver import run_archival
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move finished executions and plans older than ARCHIVE_AFTER_DAYS to the archive tables."
+    )
+    parser.add_argument(
+        "--loop", action="store_true", help="keep running, once every ARCHIVE_INTERVAL_SECONDS"
+    )
+    args = parser.parse_args()
+
+    configure_logging(os.getenv("LOG_LEVEL", "INFO"))
+    init_db()
+    log = logger.bind(component="archiver")
+    try:
+        while True:
+            result = run_archival()
+            log.info("archival_pass", executions=result.executions, plans=result.plans)
+            if not args.loop:
+                break
+            time.sleep(settings.archive_interval_seconds)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
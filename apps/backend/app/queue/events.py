@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from app.common.logging import logger
+from app.common.settings import settings
+
+TERMINAL_STATUSES = frozenset({"failed", "succeeded", "rolled_back"})
+
+
+def execution_stream_key(execution_id: int) -> str:
+    return f"{settings.rq_queue_name}:execution:{execution_id}:events"
+
+
+def _stream_id(event_id: str) -> tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+@dataclass
+class ExecutionEvent:
+    id: str | None
+    type: str  # log | status
+    data: dict[str, Any]
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.type == "status" and self.data.get("status") in TERMINAL_STATUSES
+
+    def to_sse(self) -> str:
+        head = f"id: {self.id}\n" if self.id else ""
+        return f"{head}event: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+def _decode(entry_id: bytes | str, fields: dict) -> ExecutionEvent:
+    values = {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in fields.items()
+    }
+    event_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+    return ExecutionEvent(id=event_id, type=values["type"], data=json.loads(values["data"]))
+
+
+class ExecutionEventPublisher:
+    """Writes execution log/status events to a per-execution Redis Stream.
+
+    Stream entry ids double as SSE event ids, which is what makes
+    `Last-Event-ID` resume work. Publishing is best effort: a Redis outage must
+    never fail the execution itself.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+        self._log = logger.bind(component="execution-events")
+
+    def publish_log(self, execution_id: int, lines: list[str]) -> None:
+        if lines:
+            self._publish(execution_id, "log", {"lines": lines})
+
+    def publish_status(self, execution_id: int, status: str) -> None:
+        self._publish(execution_id, "status", {"status": status})
+
+    def publish_status_many(self, execution_ids: list[int], status: str) -> None:
+        """Publish the same status for several executions in one round trip."""
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for execution_id in execution_ids:
+                self._add(pipe, execution_id, "status", {"status": status})
+            pipe.execute()
+        except RedisError as exc:
+            self._log.warning(
+                "execution_event_publish_failed", executions=len(execution_ids), event_type="status", error=str(exc)
+            )
+
+    def _add(self, pipe, execution_id: int, event_type: str, data: dict[str, Any]) -> None:
+        key = execution_stream_key(execution_id)
+        pipe.xadd(
+            key,
+            {"type": event_type, "data": json.dumps(data)},
+            maxlen=settings.event_stream_maxlen,
+            approximate=True,
+        )
+        pipe.expire(key, settings.event_stream_ttl_seconds)
+
+    def _publish(self, execution_id: int, event_type: str, data: dict[str, Any]) -> None:
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            self._add(pipe, execution_id, event_type, data)
+            pipe.execute()
+        except RedisError as exc:
+            self._log.warning(
+                "execution_event_publish_failed",
+                execution_id=execution_id,
+                event_type=event_type,
+                error=str(exc),
+            )
+
+
+class _ExecutionFeed:
+    """One Redis reader per execution, fanned out to every subscriber queue."""
+
+    def __init__(self, redis: AsyncRedis, key: str, start_id: str, block_ms: int) -> None:
+        self._redis = redis
+        self._key = key
+        self._last_id = start_id
+        self._block_ms = block_ms
+        self.subscribers: set[asyncio.Queue[ExecutionEvent]] = set()
+        self.task: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        log = logger.bind(component="execution-events", stream=self._key)
+        while self.subscribers:
+            try:
+                response = await self._redis.xread({self._key: self._last_id}, block=self._block_ms)
+            except RedisError as exc:
+                log.warning("execution_feed_read_failed", error=str(exc))
+                await asyncio.sleep(1.0)
+                continue
+
+            for _key, entries in response or []:
+                for entry_id, fields in entries:
+                    event = _decode(entry_id, fields)
+                    self._last_id = event.id
+                    for queue in self.subscribers:
+                        queue.put_nowait(event)
+
+
+class ExecutionEventBroker:
+    """Fans Redis Stream events out to SSE viewers within one API process.
+
+    However many viewers watch an execution, the process holds a single
+    blocking XREAD for it. A viewer first replays the stream after its
+    `Last-Event-ID` (or from the beginning) and then switches to the live feed.
+    """
+
+    def __init__(self, redis: AsyncRedis, *, block_ms: int = 5000) -> None:
+        self._redis = redis
+        self._block_ms = block_ms
+        self._feeds: dict[int, _ExecutionFeed] = {}
+
+    async def _join(self, execution_id: int, queue: asyncio.Queue[ExecutionEvent]) -> None:
+        feed = self._feeds.get(execution_id)
+        if feed is None:
+            key = execution_stream_key(execution_id)
+            # Start the live feed at the current tail; anything older comes from the replay.
+            latest = await self._redis.xrevrange(key, count=1)
+            start_id = _decode(*latest[0]).id if latest else "0-0"
+            feed = self._feeds.get(execution_id)
+            if feed is None:
+                feed = _ExecutionFeed(self._redis, key, start_id, self._block_ms)
+                self._feeds[execution_id] = feed
+
+        feed.subscribers.add(queue)
+        if feed.task is None or feed.task.done():
+            feed.task = asyncio.create_task(feed.run())
+
+    def _leave(self, execution_id: int, queue: asyncio.Queue[ExecutionEvent]) -> None:
+        feed = self._feeds.get(execution_id)
+        if feed is None:
+            return
+        feed.subscribers.discard(queue)
+        if not feed.subscribers:
+            self._feeds.pop(execution_id, None)
+            if feed.task is not None:
+                feed.task.cancel()
+
+    async def replay(self, execution_id: int, last_event_id: str | None = None) -> list[ExecutionEvent]:
+        start = f"({last_event_id}" if last_event_id else "-"
+        entries = await self._redis.xrange(execution_stream_key(execution_id), min=start)
+        return [_decode(entry_id, fields) for entry_id, fields in entries]
+
+    async def has_events(self, execution_id: int) -> bool:
+        """Whether the execution's stream still exists, i.e. has not expired."""
+
+        return bool(await self._redis.exists(execution_stream_key(execution_id)))
+
+    async def subscribe(
+        self,
+        execution_id: int,
+        *,
+        last_event_id: str | None = None,
+        heartbeat: float | None = None,
+    ) -> AsyncIterator[ExecutionEvent | None]:
+        """Yield events until a terminal status; yields None after `heartbeat` idle seconds."""
+
+        queue: asyncio.Queue[ExecutionEvent] = asyncio.Queue()
+        await self._join(execution_id, queue)
+        try:
+            last_seen = _stream_id(last_event_id) if last_event_id else (0, 0)
+            for event in await self.replay(execution_id, last_event_id):
+                last_seen = _stream_id(event.id)
+                yield event
+                if event.is_terminal:
+                    return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except TimeoutError:
+                    yield None
+                    continue
+                # The replay and the live feed overlap around the hand-over point.
+                if _stream_id(event.id) <= last_seen:
+                    continue
+                last_seen = _stream_id(event.id)
+                yield event
+                if event.is_terminal:
+                    return
+        finally:
+            self._leave(execution_id, queue)
+
+    async def close(self) -> None:
+        for feed in list(self._feeds.values()):
+            if feed.task is not None:
+                feed.task.cancel()
+        self._feeds.clear()
+        await self._redis.aclose()
@@ -1,10 +1,56 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from rq import Queue
 
 from app.common.settings import settings
+from app.persistence.models import Plan
 from app.queue.redis_conn import get_redis
 
+# Priority lanes, highest first. Workers listen to them in this order, so a
+# production rollback never waits behind a backlog of staging builds.
+LANES = ("critical", "default", "bulk")
+
+
+def _setting_list(value: str) -> set[str]:
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+def queue_name(lane: str) -> str:
+    return f"{settings.rq_queue_name}:{lane}"
+
+
+def lane_for_plan(plan: Plan) -> str:
+    """`critical` for QUEUE_CRITICAL_ACTIONS or a QUEUE_CRITICAL_ENVIRONMENTS
+    target, `bulk` when every target is in QUEUE_BULK_ENVIRONMENTS, else `default`."""
+
+    environments = set(plan.environments)
+    if plan.action in _setting_list(settings.queue_critical_actions) or environments & _setting_list(
+        settings.queue_critical_environments
+    ):
+        return "critical"
+    if environments and environments <= _setting_list(settings.queue_bulk_environments):
+        return "bulk"
+    return "default"
+
+
+def worker_queue_names(lanes: Iterable[str] = LANES) -> list[str]:
+    """Queues a worker listens to, in strict priority order.
+
+    Workers of the default lane also drain the un-laned RQ_QUEUE_NAME queue,
+    last, so jobs enqueued before lanes existed still run.
+    """
+
+    lanes = set(lanes)
+    unknown = lanes - set(LANES)
+    if unknown:
+        raise ValueError(f"Unknown queue lanes: {sorted(unknown)}; expected {', '.join(LANES)}")
+    names = [queue_name(lane) for lane in LANES if lane in lanes]
+    if "default" in lanes:
+        names.append(settings.rq_queue_name)
+    return names
+
 
-def get_queue() -> Queue:
-    return Queue(name=settings.rq_queue_name, connection=get_redis())
+def get_queue(lane: str = "default") -> Queue:
+    return Queue(name=queue_name(lane), connection=get_redis())
@@ -1,12 +1,69 @@
 from __future__ import annotations
 
-from redis import Redis
+import os
+import threading
+
+from redis import BlockingConnectionPool, Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from app.common.settings import settings
 
+_pool: BlockingConnectionPool | None = None
+_lock = threading.Lock()
+
+
+def get_redis_pool() -> BlockingConnectionPool:
+    """Process-wide Redis connection pool, created on first use.
+
+    Every `get_redis()` client (API requests, RQ enqueues, event publishers,
+    throttles) checks connections out of it instead of building a pool and
+    a new TCP connection per call. When all REDIS_MAX_CONNECTIONS are in use,
+    callers wait up to REDIS_POOL_TIMEOUT_SECONDS for one.
+    """
+
+    global _pool
+    with _lock:
+        if _pool is None:
+            # IMPORTANT: RQ stores job payloads as binary data (pickle by default).
+            # Setting decode_responses=True forces Redis-py to decode bytes as UTF-8
+            # and can crash the worker with UnicodeDecodeError when reading job hashes.
+            _pool = BlockingConnectionPool.from_url(
+                settings.redis_url,
+                decode_responses=False,
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout_seconds,
+                socket_keepalive=settings.redis_socket_keepalive,
+                socket_connect_timeout=settings.redis_connect_timeout_seconds,
+                health_check_interval=settings.redis_health_check_interval_seconds,
+            )
+        return _pool
+
 
 def get_redis() -> Redis:
-    # IMPORTANT: RQ stores job payloads as binary data (pickle by default).
-    # Setting decode_responses=True forces Redis-py to decode bytes as UTF-8
-    # and can crash the worker with UnicodeDecodeError when reading job hashes.
-    return Redis.from_url(settings.redis_url, decode_responses=False)
+    return Redis(connection_pool=get_redis_pool())
+
+
+def close_redis_pool() -> None:
+    """Disconnect the pooled connections; call on API/worker shutdown."""
+
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.disconnect()
+
+
+def get_async_redis() -> AsyncRedis:
+    return AsyncRedis.from_url(settings.redis_url, decode_responses=False)
+
+
+def _forget_inherited_pool() -> None:
+    # RQ forks a work-horse per job. The parent's sockets must not be shared
+    # with it, so the child drops (doesn't close) them and builds its own pool.
+    global _pool, _lock
+    _pool = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_pool)
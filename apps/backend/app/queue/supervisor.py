@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from redis import Redis
+from rq import Queue, Worker
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.queue.queue import worker_queue_names
+
+# A child that exits sooner than this after starting is crash-looping (bad
+# config, Redis down): restarts back off instead of spinning.
+_CRASH_LOOP_SECONDS = 10.0
+_MAX_RESTART_BACKOFF_SECONDS = 60.0
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # RQ stores naive UTC timestamps.
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def spawn_worker(lanes: str, mode: str) -> subprocess.Popen:
+    """Start one `python -m app.queue.worker` child serving `lanes`."""
+
+    command = [sys.executable, "-m", "app.queue.worker", "--lanes", lanes, "--mode", mode, "--supervised"]
+    if os.name == "nt":
+        # Ctrl+C reaches the children through the shared console and each one
+        # shuts down warm on its own.
+        return subprocess.Popen(command)
+    # Keep terminal signals away from the children: the supervisor forwards a
+    # single SIGTERM (RQ's warm shutdown) rather than have a second signal
+    # turn it into a cold one that kills running jobs.
+    return subprocess.Popen(command, start_new_session=True)
+
+
+class WorkerSupervisor:
+    """Runs between `min_processes` and `max_processes` RQ worker processes.
+
+    Each tick sizes the pool from the queues: once the oldest queued job has
+    waited WORKER_SCALE_UP_WAIT_SECONDS, the pool grows to one worker per
+    busy worker plus one per waiting job, up to the maximum. After the queues
+    have been empty for WORKER_SCALE_DOWN_IDLE_SECONDS, idle workers are
+    stopped down to the minimum; busy ones always finish their job. Exited
+    children are replaced up to the current pool size: right away when a
+    warm worker recycled itself (exit code 0), with exponential backoff while
+    crashed ones keep dying right after start.
+    """
+
+    def __init__(
+        self,
+        *,
+        lanes: str,
+        mode: str = "fork",
+        min_processes: int,
+        max_processes: int,
+        connection: Redis,
+        spawn: Callable[[str, str], subprocess.Popen] = spawn_worker,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        self._lanes = lanes
+        self._mode = mode
+        self._min = min_processes
+        self._max = max(min_processes, max_processes)
+        self._connection = connection
+        self._queues = [Queue(name, connection=connection) for name in worker_queue_names(lanes.split(","))]
+        self._spawn = spawn
+        self._clock = clock
+        self._children: dict[int, tuple[subprocess.Popen, datetime]] = {}
+        self._pool_size = self._min  # exited children are replaced up to this
+        self._stopping: dict[int, subprocess.Popen] = {}
+        self._idle_since: datetime | None = None
+        self._restart_backoff = 0.0
+        self._restart_at: datetime | None = None
+        self._log = logger.bind(component="worker-supervisor", lanes=lanes, mode=mode)
+
+    @property
+    def processes(self) -> int:
+        return len(self._children)
+
+    def backlog(self) -> tuple[int, float]:
+        """Queued jobs across the lanes and how long the oldest one has waited, in seconds."""
+
+        depth, oldest = 0, 0.0
+        now = self._clock()
+        for queue in self._queues:
+            count = queue.count
+            if not count:
+                continue
+            depth += count
+            # Jobs are pushed to the tail and popped from the head.
+            head = queue.get_job_ids(0, 1)
+            job = queue.fetch_job(head[0]) if head else None
+            if job is not None and job.enqueued_at is not None:
+                oldest = max(oldest, (now - _as_utc(job.enqueued_at)).total_seconds())
+        return depth, oldest
+
+    def _busy_pids(self) -> set[int]:
+        hostname = socket.gethostname()
+        return {
+            worker.pid
+            for worker in Worker.all(connection=self._connection)
+            if worker.hostname == hostname and worker.pid in self._children and worker.get_state() == "busy"
+        }
+
+    def _reap(self) -> None:
+        now = self._clock()
+        for pid, process in list(self._stopping.items()):
+            if process.poll() is not None:
+                del self._stopping[pid]
+        for pid, (process, started_at) in list(self._children.items()):
+            returncode = process.poll()
+            if returncode is None:
+                continue
+            del self._children[pid]
+            uptime = (now - started_at).total_seconds()
+            if returncode == 0:
+                self._log.info("worker_recycled", pid=pid, uptime_seconds=round(uptime, 1))
+                continue
+            self._log.warning("worker_exited", pid=pid, returncode=returncode, uptime_seconds=round(uptime, 1))
+            if uptime < _CRASH_LOOP_SECONDS:
+                self._restart_backoff = min(_MAX_RESTART_BACKOFF_SECONDS, max(1.0, self._restart_backoff * 2))
+                self._restart_at = now + timedelta(seconds=self._restart_backoff)
+            else:
+                self._restart_backoff = 0.0
+                self._restart_at = None
+
+    def _target(self, depth: int, oldest_wait: float, busy: int) -> int:
+        now = self._clock()
+        target = self._pool_size
+        if depth:
+            self._idle_since = None
+            if oldest_wait >= settings.worker_scale_up_wait_seconds:
+                # One worker per waiting job besides the busy ones. Children that
+                # are still starting up already count towards the pool size.
+                target = max(target, busy + depth)
+        else:
+            self._idle_since = self._idle_since or now
+            if (now - self._idle_since).total_seconds() >= settings.worker_scale_down_idle_seconds:
+                target = busy
+        self._pool_size = min(self._max, max(self._min, target))
+        return self._pool_size
+
+    def _start(self) -> None:
+        process = self._spawn(self._lanes, self._mode)
+        self._children[process.pid] = (process, self._clock())
+        self._log.info("worker_started", pid=process.pid, processes=len(self._children))
+
+    def tick(self) -> None:
+        self._reap()
+        depth, oldest_wait = self.backlog()
+        busy = self._busy_pids()
+        target = self._target(depth, oldest_wait, len(busy))
+
+        if len(self._children) < target:
+            if self._restart_at is not None and self._clock() < self._restart_at:
+                return
+            self._restart_at = None
+            self._log.info(
+                "starting_workers",
+                running=len(self._children),
+                queued=depth,
+                oldest_wait_seconds=round(oldest_wait, 1),
+                target=target,
+            )
+            while len(self._children) < target:
+                self._start()
+        elif len(self._children) > target:
+            idle = [pid for pid in self._children if pid not in busy]
+            surplus = idle[: len(self._children) - target]
+            if surplus:
+                self._log.info("scale_down", target=target, stopping=surplus)
+            for pid in surplus:
+                process, _ = self._children.pop(pid)
+                # SIGTERM on POSIX; on Windows the worker is killed, which is
+                # why only idle ones are picked.
+                process.terminate()
+                self._stopping[pid] = process
+
+    def run_forever(self, stop: threading.Event) -> None:
+        self._log.info("supervisor_starting", min_processes=self._min, max_processes=self._max)
+        try:
+            self.tick()
+            while not stop.wait(settings.worker_supervisor_interval_seconds):
+                self.tick()
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Ask every child for a warm shutdown and wait for running jobs to finish."""
+
+        processes = [process for process, _ in self._children.values()] + list(self._stopping.values())
+        self._children.clear()
+        self._stopping.clear()
+        if os.name != "nt":
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+        for process in processes:
+            process.wait()
+        self._log.info("supervisor_stopped")
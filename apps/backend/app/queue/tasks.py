@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from app.common.logging import logger
+from app.common.settings import settings
 from app.persistence.db import session_scope
+from app.persistence.log_buffer import BufferedExecutionLog
 from app.persistence.repositories import (
-    append_execution_log,
     get_execution,
     get_plan,
     get_project,
-    set_execution_status,
     update_plan_status,
 )
+from app.queue.events import ExecutionEventPublisher
+from app.queue.redis_conn import get_redis
+from app.services.deployment_tracker import track_deployments
 from app.services.orchestrator import Orchestrator
 
 
@@ -22,31 +25,50 @@ def execute_plan(execution_id: int) -> None:
             log.error("execution_not_found")
             return
 
-        plan = get_plan(session, execution.plan_id)
-        if plan is None:
-            set_execution_status(session, execution, "failed")
-            append_execution_log(session, execution, "Plan not found")
-            log.error("plan_not_found")
-            return
+        publisher = ExecutionEventPublisher(get_redis())
 
-        project = get_project(session, plan.project_id)
-        if project is None:
-            set_execution_status(session, execution, "failed")
-            append_execution_log(session, execution, "Project not found")
-            log.error("project_not_found")
-            return
+        # Buffered lines are flushed before every status change and when the
+        # block exits, so nothing written before an exception is lost.
+        with BufferedExecutionLog(
+            session,
+            execution,
+            on_flush=lambda lines: publisher.publish_log(execution_id, lines),
+            on_status=lambda status: publisher.publish_status(execution_id, status),
+        ) as execution_log:
+            plan = get_plan(session, execution.plan_id)
+            if plan is None:
+                execution_log.write("Plan not found")
+                execution_log.set_status("failed")
+                log.error("plan_not_found")
+                return
+
+            project = get_project(session, plan.project_id)
+            if project is None:
+                execution_log.write("Project not found")
+                execution_log.set_status("failed")
+                log.error("project_not_found")
+                return
+
+            # Plan status changes are committed together with the execution's.
+            update_plan_status(session, plan, "running")
+            execution_log.set_status("running")
 
-        set_execution_status(session, execution, "running")
-        update_plan_status(session, plan, "running")
-
-        orchestrator = Orchestrator()
-        try:
-            orchestrator.run(project=project, plan=plan, execution=execution, session=session)
-            set_execution_status(session, execution, "succeeded")
-            update_plan_status(session, plan, "succeeded")
-            log.info("execution_succeeded")
-        except Exception as exc:  # noqa: BLE001
-            append_execution_log(session, execution, f"ERROR: {exc}")
-            set_execution_status(session, execution, "failed")
-            update_plan_status(session, plan, "failed")
-            log.exception("execution_failed")
+            orchestrator = Orchestrator()
+            try:
+                summary = orchestrator.run(project=project, plan=plan, log=execution_log)
+                tracked = track_deployments(session, execution_id, settings.deploy_provider.lower(), summary)
+                if tracked:
+                    # Providers build asynchronously; the tracker finishes the execution.
+                    execution_log.write(f"Waiting for {len(tracked)} deployment(s) to go live")
+                    execution_log.set_status("deploying")
+                    log.info("execution_deploying", deployments=len(tracked))
+                else:
+                    update_plan_status(session, plan, "succeeded")
+                    execution_log.set_status("succeeded")
+                    log.info("execution_succeeded")
+            except Exception as exc:  # noqa: BLE001
+                session.rollback()
+                execution_log.write(f"ERROR: {exc}")
+                update_plan_status(session, plan, "failed")
+                execution_log.set_status("failed")
+                log.exception("execution_failed")
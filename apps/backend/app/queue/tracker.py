@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+
+from app.common.logging import configure_logging, logger
+from app.persistence.db import init_db
+from app.queue.events import ExecutionEventPublisher
+from app.queue.redis_conn import get_redis
+from app.services.deployers import aclose_http_clients
+from app.services.deployment_tracker import DeploymentTracker
+
+
+async def _run() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Windows event loops do not support signal handlers; Ctrl+C still raises.
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, stop.set)
+
+    tracker = DeploymentTracker(publisher=ExecutionEventPublisher(get_redis()))
+    try:
+        await tracker.run_forever(stop)
+    finally:
+        await aclose_http_clients()
+
+
+def main() -> None:
+    configure_logging(os.getenv("LOG_LEVEL", "INFO"))
+    init_db()
+    logger.bind(component="deployment-tracker").info("tracker_starting")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,116 @@
 from __future__ import annotations
 
+import argparse
+import importlib
 import os
 import signal
+import threading
 
+from redis import Redis
 from redis.exceptions import ConnectionError as RedisConnectionError
-
 from rq import Worker
-from rq.worker import SimpleWorker
-
 from rq.timeouts import TimerDeathPenalty
+from rq.worker import SimpleWorker
 
 from app.common.logging import configure_logging, logger
 from app.common.settings import settings
-from app.queue.redis_conn import get_redis
+from app.persistence.db import engine
+from app.queue.queue import LANES, worker_queue_names
+from app.queue.redis_conn import close_redis_pool, get_redis
+from app.queue.supervisor import WorkerSupervisor
+from app.services.deployers import close_http_clients
+
+WORKER_MODES = ("fork", "warm")
+
+
+def _process_range(value: str) -> tuple[int, int]:
+    if value == "auto":
+        return settings.worker_min_processes, settings.worker_max_processes or os.cpu_count() or 1
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"expected `auto` or a positive number, got {value!r}")
+    return count, count
+
+
+def _supervise(lanes: str, mode: str, processes: tuple[int, int], redis_conn: Redis) -> None:
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    min_processes, max_processes = processes
+    supervisor = WorkerSupervisor(
+        lanes=lanes, mode=mode, min_processes=min_processes, max_processes=max_processes, connection=redis_conn
+    )
+    try:
+        supervisor.run_forever(stop)
+    finally:
+        close_redis_pool()
+
+
+def build_worker(queue_names: list[str], connection: Redis, mode: str) -> Worker:
+    """An RQ worker for `mode`, with the job code already imported.
+
+    `fork` runs every job in a forked work-horse, which inherits the imports
+    but opens its own database and HTTP connections. `warm` runs jobs in the
+    worker process itself (like SimpleWorker on Windows), so the SQLAlchemy
+    pool, the provider HTTP clients and the Redis pool stay open between jobs.
+    """
+
+    # Orchestrator, deployers and repositories, imported once instead of by
+    # the first job of every work-horse.
+    importlib.import_module("app.queue.tasks")
+    if mode == "warm":
+        with engine.connect():  # pays for the connection and pragmas before the first job
+            pass
+
+    # RQ workers fork by default, which is not available on Windows.
+    # When running via Windows Python (even from WSL paths), fall back to SimpleWorker.
+    worker_cls = Worker if hasattr(os, "fork") and mode == "fork" else SimpleWorker
+    # RQ checks the queues in list order, so the lanes are served in strict priority.
+    worker = worker_cls(queue_names, connection=connection)
+
+    # RQ's default job timeout mechanism uses SIGALRM which is unavailable on Windows.
+    # Use a thread-based timeout implementation instead.
+    if not hasattr(signal, "SIGALRM"):
+        worker.death_penalty_class = TimerDeathPenalty
+    return worker
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Run an RQ worker for plan executions.")
+    parser.add_argument(
+        "--lanes",
+        default=",".join(LANES),
+        help="comma-separated priority lanes to serve (default: all); `critical` dedicates the worker",
+    )
+    parser.add_argument(
+        "--processes",
+        type=_process_range,
+        help="supervise N worker processes, or `auto` to scale between WORKER_MIN_PROCESSES and "
+        "WORKER_MAX_PROCESSES with the queue backlog",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=WORKER_MODES,
+        default=settings.worker_mode,
+        help="`fork` a work-horse per job, or run jobs in a `warm` process recycled every "
+        "WORKER_RECYCLE_AFTER_JOBS jobs (default: WORKER_MODE)",
+    )
+    # Set on the children of a supervisor, which restarts them when they recycle.
+    parser.add_argument("--supervised", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    lanes = [lane.strip() for lane in args.lanes.split(",") if lane.strip()]
+    try:
+        queue_names = worker_queue_names(lanes)
+    except ValueError as exc:
+        parser.error(str(exc))
+
     configure_logging(os.getenv("LOG_LEVEL", "INFO"))
 
     redis_conn = get_redis()
-    log = logger.bind(component="rq-worker", queue=settings.rq_queue_name)
+    log = logger.bind(component="rq-worker", queues=queue_names, mode=args.mode)
     log.info("worker_starting")
 
     # Fail fast with a clear message if Redis isn't reachable.
@@ -34,17 +125,22 @@ def main() -> None:
         )
         raise SystemExit(1) from exc
 
-    # RQ workers fork by default, which is not available on Windows.
-    # When running via Windows Python (even from WSL paths), fall back to SimpleWorker.
-    worker_cls = Worker if hasattr(os, "fork") else SimpleWorker
-    worker = worker_cls([settings.rq_queue_name], connection=redis_conn)
-
-    # RQ's default job timeout mechanism uses SIGALRM which is unavailable on Windows.
-    # Use a thread-based timeout implementation instead.
-    if not hasattr(signal, "SIGALRM"):
-        worker.death_penalty_class = TimerDeathPenalty
+    if args.mode == "warm" and not (args.processes or args.supervised):
+        # A warm worker exits to recycle; something has to start the next one.
+        args.processes = (1, 1)
+    if args.processes:
+        _supervise(",".join(lanes), args.mode, args.processes, redis_conn)
+        return
 
-    worker.work(with_scheduler=True)
+    worker = build_worker(queue_names, redis_conn, args.mode)
+    # A warm worker exits after WORKER_RECYCLE_AFTER_JOBS jobs so that leaked
+    # memory or state left behind by a job does not build up.
+    max_jobs = (settings.worker_recycle_after_jobs or None) if args.mode == "warm" else None
+    try:
+        worker.work(with_scheduler=True, max_jobs=max_jobs)
+    finally:
+        close_http_clients()
+        close_redis_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, exists, func
+from sqlmodel import Session, select
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.persistence.db import session_scope
+from app.persistence.log_codec import compress_log
+from app.persistence.models import (
+    ArchivedExecution,
+    ArchivedPlan,
+    Execution,
+    ExecutionLogChunk,
+    Plan,
+    TrackedDeployment,
+)
+from app.persistence.repositories import read_compressed_log
+from app.queue.events import TERMINAL_STATUSES
+
+
+@dataclass
+class ArchiveResult:
+    executions: int = 0
+    plans: int = 0
+
+
+def _archive_execution(execution: Execution, hot_log: str) -> ArchivedExecution:
+    if execution.log_blob is not None and not hot_log and not execution.logs:
+        # Compressed when it finished (set_execution_status): move the blob as is.
+        blob, encoding, size = execution.log_blob, execution.log_encoding, execution.log_size or 0
+    else:
+        log = (execution.logs or "") + read_compressed_log(execution) + hot_log
+        (blob, encoding), size = compress_log(log), len(log.encode("utf-8"))
+    return ArchivedExecution(
+        id=execution.id or 0,
+        plan_id=execution.plan_id,
+        project_id=execution.project_id,
+        status=execution.status,
+        started_at=execution.started_at,
+        finished_at=execution.finished_at,
+        created_at=execution.created_at,
+        log_encoding=encoding,
+        log_size=size,
+        log_blob=blob,
+    )
+
+
+def archive_executions(session: Session, cutoff: datetime, limit: int) -> int:
+    """Move up to `limit` finished executions created before `cutoff` to the archive.
+
+    The newest execution always stays: SQLite hands out max(id) + 1 for new
+    rows, so archiving it could let a new execution reuse an archived id.
+    """
+
+    newest = select(func.max(Execution.id)).scalar_subquery()
+    executions = session.exec(
+        select(Execution)
+        .where(
+            Execution.status.in_(TERMINAL_STATUSES),
+            Execution.created_at < cutoff,
+            Execution.id < newest,
+        )
+        .order_by(Execution.created_at, Execution.id)
+        .limit(limit)
+    ).all()
+    if not executions:
+        return 0
+
+    ids = [execution.id for execution in executions]
+    # One query for the whole batch's logs rather than one per execution.
+    logs: dict[int, list[str]] = defaultdict(list)
+    for execution_id, payload in session.execute(
+        select(ExecutionLogChunk.execution_id, ExecutionLogChunk.payload)
+        .where(ExecutionLogChunk.execution_id.in_(ids))
+        .order_by(ExecutionLogChunk.execution_id, ExecutionLogChunk.seq)
+    ):
+        logs[execution_id].append(payload)
+    session.add_all([_archive_execution(execution, "".join(logs[execution.id])) for execution in executions])
+    session.execute(delete(ExecutionLogChunk).where(ExecutionLogChunk.execution_id.in_(ids)))
+    session.execute(delete(TrackedDeployment).where(TrackedDeployment.execution_id.in_(ids)))
+    session.execute(delete(Execution).where(Execution.id.in_(ids)))
+    return len(ids)
+
+
+def archive_plans(session: Session, cutoff: datetime, limit: int) -> int:
+    """Move finished plans created before `cutoff` that no hot execution refers to."""
+
+    newest = select(func.max(Plan.id)).scalar_subquery()
+    plans = session.exec(
+        select(Plan)
+        .where(
+            Plan.status.in_(TERMINAL_STATUSES),
+            Plan.created_at < cutoff,
+            Plan.id < newest,
+            ~exists().where(Execution.plan_id == Plan.id),
+        )
+        .order_by(Plan.created_at, Plan.id)
+        .limit(limit)
+    ).all()
+    if not plans:
+        return 0
+
+    session.add_all([ArchivedPlan(**plan.model_dump()) for plan in plans])
+    session.execute(delete(Plan).where(Plan.id.in_([plan.id for plan in plans])))
+    return len(plans)
+
+
+def run_archival(
+    *,
+    session_factory: Callable = session_scope,
+    now: datetime | None = None,
+) -> ArchiveResult:
+    """Archive everything older than ARCHIVE_AFTER_DAYS, one batch per transaction."""
+
+    result = ArchiveResult()
+    if settings.archive_after_days <= 0:
+        return result
+
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=settings.archive_after_days)
+    for archive, field in ((archive_executions, "executions"), (archive_plans, "plans")):
+        while True:
+            with session_factory() as session:
+                moved = archive(session, cutoff, settings.archive_batch_size)
+            setattr(result, field, getattr(result, field) + moved)
+            if moved < settings.archive_batch_size:
+                break
+
+    if result.executions or result.plans:
+        logger.info("archival_finished", executions=result.executions, plans=result.plans, cutoff=cutoff.isoformat())
+    return result
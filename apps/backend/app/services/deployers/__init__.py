@@ -1,22 +1,39 @@
 from __future__ import annotations
 
-from app.services.deployers.base import BaseDeployer, DeploymentResult
+import httpx
+
+from app.services.deployers.base import AsyncBaseDeployer, BaseDeployer, DeploymentResult
 from app.services.deployers.vercel import VercelDeployer
 from app.services.deployers.render import RenderDeployer
 from app.services.deployers.local import LocalDeployer
+from app.services.deployers.http import (
+    aclose_http_clients,
+    close_http_clients,
+    get_async_http_client,
+    get_http_client,
+)
 
 __all__ = [
+    "AsyncBaseDeployer",
     "BaseDeployer",
     "DeploymentResult",
     "VercelDeployer",
     "RenderDeployer",
     "LocalDeployer",
     "get_deployer",
+    "get_http_client",
+    "close_http_clients",
+    "get_async_http_client",
+    "aclose_http_clients",
 ]
 
 
-def get_deployer(provider: str) -> BaseDeployer:
-    """Factory function to get the appropriate deployer."""
+def get_deployer(provider: str, *, client: httpx.Client | None = None) -> BaseDeployer:
+    """Factory function to get the appropriate deployer.
+
+    HTTP-based deployers use `client` when given, otherwise the process-wide
+    pooled client for their API base URL.
+    """
     deployers = {
         "vercel": VercelDeployer,
         "render": RenderDeployer,
@@ -27,4 +44,6 @@ def get_deployer(provider: str) -> BaseDeployer:
     if deployer_class is None:
         raise ValueError(f"Unknown deploy provider: {provider}. Valid options: {list(deployers.keys())}")
     
-    return deployer_class()
+    if deployer_class is LocalDeployer:
+        return LocalDeployer()
+    return deployer_class(client=client)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any
@@ -14,6 +15,33 @@ class DeploymentResult:
     deployment_id: str | None = None
     logs: list[str] | None = None
     metadata: dict[str, Any] | None = None
+    
+    @classmethod
+    def combine(cls, results: dict[str, DeploymentResult]) -> DeploymentResult:
+        """Summarize per-environment results into one result."""
+        failed = [env for env, result in results.items() if not result.success]
+        succeeded = [env for env, result in results.items() if result.success]
+        if failed:
+            message = f"Deployed {succeeded or 'nothing'}; failed {failed}: " + "; ".join(
+                f"{env}: {results[env].message}" for env in failed
+            )
+        else:
+            message = f"Deployed to {succeeded}"
+        return cls(
+            success=not failed,
+            message=message,
+            metadata={
+                "environments": {
+                    env: {
+                        "success": result.success,
+                        "message": result.message,
+                        "deployment_id": result.deployment_id,
+                        "deployment_url": result.deployment_url,
+                    }
+                    for env, result in results.items()
+                }
+            },
+        )
 
 
 class BaseDeployer(ABC):
@@ -68,3 +96,62 @@ class BaseDeployer(ABC):
             Tuple of (is_valid, error_message)
         """
         return True, ""
+    
+    def deployment_state(self, result: DeploymentResult) -> str:
+        """
+        Normalize a status result to pending, succeeded or failed.
+        
+        Providers with asynchronous builds override this to map their own
+        states; "pending" means the deployment should be polled again.
+        """
+        return "succeeded" if result.success else "failed"
+
+
+class AsyncBaseDeployer(BaseDeployer):
+    """Deployment provider with native async operations.
+    
+    Lets one worker drive many concurrent deployments without blocking on
+    network waits. The sync `BaseDeployer` methods remain available so
+    existing callers keep working.
+    """
+    
+    @abstractmethod
+    async def adeploy(
+        self,
+        *,
+        project_name: str,
+        repo_path: str | None = None,
+        repo_url: str | None = None,
+        environment: str = "production",
+        version: str | None = None,
+    ) -> DeploymentResult:
+        """Async counterpart of `deploy`."""
+        pass
+    
+    @abstractmethod
+    async def aget_deployment_status(self, deployment_id: str) -> DeploymentResult:
+        """Async counterpart of `get_deployment_status`."""
+        pass
+    
+    @abstractmethod
+    async def arollback(self, deployment_id: str) -> DeploymentResult:
+        """Async counterpart of `rollback`."""
+        pass
+    
+    async def abatch_deployment_status(
+        self, deployment_ids: list[str], *, max_concurrency: int = 10
+    ) -> dict[str, DeploymentResult]:
+        """
+        Get the status of many deployments.
+        
+        The default issues one bounded-concurrency request per deployment;
+        providers with a list API override this to batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def status(deployment_id: str) -> DeploymentResult:
+            async with semaphore:
+                return await self.aget_deployment_status(deployment_id)
+        
+        results = await asyncio.gather(*(status(deployment_id) for deployment_id in deployment_ids))
+        return dict(zip(deployment_ids, results, strict=True))
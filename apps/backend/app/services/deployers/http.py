@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from abc import abstractmethod
+from collections.abc import Generator
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.services.deployers.base import AsyncBaseDeployer, DeploymentResult
+from app.services.deployers.throttle import RequestPolicy, flush_http_metrics, get_request_policy
+
+_clients: dict[str, httpx.Client] = {}
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]] = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    if not settings.http_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("http2_unavailable", hint="pip install 'httpx[http2]' to enable HTTP_HTTP2")
+        return False
+    return True
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+def _build_transport() -> httpx.BaseTransport:
+    return httpx.HTTPTransport(limits=_limits(), http2=_http2_enabled())
+
+
+def _build_async_transport() -> httpx.AsyncBaseTransport:
+    return httpx.AsyncHTTPTransport(limits=_limits(), http2=_http2_enabled())
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """Process-wide keep-alive client for one provider base URL.
+
+    Created lazily on first use and shared by every deployer in the process
+    (httpx.Client is thread-safe), so repeated calls reuse TCP+TLS connections.
+    """
+
+    with _lock:
+        client = _clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                base_url=base_url,
+                timeout=settings.http_timeout_seconds,
+                transport=_build_transport(),
+            )
+            _clients[base_url] = client
+        return client
+
+
+def get_async_http_client(base_url: str) -> httpx.AsyncClient:
+    """Keep-alive async client for one provider base URL on the running event loop.
+
+    Async connections belong to the loop that opened them, so pools are kept per loop.
+    """
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=settings.http_timeout_seconds,
+                transport=_build_async_transport(),
+            )
+            clients[base_url] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all pooled clients; call on API/worker shutdown."""
+
+    flush_http_metrics()
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_http_clients() -> None:
+    """Close the async clients pooled for the running event loop."""
+
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def _forget_inherited_clients() -> None:
+    # Sockets inherited across fork belong to the parent; drop (don't close) them.
+    global _lock
+    _clients.clear()
+    _async_clients.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_clients)
+
+
+@dataclass
+class ApiRequest:
+    """One provider API call, independent of whether it is sent sync or async."""
+    method: str
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    params: dict[str, Any] | None = None
+    json: Any = None
+    timeout: float | None = None
+
+
+# A flow yields ApiRequests, receives the matching httpx.Response and returns its result.
+ApiFlow = Generator[ApiRequest, httpx.Response, Any]
+
+
+def _send_kwargs(request: ApiRequest) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {"headers": request.headers, "params": request.params, "json": request.json}
+    if request.timeout is not None:
+        kwargs["timeout"] = request.timeout
+    return kwargs
+
+
+def _send(client: httpx.Client, request: ApiRequest, policy: RequestPolicy | None) -> httpx.Response:
+    attempt = 0
+    while True:
+        if policy is not None:
+            policy.acquire()
+        try:
+            response = client.request(request.method, request.url, **_send_kwargs(request))
+        except httpx.TransportError as exc:
+            delay = policy.retry_delay(request, attempt, error=exc) if policy is not None else None
+            if delay is None:
+                raise
+        else:
+            delay = policy.retry_delay(request, attempt, response=response) if policy is not None else None
+            if delay is None:
+                return response
+        attempt += 1
+        time.sleep(delay)
+
+
+async def _asend(
+    client: httpx.AsyncClient, request: ApiRequest, policy: RequestPolicy | None
+) -> httpx.Response:
+    attempt = 0
+    while True:
+        if policy is not None:
+            await policy.aacquire()
+        try:
+            response = await client.request(request.method, request.url, **_send_kwargs(request))
+        except httpx.TransportError as exc:
+            delay = policy.retry_delay(request, attempt, error=exc) if policy is not None else None
+            if delay is None:
+                raise
+        else:
+            delay = policy.retry_delay(request, attempt, response=response) if policy is not None else None
+            if delay is None:
+                return response
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def run_flow(flow: ApiFlow, client: httpx.Client, policy: RequestPolicy | None = None) -> Any:
+    """Drive `flow` with a sync client; transport errors are raised inside the flow.
+
+    With a `policy`, every request waits for the provider's rate limit and
+    retryable failures are retried before the flow sees the outcome.
+    """
+
+    try:
+        request = next(flow)
+        while True:
+            try:
+                response = _send(client, request, policy)
+            except Exception as exc:  # noqa: BLE001
+                request = flow.throw(exc)
+            else:
+                request = flow.send(response)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def arun_flow(flow: ApiFlow, client: httpx.AsyncClient, policy: RequestPolicy | None = None) -> Any:
+    """Drive `flow` with an async client; transport errors are raised inside the flow."""
+
+    try:
+        request = next(flow)
+        while True:
+            try:
+                response = await _asend(client, request, policy)
+            except Exception as exc:  # noqa: BLE001
+                request = flow.throw(exc)
+            else:
+                request = flow.send(response)
+    except StopIteration as stop:
+        return stop.value
+
+
+class HttpApiDeployer(AsyncBaseDeployer):
+    """Base for deployers that talk to a provider's HTTP API.
+
+    Subclasses describe each operation once as an `ApiFlow`; the sync methods
+    run it on the pooled `httpx.Client` and the async ones on the pooled
+    `httpx.AsyncClient`, so both behave identically. Every request goes
+    through the provider's shared `RequestPolicy` (rate limit, retries,
+    metrics).
+    """
+
+    API_BASE: str
+    PROVIDER: str
+
+    def __init__(
+        self,
+        client: httpx.Client | None = None,
+        async_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        # Shared pooled clients by default; tests/benchmarks may inject their own.
+        self._client = client
+        self._async_client = async_client
+
+    def _http(self) -> httpx.Client:
+        return self._client or get_http_client(self.API_BASE)
+
+    def _ahttp(self) -> httpx.AsyncClient:
+        return self._async_client or get_async_http_client(self.API_BASE)
+
+    def _policy(self) -> RequestPolicy:
+        return get_request_policy(self.PROVIDER)
+
+    def _run(self, flow: ApiFlow) -> Any:
+        return run_flow(flow, self._http(), self._policy())
+
+    async def _arun(self, flow: ApiFlow) -> Any:
+        return await arun_flow(flow, self._ahttp(), self._policy())
+
+    @abstractmethod
+    def _deploy_flow(
+        self,
+        *,
+        project_name: str,
+        repo_path: str | None,
+        repo_url: str | None,
+        environment: str,
+        version: str | None,
+    ) -> ApiFlow:
+        """Requests that start a deployment and turn the responses into a result."""
+
+    @abstractmethod
+    def _status_flow(self, deployment_id: str) -> ApiFlow:
+        """Requests that look up one deployment's status."""
+
+    @abstractmethod
+    def _rollback_flow(self, deployment_id: str) -> ApiFlow:
+        """Requests that roll back to `deployment_id`."""
+
+    def deploy(
+        self,
+        *,
+        project_name: str,
+        repo_path: str | None = None,
+        repo_url: str | None = None,
+        environment: str = "production",
+        version: str | None = None,
+    ) -> DeploymentResult:
+        return self._run(
+            self._deploy_flow(
+                project_name=project_name,
+                repo_path=repo_path,
+                repo_url=repo_url,
+                environment=environment,
+                version=version,
+            )
+        )
+
+    async def adeploy(
+        self,
+        *,
+        project_name: str,
+        repo_path: str | None = None,
+        repo_url: str | None = None,
+        environment: str = "production",
+        version: str | None = None,
+    ) -> DeploymentResult:
+        return await self._arun(
+            self._deploy_flow(
+                project_name=project_name,
+                repo_path=repo_path,
+                repo_url=repo_url,
+                environment=environment,
+                version=version,
+            )
+        )
+
+    def get_deployment_status(self, deployment_id: str) -> DeploymentResult:
+        return self._run(self._status_flow(deployment_id))
+
+    async def aget_deployment_status(self, deployment_id: str) -> DeploymentResult:
+        return await self._arun(self._status_flow(deployment_id))
+
+    def rollback(self, deployment_id: str) -> DeploymentResult:
+        return self._run(self._rollback_flow(deployment_id))
+
+    async def arollback(self, deployment_id: str) -> DeploymentResult:
+        return await self._arun(self._rollback_flow(deployment_id))
@@ -2,20 +2,23 @@ from __future__ import annotations
 
 import os
 import shutil
-import subprocess
+from collections.abc import Callable
 from pathlib import Path
 from typing import Dict
 
 from app.common.logging import logger
 from app.common.settings import settings
 from app.services.deployers.base import BaseDeployer, DeploymentResult
+from app.services.process_runner import run_streaming
 
 
 class LocalDeployer(BaseDeployer):
     """Local deployment provider for running builds locally."""
     
-    def __init__(self) -> None:
+    def __init__(self, on_output: Callable[[str], None] | None = None) -> None:
         self._log = logger.bind(component="local-deployer")
+        # Receives build output line by line while commands run.
+        self._on_output = on_output
     
     @property
     def name(self) -> str:
@@ -127,22 +130,15 @@ class LocalDeployer(BaseDeployer):
         printable = " ".join(command)
         logs.append(f"$ {printable}")
         
-        process = subprocess.run(
-            command,
-            cwd=str(cwd),
-            env=env,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        # Only the tail ends up in the result, so there is nothing to spill to disk.
+        result = run_streaming(command, cwd=cwd, env=env, on_line=self._on_output, spill=False)
         
-        if process.stdout:
-            logs.append(process.stdout.strip())
-        if process.stderr:
-            logs.append(process.stderr.strip())
+        logs.extend(result.tail)
+        if result.truncated:
+            logs.append(f"Output truncated to the last {len(result.tail)} lines")
         
-        if process.returncode != 0:
-            logs.append(f"Command failed with exit code {process.returncode}")
+        if result.returncode != 0:
+            logs.append(f"Command failed with exit code {result.returncode}")
             return False
         
         return True
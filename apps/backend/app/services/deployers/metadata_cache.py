@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.queue.redis_conn import get_redis
+from app.services.deployers.http import ApiFlow, ApiRequest
+
+# Expired entries are kept this many TTLs longer so they can be revalidated with If-None-Match.
+_REVALIDATE_TTLS = 10
+
+
+@dataclass
+class CacheEntry:
+    data: Any
+    etag: str | None
+    stored_at: float
+    ttl: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.stored_at < self.ttl
+
+
+class MetadataCache:
+    """Small TTL + ETag cache for provider metadata (services, latest deployments).
+
+    Entries live in an in-process LRU. With PROVIDER_CACHE_BACKEND=redis they
+    are also written to Redis, so a worker that misses locally can reuse what
+    another worker fetched; other processes' local copies may still lag by up
+    to one TTL after an update.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        redis: Redis | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries if max_entries is not None else settings.provider_cache_max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._redis = redis
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._log = logger.bind(component="provider-cache")
+
+    def _shared(self) -> Redis | None:
+        if settings.provider_cache_backend != "redis":
+            return None
+        self._redis = self._redis or get_redis()
+        return self._redis
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"{settings.rq_queue_name}:provider-cache:{key}"
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Cached entry for `key`, possibly expired (still useful for its ETag)."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry.is_fresh(self._clock()):
+            return entry
+
+        redis = self._shared()
+        if redis is None:
+            return entry
+        try:
+            raw = redis.get(self._redis_key(key))
+        except RedisError as exc:
+            self._log.warning("provider_cache_read_failed", key=key, error=str(exc))
+            return entry
+        if raw is None:
+            return entry
+        shared = CacheEntry(**json.loads(raw))
+        if entry is None or shared.stored_at > entry.stored_at:
+            self._store_local(key, shared)
+            return shared
+        return entry
+
+    def set(self, key: str, data: Any, *, ttl: float, etag: str | None = None) -> CacheEntry:
+        entry = CacheEntry(data=data, etag=etag, stored_at=self._clock(), ttl=ttl)
+        self._store_local(key, entry)
+        redis = self._shared()
+        if redis is not None:
+            try:
+                redis.set(
+                    self._redis_key(key),
+                    json.dumps(entry.__dict__),
+                    ex=max(1, int(ttl * _REVALIDATE_TTLS)),
+                )
+            except RedisError as exc:
+                self._log.warning("provider_cache_write_failed", key=key, error=str(exc))
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        redis = self._shared()
+        if redis is not None:
+            try:
+                redis.delete(self._redis_key(key))
+            except RedisError as exc:
+                self._log.warning("provider_cache_invalidate_failed", key=key, error=str(exc))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def fetch_json(self, key: str, request: ApiRequest, *, ttl: float) -> ApiFlow:
+        """ApiFlow returning the JSON body of GET `request`, served from the cache while fresh.
+
+        Stale entries with an ETag are revalidated with If-None-Match; a 304
+        renews the entry without downloading the body again. Error responses
+        raise httpx.HTTPStatusError and are not cached.
+        """
+
+        entry = self.get(key)
+        if entry is not None and entry.is_fresh(self._clock()):
+            return entry.data
+
+        if entry is not None and entry.etag:
+            request.headers = {**request.headers, "If-None-Match": entry.etag}
+        response: httpx.Response = yield request
+
+        if response.status_code == 304 and entry is not None:
+            self.set(key, entry.data, ttl=ttl, etag=response.headers.get("ETag", entry.etag))
+            return entry.data
+
+        response.raise_for_status()
+        data = response.json()
+        self.set(key, data, ttl=ttl, etag=response.headers.get("ETag"))
+        return data
+
+
+_cache: MetadataCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Process-wide metadata cache shared by all deployers."""
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+import httpx
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.queue.redis_conn import get_redis
+
+if TYPE_CHECKING:
+    from app.services.deployers.http import ApiRequest
+
+
+# Rate limited outright, or a gateway error where the request never reached the app.
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Retry budget (gRPC-style): retries stop once recent failures drain half the tokens.
+_BUDGET_MAX_TOKENS = 10.0
+
+# Counters are pushed to Redis at most this often, so the API can report them.
+_METRICS_FLUSH_SECONDS = 5.0
+
+# After a Redis error the limiter stays on its in-process bucket for this long.
+_REDIS_RETRY_SECONDS = 30.0
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+def rate_limit_key(provider: str) -> str:
+    return f"{settings.rq_queue_name}:ratelimit:{provider}"
+
+
+def http_metrics_key(provider: str) -> str:
+    return f"{settings.rq_queue_name}:http-metrics:{provider}"
+
+
+class LocalTokenBucket:
+    """Thread-safe token bucket for a single process."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._tokens: float | None = None
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, rate: float, burst: int) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+
+        with self._lock:
+            now = self._clock()
+            tokens = burst if self._tokens is None else self._tokens
+            tokens = min(burst, tokens + (now - self._updated) * rate)
+            self._updated = now
+            if tokens >= 1:
+                self._tokens = tokens - 1
+                return 0.0
+            self._tokens = tokens
+            return (1 - tokens) / rate
+
+
+class RedisTokenBucket:
+    """Token bucket shared by every process using the same Redis.
+
+    Refill and take happen atomically in a Lua script on Redis' own clock. If
+    Redis is unreachable the in-process `fallback` bucket is used instead, so a
+    Redis outage degrades to per-process limiting rather than failing deploys.
+    """
+
+    def __init__(self, redis: Redis, key: str, fallback: LocalTokenBucket) -> None:
+        self._script = redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._key = key
+        self._fallback = fallback
+        self._redis_down_until = 0.0
+
+    def reserve(self, rate: float, burst: int) -> float:
+        if time.monotonic() < self._redis_down_until:
+            return self._fallback.reserve(rate, burst)
+        try:
+            return float(self._script(keys=[self._key], args=[rate, burst]))
+        except RedisError as exc:
+            logger.warning("rate_limiter_redis_unavailable", key=self._key, error=str(exc))
+            self._redis_down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+            return self._fallback.reserve(rate, burst)
+
+
+class RetryBudget:
+    """Caps retries relative to recent successes.
+
+    Every failure costs a token and every success earns back
+    HTTP_RETRY_BUDGET_RATIO of one; retries are allowed while more than half
+    of the tokens remain. A provider that is down therefore sees a short burst
+    of retries, then plain single attempts until requests succeed again.
+    """
+
+    def __init__(self) -> None:
+        self._tokens = _BUDGET_MAX_TOKENS
+        self._lock = threading.Lock()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._tokens = min(_BUDGET_MAX_TOKENS, self._tokens + settings.http_retry_budget_ratio)
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._tokens = max(0.0, self._tokens - 1)
+
+    def can_retry(self) -> bool:
+        with self._lock:
+            return self._tokens > _BUDGET_MAX_TOKENS / 2
+
+
+@dataclass
+class HttpMetrics:
+    requests: int = 0
+    throttled: int = 0  # requests that waited on the rate limiter
+    throttle_wait_ms: int = 0
+    rate_limited: int = 0  # 429 responses from the provider
+    retries: int = 0
+    retries_exhausted: int = 0  # retryable failures given up on (attempts, budget or Retry-After)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class RequestPolicy:
+    """Rate limiting, retries and metrics for every HTTP call to one provider."""
+
+    def __init__(self, provider: str, *, redis: Redis | None = None) -> None:
+        self.provider = provider
+        self._local_bucket = LocalTokenBucket()
+        self._redis = redis
+        self._bucket: LocalTokenBucket | RedisTokenBucket | None = None
+        self.budget = RetryBudget()
+        self._metrics = HttpMetrics()
+        self._unflushed = HttpMetrics()
+        self._last_flush = time.monotonic()
+        self._flushing = False
+        self._lock = threading.Lock()
+        self._log = logger.bind(component="http-policy", provider=provider)
+
+    def _get_bucket(self) -> LocalTokenBucket | RedisTokenBucket:
+        if self._bucket is None:
+            if settings.http_rate_limit_backend == "redis":
+                self._redis = self._redis or get_redis()
+                self._bucket = RedisTokenBucket(self._redis, rate_limit_key(self.provider), self._local_bucket)
+            else:
+                self._bucket = self._local_bucket
+        return self._bucket
+
+    def _reserve(self) -> float:
+        rate = settings.http_rate_limit_per_second
+        if rate <= 0:
+            return 0.0
+        return self._get_bucket().reserve(rate, max(1, settings.http_rate_limit_burst))
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self._metrics, name, getattr(self._metrics, name) + delta)
+                setattr(self._unflushed, name, getattr(self._unflushed, name) + delta)
+            due = not self._flushing and time.monotonic() - self._last_flush >= _METRICS_FLUSH_SECONDS
+            self._flushing = self._flushing or due
+        if due:
+            # The flush is a Redis round trip; keep it off the request path and the event loop.
+            threading.Thread(target=self._flush_in_background, name="http-metrics-flush", daemon=True).start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush_metrics()
+        finally:
+            with self._lock:
+                self._flushing = False
+
+    def _throttled(self, waited: float) -> None:
+        self._count(requests=1)
+        if waited:
+            self._count(throttled=1, throttle_wait_ms=int(waited * 1000))
+            self._log.info("http_request_throttled", waited_ms=int(waited * 1000))
+
+    def acquire(self) -> None:
+        """Block until the provider's rate limit allows another request."""
+
+        waited = 0.0
+        while (delay := self._reserve()) > 0:
+            time.sleep(delay)
+            waited += delay
+        self._throttled(waited)
+
+    async def aacquire(self) -> None:
+        waited = 0.0
+        while True:
+            if isinstance(self._get_bucket(), RedisTokenBucket) and settings.http_rate_limit_per_second > 0:
+                delay = await asyncio.to_thread(self._reserve)
+            else:
+                delay = self._reserve()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+            waited += delay
+        self._throttled(waited)
+
+    def retry_delay(
+        self,
+        request: ApiRequest,
+        attempt: int,
+        *,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """Seconds to wait before retrying `request`, or None to stop here.
+
+        429s are retried for any method (the provider rejected the request
+        outright); gateway errors and dropped connections only for idempotent
+        methods, so a deploy is never created twice. Connection failures are
+        retried for any method since nothing was sent.
+        """
+
+        idempotent = request.method.upper() in IDEMPOTENT_METHODS
+        if response is not None:
+            status = response.status_code
+            if status == 429:
+                self._count(rate_limited=1)
+            if status in RETRYABLE_STATUS_CODES or status >= 500:
+                self.budget.on_failure()
+            else:
+                self.budget.on_success()
+            retryable = status == 429 or (status in RETRYABLE_STATUS_CODES and idempotent)
+        else:
+            self.budget.on_failure()
+            retryable = isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)) or (
+                isinstance(error, httpx.TransportError) and idempotent
+            )
+
+        if not retryable:
+            return None
+
+        reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            cap = settings.http_retry_base_delay_seconds * 2**attempt
+            delay = random.uniform(0, min(settings.http_retry_max_delay_seconds, cap))
+
+        if (
+            attempt >= settings.http_max_retries
+            or delay > settings.http_retry_max_delay_seconds
+            or not self.budget.can_retry()
+        ):
+            self._count(retries_exhausted=1)
+            self._log.warning(
+                "http_retry_exhausted", url=request.url, attempt=attempt, reason=reason, retry_after=retry_after
+            )
+            return None
+
+        self._count(retries=1)
+        self._log.info("http_retry_scheduled", url=request.url, attempt=attempt + 1, reason=reason, delay=delay)
+        return delay
+
+    def metrics(self) -> HttpMetrics:
+        with self._lock:
+            return HttpMetrics(**asdict(self._metrics))
+
+    def flush_metrics(self) -> None:
+        """Add counters accumulated since the last flush to the shared Redis hash."""
+
+        with self._lock:
+            pending, self._unflushed = self._unflushed, HttpMetrics()
+            self._last_flush = time.monotonic()
+        deltas = {name: value for name, value in asdict(pending).items() if value}
+        if not deltas or settings.http_rate_limit_backend != "redis":
+            return
+        try:
+            redis = self._redis = self._redis or get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for name, value in deltas.items():
+                pipe.hincrby(http_metrics_key(self.provider), name, value)
+            pipe.execute()
+        except RedisError as exc:
+            self._log.warning("http_metrics_flush_failed", error=str(exc))
+
+
+_policies: dict[str, RequestPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_request_policy(provider: str) -> RequestPolicy:
+    """Process-wide policy for `provider`, shared by all of its deployers."""
+
+    with _policies_lock:
+        policy = _policies.get(provider)
+        if policy is None:
+            policy = _policies[provider] = RequestPolicy(provider)
+        return policy
+
+
+def flush_http_metrics() -> None:
+    with _policies_lock:
+        policies = list(_policies.values())
+    for policy in policies:
+        policy.flush_metrics()
+
+
+def read_http_metrics(redis: Redis, providers: list[str]) -> dict[str, HttpMetrics]:
+    """Counters summed over every process, as last flushed to Redis."""
+
+    pipe = redis.pipeline(transaction=False)
+    for provider in providers:
+        pipe.hgetall(http_metrics_key(provider))
+    metrics: dict[str, HttpMetrics] = {}
+    for provider, values in zip(providers, pipe.execute(), strict=True):
+        counters = {
+            (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in (values or {}).items()
+        }
+        metrics[provider] = HttpMetrics(
+            **{name: counters.get(name, 0) for name in HttpMetrics.__dataclass_fields__}
+        )
+    return metrics
+
+
+def _forget_inherited_policies() -> None:
+    # Buckets, budgets and counters are per process; the shared state lives in Redis.
+    global _policies_lock
+    _policies.clear()
+    _policies_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_policies)
@@ -4,15 +4,33 @@ import httpx
 
 from app.common.logging import logger
 from app.common.settings import settings
-from app.services.deployers.base import BaseDeployer, DeploymentResult
+from app.services.deployers.base import DeploymentResult
+from app.services.deployers.http import ApiFlow, ApiRequest, HttpApiDeployer
+from app.services.deployers.metadata_cache import MetadataCache, get_metadata_cache
 
 
-class VercelDeployer(BaseDeployer):
-    """Vercel deployment provider using the Vercel API."""
+class VercelDeployer(HttpApiDeployer):
+    """Vercel deployment provider using the Vercel API.
+    
+    Each operation is written once as an ApiFlow; `deploy`/`adeploy` etc. are
+    provided by HttpApiDeployer on top of the sync and async pooled clients.
+    """
     
     VERCEL_API_BASE = "https://api.vercel.com"
+    API_BASE = VERCEL_API_BASE
+    PROVIDER = "vercel"
+    
+    # Deployments listed per batched status request (Vercel's maximum page size).
+    BATCH_LIMIT = 100
     
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        client: httpx.Client | None = None,
+        async_client: httpx.AsyncClient | None = None,
+        cache: MetadataCache | None = None,
+    ) -> None:
+        super().__init__(client, async_client)
+        self._cache = cache or get_metadata_cache()
         self._log = logger.bind(component="vercel-deployer")
         self._token = settings.vercel_token
         self._org_id = settings.vercel_org_id
@@ -28,20 +46,23 @@ class VercelDeployer(BaseDeployer):
             "Content-Type": "application/json",
         }
     
+    def _latest_deployment_key(self) -> str:
+        return f"vercel:{self._org_id or '-'}:{self._project_id}:latest-deployment"
+    
     def validate_config(self) -> tuple[bool, str]:
         if not self._token:
             return False, "VERCEL_TOKEN is required for Vercel deployments"
         return True, ""
     
-    def deploy(
+    def _deploy_flow(
         self,
         *,
         project_name: str,
-        repo_path: str | None = None,
-        repo_url: str | None = None,
-        environment: str = "production",
-        version: str | None = None,
-    ) -> DeploymentResult:
+        repo_path: str | None,
+        repo_url: str | None,
+        environment: str,
+        version: str | None,
+    ) -> ApiFlow:
         """
         Trigger a Vercel deployment.
         
@@ -63,7 +84,7 @@ class VercelDeployer(BaseDeployer):
             
             # If we have a project ID, we can trigger deployment via API
             if self._project_id:
-                return self._deploy_via_api(project_name, target, version, logs)
+                return (yield from self._deploy_via_api(project_name, target, version, logs))
             
             # Otherwise, trigger via deploy hook if configured
             if repo_url:
@@ -86,86 +107,111 @@ class VercelDeployer(BaseDeployer):
     
     def _deploy_via_api(
         self, project_name: str, target: str, version: str | None, logs: list[str]
-    ) -> DeploymentResult:
+    ) -> ApiFlow:
         """Deploy using Vercel API to create a new deployment."""
         
-        with httpx.Client(timeout=60.0) as client:
-            # Create deployment
-            payload = {
-                "name": project_name,
-                "target": target,
-                "projectSettings": {
-                    "framework": None,  # Auto-detect
-                },
+        # Create deployment
+        payload = {
+            "name": project_name,
+            "target": target,
+            "projectSettings": {
+                "framework": None,  # Auto-detect
+            },
+        }
+        
+        if version:
+            payload["gitSource"] = {
+                "ref": version,
+                "type": "github",  # or gitlab, bitbucket
             }
-            
-            if version:
-                payload["gitSource"] = {
-                    "ref": version,
-                    "type": "github",  # or gitlab, bitbucket
-                }
-            
-            params = {}
-            if self._org_id:
-                params["teamId"] = self._org_id
-            
-            logs.append(f"Creating deployment via Vercel API...")
-            
-            # List recent deployments to get latest or trigger new one
-            response = client.get(
+        
+        params = {}
+        if self._org_id:
+            params["teamId"] = self._org_id
+        
+        logs.append("Creating deployment via Vercel API...")
+        
+        # Latest deployment to redeploy from (cached; refreshed by our own redeploys)
+        latest_key = self._latest_deployment_key()
+        data = yield from self._cache.fetch_json(
+            latest_key,
+            ApiRequest(
+                "GET",
                 f"{self.VERCEL_API_BASE}/v6/deployments",
                 headers=self._headers(),
                 params={**params, "projectId": self._project_id, "limit": 1},
+            ),
+            ttl=settings.provider_cache_latest_ttl_seconds,
+        )
+        
+        if data.get("deployments"):
+            latest = data["deployments"][0]
+            deployment_url = f"https://{latest.get('url', '')}"
+            logs.append(f"Latest deployment: {deployment_url}")
+            logs.append(f"State: {latest.get('state', 'unknown')}")
+            
+            # Trigger redeploy
+            redeploy_response = yield ApiRequest(
+                "POST",
+                f"{self.VERCEL_API_BASE}/v13/deployments",
+                headers=self._headers(),
+                params=params,
+                json={
+                    "name": project_name,
+                    "target": target,
+                    "deploymentId": latest["uid"],  # Redeploy from this
+                },
             )
-            response.raise_for_status()
-            data = response.json()
             
-            if data.get("deployments"):
-                latest = data["deployments"][0]
-                deployment_url = f"https://{latest.get('url', '')}"
-                logs.append(f"Latest deployment: {deployment_url}")
-                logs.append(f"State: {latest.get('state', 'unknown')}")
+            if redeploy_response.status_code in (200, 201):
+                new_deployment = redeploy_response.json()
+                new_url = f"https://{new_deployment.get('url', '')}"
+                logs.append(f"New deployment triggered: {new_url}")
                 
-                # Trigger redeploy
-                redeploy_response = client.post(
-                    f"{self.VERCEL_API_BASE}/v13/deployments",
-                    headers=self._headers(),
-                    params=params,
-                    json={
-                        "name": project_name,
-                        "target": target,
-                        "deploymentId": latest["uid"],  # Redeploy from this
+                # The new deployment is now the project's latest; no need to list again.
+                self._cache.set(
+                    latest_key,
+                    {
+                        "deployments": [
+                            {
+                                "uid": new_deployment.get("id"),
+                                "url": new_deployment.get("url", ""),
+                                "state": new_deployment.get("readyState", "BUILDING"),
+                            }
+                        ]
                     },
+                    ttl=settings.provider_cache_latest_ttl_seconds,
                 )
                 
-                if redeploy_response.status_code in (200, 201):
-                    new_deployment = redeploy_response.json()
-                    new_url = f"https://{new_deployment.get('url', '')}"
-                    logs.append(f"New deployment triggered: {new_url}")
-                    
-                    return DeploymentResult(
-                        success=True,
-                        message=f"Deployment triggered successfully",
-                        deployment_url=new_url,
-                        deployment_id=new_deployment.get("id"),
-                        logs=logs,
-                        metadata={"state": new_deployment.get("readyState", "BUILDING")},
-                    )
-            
-            logs.append("No existing deployments found. Connect your Git repo to Vercel first.")
-            return DeploymentResult(
-                success=False,
-                message="No deployments found. Please connect your Git repository to Vercel.",
-                logs=logs,
-            )
+                return DeploymentResult(
+                    success=True,
+                    message="Deployment triggered successfully",
+                    deployment_url=new_url,
+                    deployment_id=new_deployment.get("id"),
+                    logs=logs,
+                    metadata={"state": new_deployment.get("readyState", "BUILDING")},
+                )
+        
+            # The cached pointer may be stale (e.g. the deployment was deleted).
+            self._cache.invalidate(latest_key)
+            logs.append(f"Redeploy failed: {redeploy_response.status_code}")
+        else:
+            self._cache.invalidate(latest_key)
+        
+        logs.append("No existing deployments found. Connect your Git repo to Vercel first.")
+        return DeploymentResult(
+            success=False,
+            message="No deployments found. Please connect your Git repository to Vercel.",
+            logs=logs,
+        )
     
     def _deploy_via_git(
         self, repo_url: str, target: str, version: str | None, logs: list[str]
     ) -> DeploymentResult:
         """For Git-connected projects, pushing to the repo triggers deployment."""
-        logs.append(f"Git-based deployment: Push to your repo to trigger Vercel deployment")
+        logs.append("Git-based deployment: Push to your repo to trigger Vercel deployment")
         logs.append(f"Repo: {repo_url}")
-        logs.append(f"Vercel will auto-deploy on push to main/master branch")
+        logs.append("Vercel will auto-deploy on push to main/master branch")
         
         return DeploymentResult(
             success=True,
@@ -174,68 +220,127 @@ class VercelDeployer(BaseDeployer):
             metadata={"deploy_method": "git_push"},
         )
     
-    def get_deployment_status(self, deployment_id: str) -> DeploymentResult:
+    def _status_flow(self, deployment_id: str) -> ApiFlow:
         """Get status of a Vercel deployment."""
         is_valid, error = self.validate_config()
         if not is_valid:
             return DeploymentResult(success=False, message=error)
         
         try:
-            with httpx.Client(timeout=30.0) as client:
-                params = {}
-                if self._org_id:
-                    params["teamId"] = self._org_id
-                
-                response = client.get(
-                    f"{self.VERCEL_API_BASE}/v13/deployments/{deployment_id}",
-                    headers=self._headers(),
-                    params=params,
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                state = data.get("readyState", "UNKNOWN")
-                url = f"https://{data.get('url', '')}"
-                
-                return DeploymentResult(
-                    success=state in ("READY", "QUEUED", "BUILDING"),
-                    message=f"Deployment state: {state}",
-                    deployment_url=url,
-                    deployment_id=deployment_id,
-                    metadata={"state": state, "created": data.get("created")},
-                )
+            params = {}
+            if self._org_id:
+                params["teamId"] = self._org_id
+            
+            response = yield ApiRequest(
+                "GET",
+                f"{self.VERCEL_API_BASE}/v13/deployments/{deployment_id}",
+                headers=self._headers(),
+                params=params,
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            state = data.get("readyState", "UNKNOWN")
+            url = f"https://{data.get('url', '')}"
+            
+            return DeploymentResult(
+                success=state in ("READY", "QUEUED", "BUILDING"),
+                message=f"Deployment state: {state}",
+                deployment_url=url,
+                deployment_id=deployment_id,
+                metadata={"state": state, "created": data.get("created")},
+            )
         except Exception as e:
             return DeploymentResult(success=False, message=str(e))
     
-    def rollback(self, deployment_id: str) -> DeploymentResult:
+    def deployment_state(self, result: DeploymentResult) -> str:
+        state = (result.metadata or {}).get("state")
+        if state == "READY":
+            return "succeeded"
+        if state in ("ERROR", "CANCELED", "DELETED"):
+            return "failed"
+        # QUEUED / BUILDING / INITIALIZING, or a transient lookup error
+        return "pending"
+    
+    def _batch_status_flow(self, deployment_ids: list[str]) -> ApiFlow:
+        """Look up many deployments with a single list-deployments request."""
+        params = {"projectId": self._project_id, "limit": self.BATCH_LIMIT}
+        if self._org_id:
+            params["teamId"] = self._org_id
+        
+        try:
+            response = yield ApiRequest(
+                "GET",
+                f"{self.VERCEL_API_BASE}/v6/deployments",
+                headers=self._headers(),
+                params=params,
+            )
+            response.raise_for_status()
+            listed = {d.get("uid"): d for d in response.json().get("deployments", [])}
+        except Exception as e:
+            self._log.warning("vercel_batch_status_failed", error=str(e))
+            return {}
+        
+        results: dict[str, DeploymentResult] = {}
+        for deployment_id in deployment_ids:
+            data = listed.get(deployment_id)
+            if data is None:
+                continue
+            state = data.get("state") or data.get("readyState", "UNKNOWN")
+            results[deployment_id] = DeploymentResult(
+                success=state in ("READY", "QUEUED", "BUILDING"),
+                message=f"Deployment state: {state}",
+                deployment_url=f"https://{data.get('url', '')}",
+                deployment_id=deployment_id,
+                metadata={"state": state, "created": data.get("created")},
+            )
+        return results
+    
+    async def abatch_deployment_status(
+        self, deployment_ids: list[str], *, max_concurrency: int = 10
+    ) -> dict[str, DeploymentResult]:
+        """Batch via the list-deployments API; fall back per deployment for ids not in the page."""
+        is_valid, _ = self.validate_config()
+        if not is_valid or not self._project_id:
+            return await super().abatch_deployment_status(deployment_ids, max_concurrency=max_concurrency)
+        
+        results = await self._arun(self._batch_status_flow(deployment_ids))
+        missing = [deployment_id for deployment_id in deployment_ids if deployment_id not in results]
+        if missing:
+            results.update(
+                await super().abatch_deployment_status(missing, max_concurrency=max_concurrency)
+            )
+        return results
+    
+    def _rollback_flow(self, deployment_id: str) -> ApiFlow:
         """Rollback by promoting a previous deployment."""
         is_valid, error = self.validate_config()
         if not is_valid:
             return DeploymentResult(success=False, message=error)
         
         try:
-            with httpx.Client(timeout=60.0) as client:
-                params = {}
-                if self._org_id:
-                    params["teamId"] = self._org_id
-                
-                # Promote the specified deployment to production
-                response = client.post(
-                    f"{self.VERCEL_API_BASE}/v10/projects/{self._project_id}/promote/{deployment_id}",
-                    headers=self._headers(),
-                    params=params,
-                )
-                
-                if response.status_code in (200, 201):
-                    return DeploymentResult(
-                        success=True,
-                        message=f"Rolled back to deployment {deployment_id}",
-                        deployment_id=deployment_id,
-                    )
-                
+            params = {}
+            if self._org_id:
+                params["teamId"] = self._org_id
+            
+            # Promote the specified deployment to production
+            response = yield ApiRequest(
+                "POST",
+                f"{self.VERCEL_API_BASE}/v10/projects/{self._project_id}/promote/{deployment_id}",
+                headers=self._headers(),
+                params=params,
+            )
+            
+            if response.status_code in (200, 201):
                 return DeploymentResult(
-                    success=False,
-                    message=f"Rollback failed: {response.text}",
+                    success=True,
+                    message=f"Rolled back to deployment {deployment_id}",
+                    deployment_id=deployment_id,
                 )
+            
+            return DeploymentResult(
+                success=False,
+                message=f"Rollback failed: {response.text}",
+            )
         except Exception as e:
             return DeploymentResult(success=False, message=str(e))
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlmodel import Session
+
+from app.common.logging import logger
+from app.common.settings import settings
+from app.persistence.db import session_scope
+from app.persistence.models import TrackedDeployment
+from app.persistence.repositories import (
+    append_execution_log_lines,
+    create_tracked_deployment,
+    get_execution,
+    get_plan,
+    list_due_tracked_deployments,
+    list_tracked_deployments,
+    set_execution_status,
+    update_plan_status,
+)
+from app.queue.events import ExecutionEventPublisher
+from app.services.deployers import AsyncBaseDeployer, BaseDeployer, DeploymentResult, get_deployer
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored as UTC.
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def track_deployments(
+    session: Session, execution_id: int, provider: str, summary: DeploymentResult | None
+) -> list[TrackedDeployment]:
+    """Register every deployment in an orchestrator summary for status polling."""
+
+    environments = ((summary.metadata or {}).get("environments") or {}) if summary else {}
+    return [
+        create_tracked_deployment(
+            session,
+            execution_id=execution_id,
+            provider=provider,
+            environment=environment,
+            deployment_id=details["deployment_id"],
+        )
+        for environment, details in environments.items()
+        if details.get("success") and details.get("deployment_id")
+    ]
+
+
+class DeploymentTracker:
+    """Polls in-flight provider deployments until they reach a final state.
+
+    Each tick loads at most TRACKER_BATCH_SIZE due deployments, groups them by
+    provider and asks each provider for their status in one batched call
+    (a single list request for Vercel, bounded-concurrency lookups
+    otherwise). Deployments whose status did not change back off
+    exponentially with jitter; a change resets the backoff. When every
+    deployment of an execution is final, the execution and its plan are
+    marked succeeded or failed.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable = session_scope,
+        deployer_factory: Callable[[str], BaseDeployer] = get_deployer,
+        publisher: ExecutionEventPublisher | None = None,
+        clock: Callable[[], datetime] = _utc_now,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._session_factory = session_factory
+        self._deployer_factory = deployer_factory
+        self._deployers: dict[str, BaseDeployer] = {}
+        self._publisher = publisher
+        self._clock = clock
+        self._rng = rng
+        self._log = logger.bind(component="deployment-tracker")
+
+    def _deployer(self, provider: str) -> BaseDeployer:
+        if provider not in self._deployers:
+            self._deployers[provider] = self._deployer_factory(provider)
+        return self._deployers[provider]
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(
+            settings.tracker_max_backoff_seconds,
+            settings.tracker_initial_backoff_seconds * 2**attempts,
+        )
+        return timedelta(seconds=delay * (0.8 + 0.4 * self._rng()))
+
+    async def _fetch(self, provider: str, deployment_ids: list[str]) -> dict[str, DeploymentResult]:
+        deployer = self._deployer(provider)
+        try:
+            if isinstance(deployer, AsyncBaseDeployer):
+                return await deployer.abatch_deployment_status(
+                    deployment_ids, max_concurrency=settings.tracker_max_concurrency
+                )
+            results = await asyncio.to_thread(
+                lambda: {d: deployer.get_deployment_status(d) for d in deployment_ids}
+            )
+            return results
+        except Exception as exc:  # noqa: BLE001
+            self._log.warning("deployment_status_fetch_failed", provider=provider, error=str(exc))
+            return {}
+
+    async def poll_once(self) -> int:
+        """Poll every due deployment once; returns how many were polled."""
+
+        now = self._clock()
+        with self._session_factory() as session:
+            due = [
+                (tracked.id, tracked.provider, tracked.deployment_id)
+                for tracked in list_due_tracked_deployments(session, now, settings.tracker_batch_size)
+            ]
+        if not due:
+            return 0
+
+        by_provider: dict[str, list[str]] = defaultdict(list)
+        for _, provider, deployment_id in due:
+            by_provider[provider].append(deployment_id)
+
+        # No database session is held while waiting on the providers.
+        fetched = await asyncio.gather(
+            *(self._fetch(provider, ids) for provider, ids in by_provider.items())
+        )
+        statuses = {
+            (provider, deployment_id): result
+            for provider, results in zip(by_provider, fetched, strict=True)
+            for deployment_id, result in results.items()
+        }
+
+        with self._session_factory() as session:
+            self._apply(session, [tracked_id for tracked_id, _, _ in due], statuses, self._clock())
+        return len(due)
+
+    def _apply(
+        self,
+        session: Session,
+        tracked_ids: list[int],
+        statuses: dict[tuple[str, str], DeploymentResult],
+        now: datetime,
+    ) -> None:
+        log_lines: dict[int, list[str]] = defaultdict(list)
+        finished_executions: set[int] = set()
+
+        for tracked_id in tracked_ids:
+            tracked = session.get(TrackedDeployment, tracked_id)
+            if tracked is None or tracked.state != "pending":
+                continue
+
+            deployer = self._deployer(tracked.provider)
+            prefix = f"[{tracked.environment}] {deployer.name} deployment {tracked.deployment_id}"
+            result = statuses.get((tracked.provider, tracked.deployment_id))
+            if result is None:
+                # Provider lookup failed; retry later like an unchanged status.
+                state, provider_status = "pending", None
+            else:
+                state = deployer.deployment_state(result)
+                metadata = result.metadata or {}
+                provider_status = metadata.get("state") or metadata.get("status")
+
+            if provider_status and provider_status != tracked.provider_status:
+                tracked.provider_status = provider_status
+                tracked.attempts = 0
+                log_lines[tracked.execution_id].append(f"{prefix}: {provider_status}")
+            else:
+                tracked.attempts += 1
+
+            timed_out = now - _as_utc(tracked.created_at) > timedelta(
+                seconds=settings.tracker_timeout_seconds
+            )
+            if state == "pending" and timed_out:
+                state = "failed"
+                log_lines[tracked.execution_id].append(f"{prefix}: gave up waiting after timeout")
+
+            tracked.last_checked_at = now
+            if state == "pending":
+                tracked.next_poll_at = now + self._backoff(tracked.attempts)
+            else:
+                tracked.state = state
+                tracked.finished_at = now
+                finished_executions.add(tracked.execution_id)
+            session.add(tracked)
+
+        for execution_id, lines in log_lines.items():
+            execution = get_execution(session, execution_id)
+            if execution is not None:
+                append_execution_log_lines(session, execution, lines)
+        session.commit()
+
+        if self._publisher is not None:
+            for execution_id, lines in log_lines.items():
+                self._publisher.publish_log(execution_id, lines)
+
+        for execution_id in finished_executions:
+            self._finish_execution(session, execution_id)
+
+    def _finish_execution(self, session: Session, execution_id: int) -> None:
+        tracked = list_tracked_deployments(session, execution_id)
+        if any(t.state == "pending" for t in tracked):
+            return
+
+        execution = get_execution(session, execution_id)
+        if execution is None or execution.status != "deploying":
+            return
+
+        failed = [t.environment for t in tracked if t.state == "failed"]
+        status = "failed" if failed else "succeeded"
+        line = f"Deployment failed in {failed}" if failed else "All deployments are live"
+        append_execution_log_lines(session, execution, [line])
+        set_execution_status(session, execution, status)
+
+        plan = get_plan(session, execution.plan_id)
+        if plan is not None:
+            update_plan_status(session, plan, status)
+        session.commit()
+
+        if self._publisher is not None:
+            self._publisher.publish_log(execution_id, [line])
+            self._publisher.publish_status(execution_id, status)
+        self._log.info("execution_deployments_finished", execution_id=execution_id, status=status)
+
+    async def run_forever(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        self._log.info("tracker_started", interval=settings.tracker_poll_interval_seconds)
+        while not stop.is_set():
+            try:
+                await self.poll_once()
+            except Exception:  # noqa: BLE001
+                self._log.exception("tracker_poll_failed")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=settings.tracker_poll_interval_seconds)
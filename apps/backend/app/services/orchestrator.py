@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-import json
 import os
-import subprocess
 import shutil
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict
 
 from app.common.logging import logger
 from app.common.settings import settings
-from app.persistence.models import Execution, Plan, Project
-from app.persistence.repositories import append_execution_log
+from app.persistence.log_buffer import BufferedExecutionLog
+from app.persistence.models import Plan, Project
 from app.services.policy import ensure_execution_allowed
-from app.services.deployers import get_deployer, DeploymentResult
+from app.services.process_runner import run_streaming
+from app.services.deployers import BaseDeployer, DeploymentResult, get_deployer
 
 
 def _strip_wrapping_quotes(value: str) -> str:
@@ -23,81 +23,138 @@ def _strip_wrapping_quotes(value: str) -> str:
 
 
 class Orchestrator:
-    def __init__(self) -> None:
+    def __init__(self, deployer: BaseDeployer | None = None) -> None:
         self._log = logger.bind(component="orchestrator")
+        # Defaults to the configured DEPLOY_PROVIDER when not injected.
+        self._deployer = deployer
 
-    def run(self, *, project: Project, plan: Plan, execution: Execution, session) -> None:
+    def run(self, *, project: Project, plan: Plan, log: BufferedExecutionLog) -> DeploymentResult | None:
         """Execute a plan.
 
         MVP behavior is DRY-RUN by default: it logs intended actions rather than running them.
         Uses configured deploy provider (local, vercel, render) for actual deployments.
+        Returns the combined cloud deployment result, whose deployment ids may
+        still be building at the provider, or None for dry and local runs.
         """
 
-        environments = json.loads(plan.environments_json)
-        post_steps = json.loads(plan.post_steps_json)
+        environments = plan.environments
+        post_steps = plan.post_steps
 
-        append_execution_log(session, execution, f"DRY_RUN={settings.dry_run}")
-        append_execution_log(session, execution, f"DEPLOY_PROVIDER={settings.deploy_provider}")
-        append_execution_log(session, execution, f"Action={plan.action} Version={plan.version} Env={environments}")
-        append_execution_log(session, execution, f"PostSteps={post_steps}")
+        log.write(f"DRY_RUN={settings.dry_run}")
+        log.write(f"DEPLOY_PROVIDER={settings.deploy_provider}")
+        log.write(f"Action={plan.action} Version={plan.version} Env={environments}")
+        log.write(f"PostSteps={post_steps}")
 
         if settings.dry_run:
-            append_execution_log(
-                session,
-                execution,
-                f"[DRY RUN] Would deploy via {settings.deploy_provider}: git checkout, build, deploy",
-            )
-            return
+            log.write(f"[DRY RUN] Would deploy via {settings.deploy_provider}: git checkout, build, deploy")
+            return None
 
         # Use the configured deployment provider
         deploy_provider = settings.deploy_provider.lower()
         
         if deploy_provider in ("vercel", "render"):
-            self._deploy_to_cloud(project, plan, execution, session, environments)
-        else:
-            # Local deployment (original behavior)
-            self._deploy_local(project, plan, execution, session)
+            return self._deploy_to_cloud(project, plan, log, environments)
+
+        # Local deployment (original behavior)
+        self._deploy_local(project, log)
+        return None
 
     def _deploy_to_cloud(
-        self, project: Project, plan: Plan, execution: Execution, session, environments: list[str]
-    ) -> None:
-        """Deploy to cloud provider (Vercel or Render)."""
-        deployer = get_deployer(settings.deploy_provider)
+        self, project: Project, plan: Plan, log: BufferedExecutionLog, environments: list[str]
+    ) -> DeploymentResult:
+        """Deploy to cloud provider (Vercel or Render).
+
+        Environments are deployed concurrently (up to DEPLOY_MAX_PARALLELISM).
+        Gated environments (DEPLOY_GATED_ENVIRONMENTS, production by default)
+        only start once every other environment in the plan has succeeded.
+        Deployer calls run on pool threads; all log writes stay on this thread.
+        """
+        deployer = self._deployer or get_deployer(settings.deploy_provider)
         
         # Validate configuration
         is_valid, error = deployer.validate_config()
         if not is_valid:
-            append_execution_log(session, execution, f"ERROR: {error}")
+            log.write(f"ERROR: {error}")
             raise ValueError(error)
         
-        append_execution_log(session, execution, f"Deploying to {deployer.name}...")
+        log.write(f"Deploying to {deployer.name}...")
+        
+        gated = {e.strip() for e in settings.deploy_gated_environments.split(",") if e.strip()}
+        waves = [
+            [env for env in environments if env not in gated],
+            [env for env in environments if env in gated],
+        ]
+        max_workers = max(1, min(settings.deploy_max_parallelism, len(environments)))
+        results: dict[str, DeploymentResult] = {}
         
-        # Deploy for each environment
-        for env in environments:
-            append_execution_log(session, execution, f"Deploying to {env}...")
-            
-            result = deployer.deploy(
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deploy") as pool:
+            for wave in waves:
+                if not wave:
+                    continue
+                
+                failed = [env for env, result in results.items() if not result.success]
+                if failed:
+                    for env in wave:
+                        results[env] = DeploymentResult(
+                            success=False, message=f"Skipped after failed deployment(s) {failed}"
+                        )
+                        self._log_deployment(log, env, results[env])
+                    continue
+                
+                futures = {}
+                for env in wave:
+                    log.write(f"[{env}] Deploying to {env}...")
+                    futures[pool.submit(self._deploy_environment, deployer, project, plan, env)] = env
+                log.flush()
+                
+                pending = set(futures)
+                while pending:
+                    # Wake up periodically so the lines of environments that
+                    # already finished reach viewers while the others deploy.
+                    done, pending = wait(pending, timeout=log.flush_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        env = futures[future]
+                        result = future.result()
+                        results[env] = result
+                        self._log_deployment(log, env, result)
+                    log.flush_if_due()
+        
+        summary = DeploymentResult.combine(results)
+        log.write(summary.message)
+        if not summary.success:
+            raise RuntimeError(f"Deployment failed: {summary.message}")
+        return summary
+
+    @staticmethod
+    def _deploy_environment(
+        deployer: BaseDeployer, project: Project, plan: Plan, env: str
+    ) -> DeploymentResult:
+        try:
+            return deployer.deploy(
                 project_name=project.name,
                 repo_path=project.repo_path,
                 repo_url=project.repo_url,
                 environment=env,
                 version=plan.version,
             )
-            
-            # Log the deployment result
-            if result.logs:
-                for log_line in result.logs:
-                    append_execution_log(session, execution, log_line)
-            
-            if result.deployment_url:
-                append_execution_log(session, execution, f"Deployment URL: {result.deployment_url}")
-            
-            if not result.success:
-                raise RuntimeError(f"Deployment failed: {result.message}")
-            
-            append_execution_log(session, execution, f"✓ {env} deployment: {result.message}")
-
-    def _deploy_local(self, project: Project, plan: Plan, execution: Execution, session) -> None:
+        except Exception as exc:  # noqa: BLE001
+            return DeploymentResult(success=False, message=str(exc))
+
+    @staticmethod
+    def _log_deployment(log: BufferedExecutionLog, env: str, result: DeploymentResult) -> None:
+        prefix = f"[{env}]"
+        for log_line in result.logs or []:
+            log.write(f"{prefix} {log_line}")
+        
+        if result.deployment_url:
+            log.write(f"{prefix} Deployment URL: {result.deployment_url}")
+        
+        if result.success:
+            log.write(f"{prefix} ✓ {env} deployment: {result.message}")
+        else:
+            log.write(f"{prefix} ✗ {env} deployment failed: {result.message}")
+
+    def _deploy_local(self, project: Project, log: BufferedExecutionLog) -> None:
         """Original local deployment behavior."""
         ensure_execution_allowed()
 
@@ -122,7 +179,7 @@ class Orchestrator:
         ]
 
         for cmd in commands:
-            self._run_command(cmd, repo_dir, env, session, execution)
+            self._run_command(cmd, repo_dir, env, log)
 
     def _load_env_file(self, path: Path) -> Dict[str, str]:
         data: Dict[str, str] = {}
@@ -145,28 +202,24 @@ class Orchestrator:
         command: list[str],
         cwd: Path,
         env: Dict[str, str],
-        session,
-        execution: Execution,
+        log: BufferedExecutionLog,
     ) -> None:
         printable = " ".join(command)
-        append_execution_log(session, execution, f"$ {printable}")
+        log.write(f"$ {printable}")
 
-        process = subprocess.run(
+        # Output is streamed into the execution log as it arrives, so nothing
+        # needs to be retained (or spilled) here.
+        result = run_streaming(
             command,
-            cwd=str(cwd),
+            cwd=cwd,
             env=env,
-            capture_output=True,
-            text=True,
-            check=False,
+            on_line=log.write,
+            on_idle=log.flush,
+            spill=False,
         )
 
-        if process.stdout:
-            append_execution_log(session, execution, process.stdout.strip())
-        if process.stderr:
-            append_execution_log(session, execution, process.stderr.strip())
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Command '{printable}' failed with exit code {process.returncode}")
+        if result.returncode != 0:
+            raise RuntimeError(f"Command '{printable}' failed with exit code {result.returncode}")
 
     def _resolve_npm_command(self, env: Dict[str, str]) -> list[str]:
         """Resolve a command that can run npm reliably on Windows.
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import queue
+import subprocess
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from app.common.settings import settings
+
+# Longer lines (e.g. minified bundles without newlines) are split into pieces of this size.
+_MAX_LINE_CHARS = 64 * 1024
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a streamed subprocess run."""
+    returncode: int
+    tail: list[str]
+    total_bytes: int
+    spill_path: Path | None = None
+
+    @property
+    def truncated(self) -> bool:
+        """True if `tail` is missing earlier output (whether or not it was spilled)."""
+        return self.total_bytes > sum(len(line.encode("utf-8")) + 1 for line in self.tail)
+
+
+def _pump(stream: IO[str], lines: queue.Queue[str | None]) -> None:
+    try:
+        for line in iter(lambda: stream.readline(_MAX_LINE_CHARS), ""):
+            lines.put(line.rstrip("\r\n"))
+    finally:
+        stream.close()
+        lines.put(None)
+
+
+def run_streaming(
+    command: list[str],
+    *,
+    cwd: Path,
+    env: dict[str, str],
+    on_line: Callable[[str], None] | None = None,
+    on_idle: Callable[[], None] | None = None,
+    idle_interval: float = 0.25,
+    max_buffer_bytes: int | None = None,
+    spill: bool = True,
+) -> ProcessResult:
+    """Run `command`, forwarding stdout and stderr line by line as they arrive.
+
+    Both pipes are drained concurrently by reader threads; `on_line` and
+    `on_idle` are always called from the calling thread. At most
+    `max_buffer_bytes` of output is kept in memory (the most recent lines).
+    Once output exceeds that, everything is written to a temp file instead
+    (when `spill` is set) and its path is returned in `ProcessResult.spill_path`.
+    If the run fails (e.g. `on_line` raises), the temp file is removed.
+    """
+
+    cap = max_buffer_bytes if max_buffer_bytes is not None else settings.process_output_buffer_bytes
+    tail: deque[str] = deque()
+    tail_bytes = 0
+    total_bytes = 0
+    spill_file: IO[str] | None = None
+
+    process = subprocess.Popen(
+        command,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    lines: queue.Queue[str | None] = queue.Queue()
+    readers = [
+        threading.Thread(target=_pump, args=(pipe, lines), daemon=True)
+        for pipe in (process.stdout, process.stderr)
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        with ExitStack() as spill_files:
+            open_pipes = len(readers)
+            while open_pipes:
+                try:
+                    line = lines.get(timeout=idle_interval)
+                except queue.Empty:
+                    if on_idle is not None:
+                        on_idle()
+                    continue
+
+                if line is None:
+                    open_pipes -= 1
+                    continue
+
+                size = len(line.encode("utf-8")) + 1
+                total_bytes += size
+                tail.append(line)
+                tail_bytes += size
+
+                if spill_file is None and spill and total_bytes > cap:
+                    spill_file = spill_files.enter_context(
+                        tempfile.NamedTemporaryFile(
+                            "w", encoding="utf-8", prefix="devops-output-", suffix=".log", delete=False
+                        )
+                    )
+                    spill_file.writelines(f"{buffered}\n" for buffered in tail)
+                elif spill_file is not None:
+                    spill_file.write(f"{line}\n")
+
+                while tail_bytes > cap and len(tail) > 1:
+                    tail_bytes -= len(tail.popleft().encode("utf-8")) + 1
+
+                if on_line is not None:
+                    on_line(line)
+
+            returncode = process.wait()
+    except BaseException:
+        # The spill file is closed by now; nobody will ever read it.
+        if spill_file is not None:
+            Path(spill_file.name).unlink(missing_ok=True)
+        raise
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+    return ProcessResult(
+        returncode=returncode,
+        tail=list(tail),
+        total_bytes=total_bytes,
+        spill_path=Path(spill_file.name) if spill_file is not None else None,
+    )
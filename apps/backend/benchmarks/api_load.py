@@ -0,0 +1,177 @@
+"""Benchmark: API throughput with many concurrent clients, async vs threadpool routes.
+
+Run from apps/backend:
+
+    python -m benchmarks.api_load --clients 200 --seconds 10
+
+Starts uvicorn in a separate process against a throwaway SQLite database and
+hammers GET /executions/{id}/status and /logs from `--clients` concurrent
+connections. `async` is the real app (async routes on AsyncSession);
+`threadpool` serves the same endpoints the previous way, as sync `def`
+routes on the sync Session, so every in-flight request holds one of
+Starlette's threadpool slots while it waits on the database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _threadpool_app():
+    from fastapi import FastAPI, HTTPException
+
+    from app.persistence.db import session_scope
+    from app.persistence.repositories import (
+        get_execution,
+        get_execution_log_cursor,
+        list_execution_log_chunks,
+    )
+
+    app = FastAPI()
+
+    @app.get("/executions/{execution_id}/status")
+    def status(execution_id: int) -> dict:
+        with session_scope() as session:
+            execution = get_execution(session, execution_id)
+            if execution is None:
+                raise HTTPException(status_code=404)
+            return {
+                "id": execution.id,
+                "status": execution.status,
+                "log_cursor": get_execution_log_cursor(session, execution_id),
+            }
+
+    @app.get("/executions/{execution_id}/logs")
+    def logs(execution_id: int, after: int | None = None, limit: int = 200) -> dict:
+        with session_scope() as session:
+            execution = get_execution(session, execution_id)
+            if execution is None:
+                raise HTTPException(status_code=404)
+            chunks = list_execution_log_chunks(session, execution_id, after_seq=after, limit=limit)
+            return {"status": execution.status, "lines": [c.payload for c in chunks]}
+
+    return app
+
+
+def _serve(variant: str, port: int) -> None:
+    import uvicorn
+
+    os.environ["LOG_LEVEL"] = "WARNING"
+    if variant == "async":
+        from app.main import create_app
+
+        app = create_app()
+    else:
+        app = _threadpool_app()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def _seed(url: str, chunks: int) -> None:
+    from sqlmodel import Session
+
+    from app.persistence.db import create_db_engine
+    from app.persistence.models import Execution
+    from app.persistence.repositories import append_execution_log_lines
+    from app.persistence.schema import upgrade
+
+    engine = create_db_engine(url)
+    upgrade(engine)
+    with Session(engine) as session:
+        execution = Execution(plan_id=1, status="running")
+        session.add(execution)
+        session.commit()
+        for _ in range(chunks):
+            append_execution_log_lines(session, execution, ["x" * 120] * 20)
+        session.commit()
+    engine.dispose()
+
+
+async def _load(port: int, clients: int, seconds: float, paths: list[str]) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+
+        async def worker(index: int) -> None:
+            nonlocal errors
+            path = paths[index % len(paths)]
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+    return latencies, errors
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/executions/1/status", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="concurrent client connections")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measurement time per variant")
+    parser.add_argument("--chunks", type=int, default=500, help="log chunks seeded for the execution")
+    parser.add_argument("--variants", default="threadpool,async")
+    args = parser.parse_args()
+
+    paths = ["/executions/1/status", "/executions/1/logs?after=480&limit=20"]
+    ctx = multiprocessing.get_context("spawn")
+
+    print(f"{'variant':<12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for variant in args.variants.split(","):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            os.environ["DATABASE_URL"] = url  # inherited by the spawned server
+            _seed(url, args.chunks)
+
+            port = _free_port()
+            server = ctx.Process(target=_serve, args=(variant, port), daemon=True)
+            server.start()
+            try:
+                _wait_ready(port)
+                latencies, errors = asyncio.run(_load(port, args.clients, args.seconds, paths))
+            finally:
+                server.terminate()
+                server.join()
+
+        ms = sorted(value * 1000 for value in latencies)
+        print(
+            f"{variant:<12} {len(ms) / args.seconds:>9.0f} {statistics.median(ms):>8.1f} "
+            f"{ms[int(len(ms) * 0.99)]:>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
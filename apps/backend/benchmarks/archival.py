@@ -0,0 +1,173 @@
+"""Benchmark: hot-table size and query latency before and after archival.
+
+Run from apps/backend:
+
+    python -m benchmarks.archival --executions 200000
+
+Seeds a throwaway SQLite database with `--executions` finished executions
+(`--lines` log lines each) spread over `--days` days, then measures the
+queries the API and the tracker run against the hot tables (one page of
+GET /executions, a status-filtered page and a full log read) and the database
+size after VACUUM. Everything older than ARCHIVE_AFTER_DAYS is then moved to
+the archive tables and the same numbers are measured again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.common.settings import settings
+from app.persistence.async_repositories import list_executions, read_execution_log
+from app.persistence.db import create_async_db_engine, create_db_engine
+from app.persistence.models import Execution, ExecutionLogChunk, Plan
+from app.persistence.schema import upgrade
+from app.services.archiver import run_archival
+
+NOW = datetime(2024, 7, 1)
+LINE = "[{i:05d}] npm run build --workspace web: compiled {i} modules in 412 ms"
+
+
+def _seed(url: str, executions: int, lines: int, days: int) -> None:
+    engine = create_db_engine(url)
+    upgrade(engine)
+    start = NOW - timedelta(days=days)
+    step = timedelta(days=days) / executions
+    payload = "".join(LINE.format(i=i) + "\n" for i in range(lines))
+    batch = 10_000
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Plan.__table__),
+            [
+                {
+                    "id": 1,
+                    "project_id": 1,
+                    "raw_command": "Deploy web to staging",
+                    "action": "deploy",
+                    "environments_json": ["staging"],
+                    "post_steps_json": [],
+                    "warnings_json": [],
+                    "status": "approved",
+                    "created_at": start,
+                    "updated_at": start,
+                }
+            ],
+        )
+        for offset in range(0, executions, batch):
+            ids = range(offset + 1, min(executions, offset + batch) + 1)
+            connection.execute(
+                insert(Execution.__table__),
+                [
+                    {
+                        "id": i,
+                        "plan_id": 1,
+                        "project_id": 1,
+                        "status": "failed" if i % 10 == 0 else "succeeded",
+                        "logs": "",
+                        "created_at": start + step * i,
+                    }
+                    for i in ids
+                ],
+            )
+            connection.execute(
+                insert(ExecutionLogChunk.__table__),
+                [{"execution_id": i, "seq": 0, "byte_offset": 0, "payload": payload} for i in ids],
+            )
+    engine.dispose()
+
+
+@contextmanager
+def _session(engine):
+    with Session(engine) as session, session.begin():
+        yield session
+
+
+def _size_mb(url: str, path: Path) -> float:
+    engine = create_db_engine(url)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        connection.execute(text("VACUUM"))
+    engine.dispose()
+    return os.path.getsize(path) / 1024 / 1024
+
+
+async def _time(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(url: str, repeat: int) -> dict[str, float]:
+    engine = create_async_db_engine(url)
+    async with AsyncSession(engine) as session:
+        newest = (await session.exec(select(Execution).order_by(Execution.id.desc()).limit(1))).one()
+
+        async def page() -> None:
+            await list_executions(session, limit=50)
+
+        async def failed_page() -> None:
+            await list_executions(session, project_id=1, status="failed", limit=50)
+
+        async def log() -> None:
+            await read_execution_log(session, newest)
+
+        results = {
+            "page ms": await _time(page, repeat),
+            "failed page ms": await _time(failed_page, repeat),
+            "log read ms": await _time(log, repeat),
+            "hot rows": (await session.exec(select(func.count()).select_from(Execution))).one(),
+        }
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--executions", type=int, default=200_000, help="finished executions to seed")
+    parser.add_argument("--lines", type=int, default=40, help="log lines per execution")
+    parser.add_argument("--days", type=int, default=180, help="age of the oldest execution")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        url = f"sqlite:///{path}"
+        start = time.perf_counter()
+        _seed(url, args.executions, args.lines, args.days)
+        print(f"seeded {args.executions} executions in {time.perf_counter() - start:.1f}s")
+
+        before = asyncio.run(_measure(url, args.repeat))
+        before["db MB"] = _size_mb(url, path)
+
+        engine = create_db_engine(url)
+        start = time.perf_counter()
+        settings.archive_batch_size = 1000
+        result = run_archival(session_factory=lambda: _session(engine), now=NOW)
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+        print(f"archived {result.executions} executions in {elapsed:.1f}s (ARCHIVE_AFTER_DAYS={settings.archive_after_days})")
+
+        after = asyncio.run(_measure(url, args.repeat))
+        after["db MB"] = _size_mb(url, path)
+
+    print(f"{'':<16} {'before':>10} {'after':>10}")
+    for name in before:
+        print(f"{name:<16} {before[name]:>10.2f} {after[name]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: approving a release train, one request per plan vs one batch.
+
+Run from apps/backend:
+
+    python -m benchmarks.batch_approve --plans 500
+
+Seeds `--plans` pending plans in a throwaway SQLite database twice and
+approves them through the real app (in-process ASGI client). `single` sends
+one POST /executions/approve/{plan_id} per plan. `batch` sends one
+POST /executions/approve with every id: one transaction, and one Redis
+pipeline for the jobs. RQ uses an in-process fakeredis: there are no network
+round trips (so the gap with a real server is larger), but its command
+emulation is slow, so the time spent in enqueueing is shown separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def _seed(plans: int) -> list[int]:
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+
+    from app.persistence.db import engine
+    from app.persistence.models import Plan
+
+    with Session(engine) as session:
+        first = session.exec(select(Plan.id).order_by(Plan.id.desc()).limit(1)).first() or 0
+        session.execute(
+            insert(Plan),
+            [
+                {
+                    "project_id": 1,
+                    "raw_command": f"Deploy service {i} to staging",
+                    "action": "deploy",
+                    "environments": ["staging"],
+                    "post_steps": [],
+                    "warnings": [],
+                }
+                for i in range(plans)
+            ],
+        )
+        session.commit()
+    return list(range(first + 1, first + plans + 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["LOG_LEVEL"] = "WARNING"
+
+        import fakeredis
+        from fastapi.testclient import TestClient
+        from rq import Queue
+
+        from app.api.routes import executions
+        from app.main import create_app
+
+        queue = Queue("bench", connection=fakeredis.FakeRedis())
+        executions.get_queue = lambda lane="default": queue
+        enqueue_seconds = {"single": 0.0, "batch": 0.0}
+
+        def timed(mode: str, enqueue):
+            def wrapper(*args):
+                start = time.perf_counter()
+                try:
+                    return enqueue(*args)
+                finally:
+                    enqueue_seconds[mode] += time.perf_counter() - start
+
+            return wrapper
+
+        executions._enqueue_execution = timed("single", executions._enqueue_execution)
+        executions._enqueue_executions = timed("batch", executions._enqueue_executions)
+
+        with TestClient(create_app()) as client:
+            plan_ids = _seed(args.plans)
+            start = time.perf_counter()
+            for plan_id in plan_ids:
+                assert client.post(f"/executions/approve/{plan_id}").status_code == 200
+            single = time.perf_counter() - start
+
+            plan_ids = _seed(args.plans)
+            start = time.perf_counter()
+            results = client.post("/executions/approve", json={"plan_ids": plan_ids}).json()["results"]
+            batch = time.perf_counter() - start
+            assert all(result["status_code"] == 200 for result in results)
+
+    print(f"{'mode':<8} {'plans':>6} {'total ms':>10} {'ms/plan':>8} {'enqueue ms':>11}")
+    for name, elapsed in (("single", single), ("batch", batch)):
+        print(
+            f"{name:<8} {args.plans:>6} {elapsed * 1000:>10.0f} {elapsed * 1000 / args.plans:>8.2f} "
+            f"{enqueue_seconds[name] * 1000:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
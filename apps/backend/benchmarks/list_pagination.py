@@ -0,0 +1,135 @@
+"""Benchmark: cost of a list page vs. table size and depth, keyset vs OFFSET.
+
+Run from apps/backend:
+
+    python -m benchmarks.list_pagination --rows 1000000
+
+Seeds a throwaway SQLite database with `--rows` executions spread over
+`--projects` projects and times one 50-row page of GET /executions (the
+repository query behind it) at increasing depths: unfiltered, filtered by
+project and filtered by status. `keyset` seeks past the previous page's
+(created_at, id) like the API does; `offset` is the LIMIT/OFFSET query it
+replaces. Keyset pages should cost the same at every depth.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.persistence.async_repositories import list_executions
+from app.persistence.db import create_async_db_engine, create_db_engine
+from app.persistence.models import Execution, Plan
+
+STATUSES = ["succeeded", "failed", "queued", "running"]
+
+
+def _seed(url: str, rows: int, projects: int) -> None:
+    engine = create_db_engine(url)
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    batch = 50_000
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Plan.__table__),
+            [
+                {
+                    "project_id": p + 1,
+                    "raw_command": f"Deploy project {p + 1}",
+                    "action": "deploy",
+                    "environments_json": "[]",
+                    "post_steps_json": "[]",
+                    "warnings_json": "[]",
+                    "status": "succeeded",
+                    "created_at": start,
+                    "updated_at": start,
+                }
+                for p in range(projects)
+            ],
+        )
+        for offset in range(0, rows, batch):
+            connection.execute(
+                insert(Execution.__table__),
+                [
+                    {
+                        "plan_id": i % projects + 1,
+                        "project_id": i % projects + 1,
+                        "status": STATUSES[i % len(STATUSES)],
+                        "logs": "",
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(rows, offset + batch))
+                ],
+            )
+    engine.dispose()
+
+
+def _filtered(statement, filters: dict):
+    for name, value in filters.items():
+        statement = statement.where(getattr(Execution, name) == value)
+    return statement
+
+
+async def _time(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _run(url: str, depths: list[int], projects: int, repeat: int, limit: int) -> None:
+    engine = create_async_db_engine(url)
+    scenarios = {"all": {}, "project": {"project_id": 1}, "status": {"status": "failed"}}
+
+    print(f"{'filter':<9} {'depth':>9} {'keyset ms':>10} {'offset ms':>10}")
+    async with AsyncSession(engine) as session:
+        for label, filters in scenarios.items():
+            for depth in depths:
+                # The row just before the page is where a client following cursors would be.
+                ordered = _filtered(select(Execution), filters).order_by(
+                    Execution.created_at.desc(), Execution.id.desc()
+                )
+                anchor = (await session.exec(ordered.offset(max(0, depth - 1)).limit(1))).first()
+                after = (anchor.created_at, anchor.id) if depth and anchor else None
+
+                keyset = partial(list_executions, session, **filters, after=after, limit=limit)
+                offset = partial(session.exec, ordered.offset(depth).limit(limit))
+                print(
+                    f"{label:<9} {depth:>9} {await _time(keyset, repeat):>10.2f} "
+                    f"{await _time(offset, repeat):>10.2f}"
+                )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="executions to seed")
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--depths", default="0,10000,100000,500000", help="rows skipped before the page")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        start = time.perf_counter()
+        _seed(url, args.rows, args.projects)
+        print(f"seeded {args.rows} executions in {time.perf_counter() - start:.1f}s")
+        depths = [d for d in map(int, args.depths.split(",")) if d < args.rows]
+        asyncio.run(_run(url, depths, args.projects, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
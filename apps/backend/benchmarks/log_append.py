@@ -0,0 +1,69 @@
+"""Benchmark: per-append cost of the execution log as it grows.
+
+Run from apps/backend:
+
+    python -m benchmarks.log_append --target-mb 64
+    python -m benchmarks.log_append --target-mb 8 --legacy
+
+Appends fixed-size lines to a single execution in a throwaway SQLite file and
+reports the mean append latency for each slice of the log. With chunked storage
+the latency stays flat; `--legacy` reproduces the old rewrite-the-whole-column
+behaviour for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.persistence.models import Execution
+from app.persistence.repositories import append_execution_log
+
+
+def _legacy_append(session: Session, execution: Execution, line: str) -> None:
+    execution.logs = (execution.logs or "") + line + "\n"
+    session.add(execution)
+    session.commit()
+    session.refresh(execution)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-mb", type=int, default=64, help="total log size to write")
+    parser.add_argument("--line-kb", type=int, default=16, help="size of each appended line")
+    parser.add_argument("--buckets", type=int, default=8, help="number of report rows")
+    parser.add_argument("--legacy", action="store_true", help="use the old inline Execution.logs writer")
+    args = parser.parse_args()
+
+    line = "x" * (args.line_kb * 1024 - 1)
+    total_appends = (args.target_mb * 1024) // args.line_kb
+    per_bucket = max(1, total_appends // args.buckets)
+    append = _legacy_append if args.legacy else append_execution_log
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            execution = Execution(plan_id=1)
+            session.add(execution)
+            session.commit()
+            session.refresh(execution)
+
+            print(f"{'log size (MB)':>14} {'mean append (ms)':>17}")
+            written = 0
+            for _ in range(args.buckets):
+                start = time.perf_counter()
+                for _ in range(per_bucket):
+                    append(session, execution, line)
+                elapsed = time.perf_counter() - start
+                written += per_bucket * args.line_kb
+                print(f"{written / 1024:>14.1f} {elapsed / per_bucket * 1000:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
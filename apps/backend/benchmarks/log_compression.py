@@ -0,0 +1,145 @@
+"""Benchmark: storage and transfer size of compressed execution logs.
+
+Run from apps/backend:
+
+    python -m benchmarks.log_compression --executions 200 --lines 5000
+
+Generates synthetic `npm ci` + `npm run build` output (deprecation warnings,
+per-package fetch lines, webpack module listings, timings) and reports, per
+codec, the compression ratio and the time to compress and decompress one log.
+The compressed size is also what GET /executions/{id}/logs/raw sends to a
+client that accepts the encoding.
+
+It then writes `--executions` such logs in chunks to a throwaway SQLite
+database, finishes every execution (which compresses its log) and compares the
+database size after VACUUM with and without compression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import random
+import statistics
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.common.settings import settings
+from app.persistence.db import create_db_engine
+from app.persistence.log_codec import zstandard
+from app.persistence.models import Execution
+from app.persistence.repositories import append_execution_log_lines, set_execution_status
+from app.persistence.schema import upgrade
+
+PACKAGES = [
+    "react", "react-dom", "webpack", "babel-loader", "@babel/core", "typescript", "eslint", "postcss",
+    "autoprefixer", "lodash", "axios", "jest", "ts-loader", "css-loader", "style-loader", "terser",
+    "@types/node", "@types/react", "sass", "rimraf", "glob", "chokidar", "semver", "debug",
+]
+
+
+def npm_build_log(lines: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    out = ["> web@1.4.2 ci", "> npm ci --no-audit --no-fund"]
+    while len(out) < lines * 0.3:
+        name = rng.choice(PACKAGES)
+        version = f"{rng.randint(0, 18)}.{rng.randint(0, 30)}.{rng.randint(0, 20)}"
+        if rng.random() < 0.1:
+            out.append(f"npm WARN deprecated {name}@{version}: This version is no longer supported. Please upgrade.")
+        else:
+            out.append(
+                f"npm http fetch GET 200 https://registry.npmjs.org/{name}/-/{name.split('/')[-1]}-{version}.tgz "
+                f"{rng.randint(5, 900)}ms (cache miss)"
+            )
+    out += [f"added {rng.randint(800, 1500)} packages in {rng.randint(8, 60)}s", "> web@1.4.2 build", "> webpack --mode production"]
+    while len(out) < lines - 3:
+        folder = rng.choice(["components", "pages", "hooks", "utils", "styles", "api"])
+        out.append(
+            f"  ./src/{folder}/{rng.choice(PACKAGES).replace('@', '').replace('/', '-')}"
+            f"{rng.randint(0, 99)}.tsx {rng.randint(1, 90)}.{rng.randint(0, 99)} KiB [built] [code generated]"
+        )
+    out += [
+        f"webpack 5.94.0 compiled with {rng.randint(0, 5)} warnings in {rng.randint(10000, 90000)} ms",
+        "Build finished.",
+        "Deploy step: uploading dist/ to staging",
+    ]
+    return out
+
+
+def _time(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _codecs() -> dict[str, tuple]:
+    codecs = {"gzip -6": (lambda raw: gzip.compress(raw, 6, mtime=0), gzip.decompress)}
+    if zstandard is not None:
+        for level in (1, 3, 9):
+            codecs[f"zstd -{level}"] = (
+                zstandard.ZstdCompressor(level=level).compress,
+                zstandard.ZstdDecompressor().decompress,
+            )
+    return codecs
+
+
+def _database_mb(executions: int, lines: int, chunk_lines: int, compression: str) -> float:
+    settings.log_compression = compression
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        engine = create_db_engine(f"sqlite:///{path}")
+        upgrade(engine)
+        with Session(engine) as session:
+            for i in range(executions):
+                execution = Execution(plan_id=1, status="running")
+                session.add(execution)
+                session.flush()
+                log = npm_build_log(lines, seed=i)
+                for start in range(0, len(log), chunk_lines):
+                    append_execution_log_lines(session, execution, log[start : start + chunk_lines])
+                set_execution_status(session, execution, "succeeded")
+                session.commit()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            connection.execute(text("VACUUM"))
+        engine.dispose()
+        return os.path.getsize(path) / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5000, help="lines per build log")
+    parser.add_argument("--executions", type=int, default=200, help="executions written to the database")
+    parser.add_argument("--chunk-lines", type=int, default=50, help="lines per log chunk (one worker flush)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per measurement")
+    args = parser.parse_args()
+
+    raw = "".join(f"{line}\n" for line in npm_build_log(args.lines, seed=0)).encode("utf-8")
+    print(f"one log: {args.lines} lines, {len(raw) / 1024:.0f} KiB")
+    print(f"{'codec':<9} {'KiB':>8} {'ratio':>7} {'compress ms':>12} {'decompress ms':>14}")
+    for name, (compress, decompress) in _codecs().items():
+        blob = compress(raw)
+        print(
+            f"{name:<9} {len(blob) / 1024:>8.0f} {len(raw) / len(blob):>6.1f}x "
+            f"{_time(partial(compress, raw), args.repeat):>12.2f} {_time(partial(decompress, blob), args.repeat):>14.2f}"
+        )
+
+    plain = _database_mb(args.executions, args.lines, args.chunk_lines, "none")
+    compressed = _database_mb(args.executions, args.lines, args.chunk_lines, "zstd")
+    print(
+        f"database with {args.executions} finished executions: {plain:.1f} MB in chunks, "
+        f"{compressed:.1f} MB compressed ({plain / compressed:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: sequential vs concurrent multi-environment cloud deploys.
+
+Run from apps/backend:
+
+    python -m benchmarks.parallel_deploy --latency-ms 200
+
+Drives Orchestrator._deploy_to_cloud against a VercelDeployer whose HTTP calls
+go to an httpx.MockTransport that sleeps `--latency-ms` per request, for
+dev + staging + production (production is gated behind the other two).
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import httpx
+
+from app.common.settings import settings
+from app.persistence.models import Plan, Project
+from app.services.deployers import VercelDeployer
+from app.services.orchestrator import Orchestrator
+
+
+class _MemoryLog:
+    flush_interval = 0.05
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+    def flush(self) -> None:
+        pass
+
+    def flush_if_due(self) -> None:
+        pass
+
+
+def _transport(latency: float) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        if request.method == "GET":
+            return httpx.Response(200, json={"deployments": [{"uid": "dpl_1", "url": "app.vercel.app"}]})
+        return httpx.Response(200, json={"id": "dpl_2", "url": "app-new.vercel.app", "readyState": "BUILDING"})
+
+    return httpx.MockTransport(handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=int, default=200, help="injected latency per provider request")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    settings.vercel_token = "bench-token"
+    settings.http_rate_limit_per_second = 0  # measure deploy overlap, not the rate limiter
+    settings.vercel_project_id = "prj_bench"
+    project = Project(id=1, name="bench", repo_url="https://example.com/bench.git")
+    plan = Plan(
+        id=1,
+        project_id=1,
+        raw_command="deploy v1.6 to dev, staging and production",
+        action="deploy",
+        version="1.6",
+        environments=[],
+        post_steps=[],
+    )
+    environments = ["dev", "staging", "production"]
+    orchestrator = Orchestrator(deployer=VercelDeployer(client=httpx.Client(transport=_transport(args.latency_ms / 1000))))
+
+    print(f"{'max parallelism':>16} {'mean deploy (s)':>16}")
+    for parallelism in (1, 2, 4):
+        settings.deploy_max_parallelism = parallelism
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            orchestrator._deploy_to_cloud(project, plan, _MemoryLog(), environments)
+        print(f"{parallelism:>16} {(time.perf_counter() - start) / args.rounds:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: queueing latency of urgent jobs behind a bulk backlog.
+
+Run from apps/backend:
+
+    python -m benchmarks.priority_queues --bulk 100 --urgent 10
+
+Fills the queue with `--bulk` jobs of `--job-ms` each, like a train of
+staging builds. While one RQ worker drains them, `--urgent` production jobs
+arrive every `--interval-ms`. The worker is a SimpleWorker on an in-process
+fakeredis. Reports how long jobs waited between enqueue and start:
+- `single`: everything in one queue, as before lanes existed.
+- `lanes`: urgent jobs in the critical lane, the backlog in bulk, with the
+  worker listening in priority order like `python -m app.queue.worker`.
+With lanes an urgent job waits at most for the bulk job already running.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+
+import fakeredis
+from rq import Queue
+from rq.job import Job
+from rq.worker import SimpleWorker
+
+from app.queue.queue import queue_name, worker_queue_names
+
+
+def _waits_ms(jobs: list[Job]) -> list[float]:
+    for job in jobs:
+        job.refresh()
+    return sorted((job.started_at - job.enqueued_at).total_seconds() * 1000 for job in jobs)
+
+
+def _run(mode: str, bulk: int, urgent: int, job_ms: float, interval_ms: float) -> tuple[list[float], list[float]]:
+    server = fakeredis.FakeServer()
+
+    def queue(lane: str) -> Queue:
+        name = queue_name("default") if mode == "single" else queue_name(lane)
+        return Queue(name, connection=fakeredis.FakeRedis(server=server))
+
+    bulk_queue = queue("bulk")
+    bulk_jobs = [bulk_queue.enqueue(time.sleep, job_ms / 1000) for _ in range(bulk)]
+    urgent_jobs: list[Job] = []
+
+    def produce() -> None:
+        urgent_queue = queue("critical")
+        for _ in range(urgent):
+            time.sleep(interval_ms / 1000)
+            urgent_jobs.append(urgent_queue.enqueue(time.sleep, job_ms / 1000))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    connection = fakeredis.FakeRedis(server=server)
+    worker = SimpleWorker(worker_queue_names(), connection=connection)
+    while producer.is_alive() or any(len(Queue(name, connection=connection)) for name in worker_queue_names()):
+        worker.work(burst=True, logging_level="WARNING")
+    producer.join()
+    return _waits_ms(urgent_jobs), _waits_ms(bulk_jobs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk", type=int, default=100, help="backlog jobs enqueued up front")
+    parser.add_argument("--urgent", type=int, default=10, help="production jobs arriving during the backlog")
+    parser.add_argument("--job-ms", type=float, default=20.0, help="run time of every job")
+    parser.add_argument("--interval-ms", type=float, default=150.0, help="gap between urgent jobs")
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'urgent p50 ms':>14} {'urgent max ms':>14} {'bulk p50 ms':>12} {'bulk max ms':>12}")
+    for mode in ("single", "lanes"):
+        urgent, bulk = _run(mode, args.bulk, args.urgent, args.job_ms, args.interval_ms)
+        print(
+            f"{mode:<7} {statistics.median(urgent):>14.0f} {urgent[-1]:>14.0f} "
+            f"{statistics.median(bulk):>12.0f} {bulk[-1]:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
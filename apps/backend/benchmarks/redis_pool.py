@@ -0,0 +1,111 @@
+"""Benchmark: approve-path Redis throughput, per-request clients vs the shared pool.
+
+Run from apps/backend:
+
+    python -m benchmarks.redis_pool --approvals 2000 --threads 8
+    python -m benchmarks.redis_pool --redis-url redis://localhost:6379/15
+
+Replays what POST /executions/approve/{plan_id} does against Redis after its
+commit (RQ enqueue of execute_plan plus the "queued" status event) from
+`--threads` threads, as the API's threadpool does. `per-request` builds a
+client with `Redis.from_url` for every approval, which was the old
+`get_redis()` and means a new pool and TCP connection each time. `pooled`
+goes through `get_queue()`, which checks a connection out of the
+process-wide pool.
+
+Without `--redis-url` the clients talk to an in-process fakeredis server, so
+no network round trips are paid: the numbers show the client and pool setup
+overhead and how many connections each mode opens. Point `--redis-url` at a
+local redis-server (a throwaway database: the benchmark flushes it) to
+include TCP connection setup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from redis import ConnectionPool, Redis
+from rq import Queue
+
+from app.common.settings import settings
+from app.queue.events import ExecutionEventPublisher
+from app.queue.queue import get_queue
+from app.queue.redis_conn import close_redis_pool
+
+_connections = itertools.count()
+
+
+def _use_fake_server() -> None:
+    # Every pool built from a URL (Redis.from_url and the shared pool alike)
+    # gets connections to one in-process fakeredis server.
+    from fakeredis import FakeRedisConnection, FakeServer
+
+    server = FakeServer()
+
+    class CountingConnection(FakeRedisConnection):
+        def on_connect(self) -> None:
+            next(_connections)
+            super().on_connect()
+
+    def from_url(cls, url: str, **kwargs):
+        return cls(connection_class=CountingConnection, server=server, **kwargs)
+
+    ConnectionPool.from_url = classmethod(from_url)
+
+
+def _per_request(execution_id: int) -> None:
+    redis = Redis.from_url(settings.redis_url, decode_responses=False)
+    Queue(name=settings.rq_queue_name, connection=redis).enqueue("app.queue.tasks.execute_plan", execution_id)
+    ExecutionEventPublisher(redis).publish_status(execution_id, "queued")
+
+
+def _pooled(execution_id: int) -> None:
+    queue = get_queue()
+    queue.enqueue("app.queue.tasks.execute_plan", execution_id)
+    ExecutionEventPublisher(queue.connection).publish_status(execution_id, "queued")
+
+
+def _run(approve, approvals: int, threads: int) -> tuple[float, float, float]:
+    def timed(execution_id: int) -> float:
+        start = time.perf_counter()
+        approve(execution_id)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = sorted(pool.map(timed, range(1, approvals + 1)))
+    elapsed = time.perf_counter() - start
+    return approvals / elapsed, statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--approvals", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers (API threadpool slots)")
+    parser.add_argument("--redis-url", help="real Redis to use instead of in-process fakeredis")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        settings.redis_url = args.redis_url
+    else:
+        _use_fake_server()
+    flush = Redis.from_url(settings.redis_url)
+
+    print(f"{'mode':<12} {'approvals/s':>12} {'p50 ms':>8} {'p99 ms':>8} {'connections':>12}")
+    for name, approve in (("per-request", _per_request), ("pooled", _pooled)):
+        flush.flushdb()
+        close_redis_pool()
+        opened = next(_connections)
+        throughput, p50, p99 = _run(approve, args.approvals, args.threads)
+        connections = f"{next(_connections) - opened - 1}" if not args.redis_url else "-"
+        print(f"{name:<12} {throughput:>12.0f} {p50:>8.2f} {p99:>8.2f} {connections:>12}")
+    close_redis_pool()
+    flush.flushdb()
+
+
+if __name__ == "__main__":
+    main()
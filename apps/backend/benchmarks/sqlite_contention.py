@@ -0,0 +1,133 @@
+"""Benchmark: API read latency while a worker process streams execution logs.
+
+Run from apps/backend:
+
+    python -m benchmarks.sqlite_contention --seconds 5 --readers 4
+
+For each SQLite profile (`default` = SQLite's rollback journal, `performance`
+= WAL + tuned pragmas from SQLITE_* settings) this measures reader latency in
+a throwaway database file, first with no writer and then while a separate
+process appends log chunks as fast as it can, like an RQ worker does. Readers
+issue the same queries as GET /executions/{id}/status and /logs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel
+
+from app.common.settings import settings
+from app.persistence.db import create_db_engine
+from app.persistence.models import Execution
+from app.persistence.repositories import (
+    append_execution_log_lines,
+    get_execution,
+    get_execution_log_cursor,
+    list_execution_log_chunks,
+)
+
+
+def _writer(url: str, profile: str, lines_per_chunk: int, line: str, ready, stop, chunks) -> None:
+    settings.sqlite_profile = profile
+    engine = create_db_engine(url)
+    with Session(engine) as session:
+        execution = session.get(Execution, 1)
+        ready.set()
+        while not stop.is_set():
+            append_execution_log_lines(session, execution, [line] * lines_per_chunk)
+            session.commit()
+            chunks.value += 1
+
+
+def _reader(engine, stop: threading.Event, latencies: list[float], errors: list[str]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with Session(engine) as session:
+                get_execution(session, 1)
+                cursor = get_execution_log_cursor(session, 1) or 0
+                list_execution_log_chunks(session, 1, after_seq=max(cursor - 20, -1), limit=20)
+        except OperationalError as exc:
+            errors.append(str(exc.orig))
+        latencies.append(time.perf_counter() - start)
+
+
+def _measure(engine, readers: int, seconds: float) -> tuple[list[float], list[str]]:
+    stop = threading.Event()
+    latencies: list[float] = []
+    errors: list[str] = []
+    threads = [threading.Thread(target=_reader, args=(engine, stop, latencies, errors)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def _report(label: str, latencies: list[float], errors: list[str], extra: str = "") -> None:
+    ms = sorted(value * 1000 for value in latencies)
+    pct = lambda p: ms[min(len(ms) - 1, int(len(ms) * p))]  # noqa: E731
+    print(
+        f"{label:<24} {len(ms):>8} {statistics.median(ms):>8.2f} {pct(0.95):>8.2f} "
+        f"{pct(0.99):>8.2f} {ms[-1]:>9.2f} {len(errors):>7}  {extra}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent reader threads")
+    parser.add_argument("--seed-chunks", type=int, default=2000, help="log chunks written before measuring")
+    parser.add_argument("--lines-per-chunk", type=int, default=50)
+    parser.add_argument("--line-bytes", type=int, default=120)
+    parser.add_argument("--profiles", default="default,performance")
+    args = parser.parse_args()
+
+    line = "x" * args.line_bytes
+    ctx = multiprocessing.get_context("spawn")
+
+    print(f"{'profile / phase':<24} {'reads':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>9} {'errors':>7}")
+    for profile in args.profiles.split(","):
+        settings.sqlite_profile = profile
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            engine = create_db_engine(url)
+            SQLModel.metadata.create_all(engine)
+            with Session(engine) as session:
+                execution = Execution(plan_id=1, status="running")
+                session.add(execution)
+                session.commit()
+                for _ in range(args.seed_chunks):
+                    append_execution_log_lines(session, execution, [line] * args.lines_per_chunk)
+                session.commit()
+
+            latencies, errors = _measure(engine, args.readers, args.seconds)
+            _report(f"{profile} / idle", latencies, errors)
+
+            ready, stop, chunks = ctx.Event(), ctx.Event(), ctx.Value("i", 0)
+            writer = ctx.Process(
+                target=_writer, args=(url, profile, args.lines_per_chunk, line, ready, stop, chunks)
+            )
+            writer.start()
+            ready.wait()
+            latencies, errors = _measure(engine, args.readers, args.seconds)
+            stop.set()
+            writer.join()
+            _report(
+                f"{profile} / writer", latencies, errors, f"writer: {chunks.value / args.seconds:.0f} chunks/s"
+            )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: CPU-bound job throughput vs supervised worker processes.
+
+Run from apps/backend (needs a real Redis; worker processes cannot share an
+in-process fakeredis):
+
+    python -m benchmarks.worker_processes --jobs 64 --processes 1,2,4
+
+For each count N, starts `python -m app.queue.worker --processes N` on a
+throwaway queue prefix, waits until all N workers are registered, enqueues
+`--jobs` jobs that each burn `--job-ms` of CPU (like a local build) and
+reports jobs/sec and the speedup over the first count. Throughput should
+grow about linearly up to the number of cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+
+from redis import Redis
+from rq import Queue, Worker
+from rq.command import send_shutdown_command
+from rq.registry import FailedJobRegistry, FinishedJobRegistry
+
+from app.common.settings import settings
+
+
+def burn(ms: float) -> None:
+    deadline = time.process_time() + ms / 1000
+    digest = b""
+    while time.process_time() < deadline:
+        digest = hashlib.sha256(digest).digest()
+
+
+def _wait_for(condition, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("workers did not get there in time")
+        time.sleep(0.05)
+
+
+def _run(redis: Redis, redis_url: str, processes: int, jobs: int, job_ms: float) -> float:
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    queue = Queue(f"{prefix}:default", connection=redis)
+    env = {**os.environ, "RQ_QUEUE_NAME": prefix, "REDIS_URL": redis_url, "LOG_LEVEL": "WARNING"}
+    supervisor = subprocess.Popen(
+        [sys.executable, "-m", "app.queue.worker", "--lanes", "default", "--processes", str(processes)], env=env
+    )
+    try:
+        _wait_for(lambda: Worker.count(queue=queue) == processes, timeout=60)
+        started = time.perf_counter()
+        queue.enqueue_many(
+            [Queue.prepare_data("benchmarks.worker_processes.burn", (job_ms,), result_ttl=600) for _ in range(jobs)]
+        )
+
+        def done() -> bool:
+            return FinishedJobRegistry(queue=queue).count + FailedJobRegistry(queue=queue).count >= jobs
+
+        _wait_for(done, timeout=600)
+        return jobs / (time.perf_counter() - started)
+    finally:
+        supervisor.send_signal(signal.SIGINT if os.name != "nt" else signal.SIGTERM)
+        supervisor.wait()
+        # On Windows the supervisor is killed outright; stop its children through Redis.
+        for worker in Worker.all(queue=queue):
+            send_shutdown_command(redis, worker.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--job-ms", type=float, default=200.0, help="CPU time burnt by each job")
+    parser.add_argument(
+        "--processes", default=f"1,{os.cpu_count() or 1}", help="comma-separated worker process counts"
+    )
+    parser.add_argument("--redis-url", default=settings.redis_url)
+    args = parser.parse_args()
+
+    redis = Redis.from_url(args.redis_url)
+    counts = [int(count) for count in args.processes.split(",")]
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'processes':>9} {'jobs/s':>8} {'speedup':>8}")
+    baseline = None
+    for count in counts:
+        rate = _run(redis, args.redis_url, count, args.jobs, args.job_ms)
+        baseline = baseline or rate
+        print(f"{count:>9} {rate:>8.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
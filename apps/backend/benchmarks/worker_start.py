@@ -0,0 +1,134 @@
+"""Benchmark: job start latency, fork-per-job worker vs warm worker.
+
+Run from apps/backend:
+
+    python -m benchmarks.worker_start --jobs 100
+
+Seeds `--jobs` approved dry-run plans in a throwaway SQLite database. For
+each worker mode of `python -m app.queue.worker --mode`, a producer thread
+enqueues one `execute_plan` job every `--interval-ms`, so the worker is idle
+when each job arrives, and the worker built by `build_worker` runs them.
+Reports the time from enqueue to the first line of `execute_plan` (start)
+and to its return (done). RQ uses an in-process fakeredis; in fork mode the
+work-horse's Redis writes stay in the child's copy of it, which only
+affects RQ's bookkeeping, not the timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def timed_execute_plan(execution_id: int, enqueued_at: float, results_path: str) -> None:
+    from app.queue.tasks import execute_plan
+
+    started = time.time()
+    execute_plan(execution_id)
+    with open(results_path, "a") as results:
+        results.write(f"{started - enqueued_at} {time.time() - enqueued_at}\n")
+
+
+def _seed(jobs: int) -> list[int]:
+    from sqlalchemy import insert
+    from sqlmodel import Session
+
+    from app.persistence.db import engine
+    from app.persistence.models import Execution, Plan, Project
+
+    with Session(engine) as session:
+        project = Project(name="bench", repo_path="C:/tmp/demo")
+        session.add(project)
+        session.flush()
+        plan_ids = session.scalars(
+            insert(Plan).returning(Plan.id),
+            [
+                {
+                    "project_id": project.id,
+                    "raw_command": f"Deploy service {i} to staging",
+                    "action": "deploy",
+                    "environments": ["staging"],
+                    "post_steps": [],
+                    "warnings": [],
+                    "status": "approved",
+                }
+                for i in range(jobs)
+            ],
+        ).all()
+        execution_ids = session.scalars(
+            insert(Execution).returning(Execution.id), [{"plan_id": plan_id} for plan_id in plan_ids]
+        ).all()
+        session.commit()
+    # Nothing pooled may leak into a forked work-horse.
+    engine.dispose()
+    return list(execution_ids)
+
+
+def _run(mode: str, execution_ids: list[int], interval_ms: float, tmp: Path) -> list[tuple[float, float]]:
+    import fakeredis
+    from rq import Queue
+
+    from app.queue import tasks
+    from app.queue.worker import build_worker
+
+    redis = fakeredis.FakeRedis()
+    tasks.get_redis = lambda: redis
+    queue = Queue("bench", connection=redis)
+    worker = build_worker([queue.name], redis, mode)
+    results_path = tmp / f"{mode}.txt"
+
+    def produce() -> None:
+        for execution_id in execution_ids:
+            time.sleep(interval_ms / 1000)
+            queue.enqueue(
+                "benchmarks.worker_start.timed_execute_plan", execution_id, time.time(), str(results_path)
+            )
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    worker.work(max_jobs=len(execution_ids), logging_level="ERROR")
+    producer.join()
+    return [tuple(map(float, line.split())) for line in results_path.read_text().splitlines()]
+
+
+def _ms(values: list[float], quantile: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * quantile))] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=100.0, help="gap between enqueued jobs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["LOG_LEVEL"] = "WARNING"
+        os.environ["DEPLOY_PROVIDER"] = "local"
+        os.environ["DRY_RUN"] = "true"
+
+        from app.common.logging import configure_logging
+        from app.persistence.db import init_db
+
+        configure_logging("WARNING")
+        init_db()
+
+        print(f"{'mode':<5} {'start p50 ms':>13} {'start p95 ms':>13} {'done p50 ms':>12} {'done p95 ms':>12}")
+        # Fork first: the warm worker leaves a pooled connection in this process.
+        for mode in ("fork", "warm"):
+            timings = _run(mode, _seed(args.jobs), args.interval_ms, Path(tmp))
+            start = [started for started, _ in timings]
+            done = [finished for _, finished in timings]
+            print(
+                f"{mode:<5} {_ms(start, 0.5):>13.1f} {_ms(start, 0.95):>13.1f} "
+                f"{_ms(done, 0.5):>12.1f} {_ms(done, 0.95):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
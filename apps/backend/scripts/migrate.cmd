@@ -0,0 +1,18 @@
+@echo off
+setlocal
+cd /d "%~dp0\.."
+
+REM Applies pending database schema migrations (Alembic) to DATABASE_URL.
+REM Usage: scripts\migrate.cmd [revision]   (default: head)
+
+if not exist .venv\Scripts\python.exe (
+	echo ERROR: Backend virtualenv not found.
+	echo Run: scripts\install.cmd
+	exit /b 1
+)
+
+if "%~1"=="" (
+	.venv\Scripts\python.exe -m app.persistence.schema upgrade
+) else (
+	.venv\Scripts\python.exe -m app.persistence.schema upgrade %1
+)
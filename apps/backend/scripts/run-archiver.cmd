@@ -0,0 +1,15 @@
+@echo off
+setlocal
+cd /d "%~dp0\.."
+
+REM Archives finished executions and plans older than ARCHIVE_AFTER_DAYS.
+REM Runs once; pass --loop to repeat every ARCHIVE_INTERVAL_SECONDS, or
+REM schedule this script (e.g. nightly with Task Scheduler).
+
+if not exist .venv\Scripts\python.exe (
+	echo ERROR: Backend virtualenv not found.
+	echo Run: scripts\install.cmd
+	exit /b 1
+)
+
+.venv\Scripts\python.exe -m app.queue.archiver %*
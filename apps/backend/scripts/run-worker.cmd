@@ -4,6 +4,9 @@ cd /d "%~dp0\.."
 
 REM Runs the RQ worker (background executor).
 REM Ensure Redis is running and you ran scripts\install.cmd first.
+REM Serves every priority lane; pass --lanes critical for a worker that only
+REM takes production/rollback jobs, and --processes auto to run one worker per
+REM core, scaled with the queue backlog.
 
 if not exist .venv\Scripts\python.exe (
 	echo ERROR: Backend virtualenv not found.
@@ -18,4 +21,4 @@ if errorlevel 1 (
 	exit /b 1
 )
 
-.venv\Scripts\python.exe -m app.queue.worker
+.venv\Scripts\python.exe -m app.queue.worker %*
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The app reads DATABASE_URL when it is first imported, so nothing from `app`
+# may be imported at module level here: pytest_configure picks the database.
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--postgres",
+        action="store_true",
+        help="run against a throwaway Postgres cluster (initdb/pg_ctl on PATH or in PG_BIN)",
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn_postgres(config: pytest.Config) -> str:
+    bin_dir = os.environ.get("PG_BIN") or os.path.dirname(shutil.which("initdb") or "")
+    initdb, pg_ctl = Path(bin_dir, "initdb"), Path(bin_dir, "pg_ctl")
+    if not bin_dir or not initdb.exists() or not pg_ctl.exists():
+        pytest.exit("--postgres needs initdb and pg_ctl on PATH or in PG_BIN", returncode=4)
+    try:
+        import asyncpg  # noqa: F401
+        import psycopg  # noqa: F401
+    except ImportError as exc:
+        pytest.exit(f"--postgres needs the psycopg and asyncpg drivers: {exc}", returncode=4)
+
+    data_dir = tempfile.mkdtemp(prefix="pytest-postgres-")
+    port = _free_port()
+    subprocess.run(
+        [initdb, "-D", data_dir, "-U", "postgres", "-A", "trust", "-E", "UTF8", "--locale=C", "--no-sync"],
+        check=True,
+        capture_output=True,
+    )
+    # Durability is irrelevant for a throwaway cluster.
+    options = f"-p {port} -k {data_dir} -c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+    subprocess.run(
+        [pg_ctl, "-D", data_dir, "-o", options, "-l", f"{data_dir}/server.log", "-w", "start"],
+        check=True,
+        capture_output=True,
+    )
+
+    def stop() -> None:
+        subprocess.run([pg_ctl, "-D", data_dir, "-m", "immediate", "stop"], capture_output=True)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    config.add_cleanup(stop)
+    return f"postgresql://postgres@127.0.0.1:{port}/postgres"
+
+
+@pytest.hookimpl(trylast=True)  # after the tmp_path plugin has set up its factory
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "sqlite_only: inspects SQLite-specific behaviour of the app database")
+    if os.environ.get("TEST_DATABASE_URL") or config.getoption("--postgres"):
+        os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or _spawn_postgres(config)
+        # TestClient runs each request on a new event loop; pooled asyncpg
+        # connections stay bound to the loop that opened them.
+        os.environ["DB_DISABLE_POOL"] = "true"
+    else:
+        # A fresh SQLite file per session, never the developer's ./data/dev.db.
+        database = config._tmp_path_factory.mktemp("db") / "test.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    from app.persistence.db import engine
+
+    if engine.dialect.name == "sqlite":
+        return
+    skip = pytest.mark.skip(reason=f"app database is {engine.dialect.name}")
+    for item in items:
+        if "sqlite_only" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _dispose_async_engine():
+    from app.persistence.db import async_engine
+
+    yield
+    # TestClients that are not used as context managers never run the app's
+    # shutdown; close pooled aiosqlite connections so their threads can exit.
+    asyncio.run(async_engine.dispose())
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from app.main import create_app
+from app.persistence.db import session_scope
+from app.persistence.models import (
+    ArchivedExecution,
+    ArchivedPlan,
+    Execution,
+    ExecutionLogChunk,
+    Plan,
+)
+from app.persistence.repositories import (
+    append_execution_log,
+    create_execution,
+    set_execution_status,
+)
+from app.services.archiver import run_archival
+
+OLD = datetime(2000, 1, 1)
+NOW = datetime(2000, 3, 1)  # cutoff (30 days) falls after OLD and before 2000-02-15
+
+
+def _finished_execution(session, plan_id: int, created_at: datetime, *lines: str) -> int:
+    execution = create_execution(session, plan_id)
+    execution.created_at = created_at
+    for line in lines:
+        append_execution_log(session, execution, line)
+    set_execution_status(session, execution, "succeeded")
+    return execution.id
+
+
+def test_old_finished_rows_move_to_the_archive_and_stay_readable() -> None:
+    client = TestClient(create_app())
+    project_id = client.post("/projects", json={"name": "archive", "repo_path": "C:/tmp/demo"}).json()["id"]
+    plan_ids = [
+        client.post("/commands/parse", json={"project_id": project_id, "text": f"Deploy v{i} to staging"}).json()[
+            "plan_id"
+        ]
+        for i in range(2)
+    ]
+    with session_scope() as session:
+        for plan in session.exec(select(Plan).where(Plan.id.in_(plan_ids))):
+            plan.status, plan.created_at = "succeeded", OLD
+        old_id = _finished_execution(session, plan_ids[0], OLD, "step 1", "step 2")
+        recent_id = _finished_execution(session, plan_ids[1], datetime(2000, 2, 15), "recent")
+        # Old but still running: never archived.
+        running = create_execution(session, plan_ids[1])
+        running.created_at = OLD
+
+    result = run_archival(now=NOW)
+    assert (result.executions, result.plans) == (1, 1)
+
+    with session_scope() as session:
+        assert session.get(Execution, old_id) is None
+        assert not session.exec(select(ExecutionLogChunk).where(ExecutionLogChunk.execution_id == old_id)).all()
+        assert session.get(Execution, recent_id) is not None
+        assert session.get(Execution, running.id) is not None
+        archived = session.get(ArchivedExecution, old_id)
+        assert archived.log_encoding in ("zstd", "gzip")
+        assert archived.log_size == len("step 1\nstep 2\n")
+        # The first plan has no hot execution left; the second still does.
+        assert session.get(Plan, plan_ids[0]) is None
+        assert session.get(ArchivedPlan, plan_ids[0]).raw_command == "Deploy v0 to staging"
+        assert session.get(Plan, plan_ids[1]) is not None
+
+    body = client.get(f"/executions/{old_id}").json()
+    assert (body["status"], body["logs"]) == ("succeeded", "step 1\nstep 2\n")
+    assert client.get(f"/executions/{old_id}/status").json()["log_cursor"] == 0
+    page = client.get(f"/executions/{old_id}/logs").json()
+    assert (page["lines"], page["has_more"]) == (["step 1", "step 2"], False)
+    assert client.get(f"/executions/{old_id}/logs", params={"after": 0}).json()["lines"] == []
+    assert client.get("/executions/999999").status_code == 404
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.common.settings import settings
+from app.services.deployers import AsyncBaseDeployer, RenderDeployer, VercelDeployer
+from app.services.deployers.http import ApiFlow, HttpApiDeployer
+from app.services.deployers.metadata_cache import MetadataCache
+
+
+def _vercel_response(request: httpx.Request) -> httpx.Response:
+    if request.method == "GET":
+        return httpx.Response(200, json={"deployments": [{"uid": "dpl_1", "url": "app.vercel.app"}]})
+    return httpx.Response(200, json={"id": "dpl_2", "url": "app-new.vercel.app", "readyState": "BUILDING"})
+
+
+def test_async_and_sync_vercel_deploys_match(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "vercel_token", "token")
+    monkeypatch.setattr(settings, "vercel_project_id", "prj_1")
+    # Measures request overlap, not the client-side rate limiter.
+    monkeypatch.setattr(settings, "http_rate_limit_per_second", 0)
+
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            return _vercel_response(request)
+        finally:
+            in_flight -= 1
+
+    sync_deployer = VercelDeployer(
+        client=httpx.Client(transport=httpx.MockTransport(_vercel_response)), cache=MetadataCache()
+    )
+    expected = sync_deployer.deploy(project_name="demo", environment="staging")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            deployer = VercelDeployer(async_client=client, cache=MetadataCache())
+            assert isinstance(deployer, AsyncBaseDeployer)
+            return await asyncio.gather(
+                *(deployer.adeploy(project_name="demo", environment="staging") for _ in range(20))
+            )
+
+    results = asyncio.run(scenario())
+    # Every deploy's request was in flight at the same time.
+    assert peak == 20
+    assert all(result == expected for result in results)
+    assert expected.deployment_id == "dpl_2"
+
+
+def test_async_transport_errors_become_failed_results(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "render_api_key", "key")
+    monkeypatch.setattr(settings, "render_service_id", "srv_1")
+    monkeypatch.setattr(settings, "http_retry_base_delay_seconds", 0.01)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            deployer = RenderDeployer(async_client=client)
+            return await deployer.adeploy(project_name="demo"), await deployer.arollback("dep_1")
+
+    deployed, rolled_back = asyncio.run(scenario())
+    assert not deployed.success
+    assert "connection refused" in deployed.message
+    assert deployed.logs[-1] == "HTTP Error: connection refused"
+    assert not rolled_back.success
+
+
+def test_http_deployer_missing_a_flow_cannot_be_created() -> None:
+    class HalfDeployer(HttpApiDeployer):
+        API_BASE = "https://api.example.com"
+        PROVIDER = "example"
+
+        @property
+        def name(self) -> str:
+            return "Example"
+
+        def validate_config(self) -> tuple[bool, str]:
+            return True, ""
+
+        def _deploy_flow(self, **kwargs) -> ApiFlow:
+            raise AssertionError("never called")
+
+    with pytest.raises(TypeError, match="_rollback_flow"):
+        HalfDeployer()
@@ -0,0 +1,89 @@
+import fakeredis
+from fastapi.testclient import TestClient
+from rq import Queue
+from sqlalchemy import event
+
+from app.main import create_app
+from app.persistence.db import async_engine
+from app.queue.events import execution_stream_key
+
+
+def _plans(client: TestClient, count: int) -> list[int]:
+    project_id = client.post("/projects", json={"name": "train", "repo_path": "C:/tmp/demo"}).json()["id"]
+    return [
+        client.post("/commands/parse", json={"project_id": project_id, "text": f"Deploy v3.{i} to staging"}).json()[
+            "plan_id"
+        ]
+        for i in range(count)
+    ]
+
+
+def test_batch_approve_reports_each_plan_and_enqueues_in_one_go(monkeypatch) -> None:
+    redis = fakeredis.FakeRedis()
+    queue = Queue("test", connection=redis)
+    monkeypatch.setattr("app.api.routes.executions.get_queue", lambda lane="default": queue)
+    client = TestClient(create_app())
+    first, second, third = _plans(client, 3)
+    client.post(f"/executions/approve/{second}")
+
+    response = client.post("/executions/approve", json={"plan_ids": [first, second, 999999, third, first]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["plan_id"], r["status_code"]) for r in results] == [
+        (first, 200),
+        (second, 409),
+        (999999, 404),
+        (third, 200),
+    ]
+    assert results[1]["detail"] == "Plan status is approved"
+
+    approved = [r for r in results if r["status_code"] == 200]
+    assert set(queue.job_ids) >= {r["rq_job_id"] for r in approved}
+    for result in approved:
+        assert queue.fetch_job(result["rq_job_id"]).args == (result["execution_id"],)
+        assert redis.xlen(execution_stream_key(result["execution_id"])) == 1
+        assert client.get(f"/executions/{result['execution_id']}/status").json()["status"] == "queued"
+
+    assert client.post("/executions/approve", json={"plan_ids": []}).status_code == 422
+
+
+def test_batch_approve_publishes_queued_before_enqueueing(monkeypatch) -> None:
+    redis = fakeredis.FakeRedis()
+    seen_at_enqueue: list[int] = []
+
+    class _Queue(Queue):
+        def enqueue_many(self, job_datas, pipeline=None):
+            seen_at_enqueue.extend(redis.xlen(execution_stream_key(data.args[0])) for data in job_datas)
+            return super().enqueue_many(job_datas, pipeline=pipeline)
+
+    monkeypatch.setattr("app.api.routes.executions.get_queue", lambda lane="default": _Queue(connection=redis))
+    client = TestClient(create_app())
+
+    client.post("/executions/approve", json={"plan_ids": _plans(client, 3)})
+    assert seen_at_enqueue == [1, 1, 1]
+
+
+def test_batch_approve_statement_count_does_not_grow_with_the_batch(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "app.api.routes.executions.get_queue",
+        lambda lane="default": Queue("test", connection=fakeredis.FakeRedis()),
+    )
+    client = TestClient(create_app())
+    counts = []
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    for size in (2, 20):
+        plan_ids = _plans(client, size)
+        statements.clear()
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            client.post("/executions/approve", json={"plan_ids": plan_ids})
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+        counts.append(len(statements))
+
+    # SELECT plans, UPDATE plans (executemany), INSERT executions
+    assert counts == [3, 3], counts
@@ -0,0 +1,29 @@
+from sqlalchemy.pool import NullPool
+
+from app.common.settings import get_database_url, settings
+from app.persistence.db import _pool_options, _postgres_connect_args, get_async_database_url
+
+
+def test_postgres_urls_use_psycopg_and_asyncpg(monkeypatch) -> None:
+    for url in ("postgres://u:p@db:5432/app", "postgresql://u:p@db:5432/app"):
+        monkeypatch.setattr(settings, "database_url", url)
+        assert get_database_url() == "postgresql+psycopg://u:p@db:5432/app"
+    assert get_async_database_url(get_database_url()) == "postgresql+asyncpg://u:p@db:5432/app"
+
+    monkeypatch.setattr(settings, "database_url", "file:./data/dev.db")
+    assert get_database_url() == "sqlite:///./data/dev.db"
+
+
+def test_postgres_connections_get_timeouts_and_pool_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 5000)
+    monkeypatch.setattr(settings, "db_idle_in_transaction_timeout_ms", 0)
+    monkeypatch.setattr(settings, "db_pool_size", 7)
+    monkeypatch.setattr(settings, "db_disable_pool", False)
+
+    assert _postgres_connect_args(async_driver=True) == {"server_settings": {"statement_timeout": "5000"}}
+    assert _postgres_connect_args(async_driver=False)["options"] == "-c statement_timeout=5000"
+    assert _pool_options()["pool_size"] == 7
+    assert _pool_options()["pool_pre_ping"] is False
+
+    monkeypatch.setattr(settings, "db_disable_pool", True)
+    assert _pool_options() == {"poolclass": NullPool}
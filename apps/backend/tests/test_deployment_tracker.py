@@ -0,0 +1,153 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.common.settings import settings
+from app.persistence.models import Execution, Plan, Project, TrackedDeployment
+from app.persistence.repositories import (
+    create_tracked_deployment,
+    list_tracked_deployments,
+    read_execution_log,
+)
+from app.services.deployers import VercelDeployer
+from app.services.deployment_tracker import DeploymentTracker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+def _setup(deployment_ids: list[str]):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+
+    @contextmanager
+    def session_factory():
+        with Session(engine) as session:
+            yield session
+
+    clock = _Clock()
+    with session_factory() as session:
+        project = Project(name="demo")
+        session.add(project)
+        session.commit()
+        plan = Plan(
+            project_id=project.id,
+            raw_command="deploy",
+            action="deploy",
+            environments=["staging"],
+            post_steps=[],
+            status="running",
+        )
+        session.add(plan)
+        session.commit()
+        execution = Execution(plan_id=plan.id, status="deploying")
+        session.add(execution)
+        session.commit()
+        for deployment_id in deployment_ids:
+            tracked = create_tracked_deployment(
+                session,
+                execution_id=execution.id,
+                provider="vercel",
+                environment=f"env-{deployment_id}",
+                deployment_id=deployment_id,
+            )
+            tracked.next_poll_at = tracked.created_at = clock.now
+            session.add(tracked)
+        session.commit()
+        execution_id, plan_id = execution.id, plan.id
+    return session_factory, clock, execution_id, plan_id
+
+
+def test_tracker_batches_backs_off_and_finishes_execution(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "vercel_token", "token")
+    monkeypatch.setattr(settings, "vercel_project_id", "prj_1")
+    ids = [f"dpl_{i}" for i in range(30)]
+    session_factory, clock, execution_id, plan_id = _setup(ids)
+    states = {deployment_id: "BUILDING" for deployment_id in ids}
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        deployments = [{"uid": uid, "state": state, "url": f"{uid}.vercel.app"} for uid, state in states.items()]
+        return httpx.Response(200, json={"deployments": deployments})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            deployer = VercelDeployer(async_client=client)
+            tracker = DeploymentTracker(
+                session_factory=session_factory,
+                deployer_factory=lambda provider: deployer,
+                clock=clock,
+                rng=lambda: 0.5,
+            )
+            assert await tracker.poll_once() == 30
+            # All 30 statuses came from one list request.
+            assert len(requests) == 1
+
+            # Nothing is due until the first backoff (5 s) has passed.
+            assert await tracker.poll_once() == 0
+            clock.advance(5)
+            assert await tracker.poll_once() == 30
+            with session_factory() as session:
+                assert {t.attempts for t in list_tracked_deployments(session, execution_id)} == {1}
+            clock.advance(5)
+            assert await tracker.poll_once() == 0
+            clock.advance(5)
+            assert await tracker.poll_once() == 30
+
+            for uid in ids:
+                states[uid] = "READY"
+            states["dpl_7"] = "ERROR"
+            clock.advance(20)
+            assert await tracker.poll_once() == 30
+            assert len(requests) == 4
+
+    asyncio.run(scenario())
+
+    with session_factory() as session:
+        tracked = list_tracked_deployments(session, execution_id)
+        assert {t.state for t in tracked if t.deployment_id != "dpl_7"} == {"succeeded"}
+        assert session.get(TrackedDeployment, tracked[7].id).state == "failed"
+        assert session.get(Execution, execution_id).status == "failed"
+        assert session.get(Plan, plan_id).status == "failed"
+
+
+def test_tracker_gives_up_after_timeout(monkeypatch) -> None:
+    session_factory, clock, execution_id, _ = _setup(["dpl_slow"])
+
+    class _StuckDeployer(VercelDeployer):
+        async def abatch_deployment_status(self, deployment_ids, *, max_concurrency=10):
+            return {}
+
+    async def scenario():
+        tracker = DeploymentTracker(
+            session_factory=session_factory,
+            deployer_factory=lambda provider: _StuckDeployer(),
+            clock=clock,
+            rng=lambda: 0.5,
+        )
+        await tracker.poll_once()
+        with session_factory() as session:
+            assert list_tracked_deployments(session, execution_id)[0].state == "pending"
+
+        clock.advance(settings.tracker_timeout_seconds + 1)
+        assert await tracker.poll_once() == 1
+
+    asyncio.run(scenario())
+
+    with session_factory() as session:
+        assert list_tracked_deployments(session, execution_id)[0].state == "failed"
+        execution = session.get(Execution, execution_id)
+        assert execution.status == "failed"
+        assert "gave up waiting after timeout" in read_execution_log(session, execution)
@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+
+from app.common.settings import settings
+from app.main import create_app
+from app.persistence.db import session_scope
+from app.persistence.repositories import (
+    append_execution_log_lines,
+    create_execution,
+    get_execution,
+)
+
+
+def _create_execution(client: TestClient) -> int:
+    project = client.post("/projects", json={"name": "demo", "repo_path": "C:/tmp/demo"}).json()
+    plan = client.post(
+        "/commands/parse",
+        json={"project_id": project["id"], "text": "Deploy v1.6 to staging"},
+    ).json()
+    with session_scope() as session:
+        return create_execution(session, plan["plan_id"]).id
+
+
+def test_log_tail_returns_only_new_lines() -> None:
+    client = TestClient(create_app())
+    execution_id = _create_execution(client)
+
+    first = client.get(f"/executions/{execution_id}/logs").json()
+    assert first["lines"] == []
+    assert first["next_cursor"] is None
+
+    with session_scope() as session:
+        execution = get_execution(session, execution_id)
+        append_execution_log_lines(session, execution, ["one", "two"])
+        append_execution_log_lines(session, execution, ["three"])
+
+    page = client.get(f"/executions/{execution_id}/logs", params={"limit": 1}).json()
+    assert page["lines"] == ["one", "two"]
+    assert page["has_more"] is True
+
+    page = client.get(
+        f"/executions/{execution_id}/logs", params={"after": page["next_cursor"]}
+    ).json()
+    assert page["lines"] == ["three"]
+    assert page["byte_offset"] == len(b"one\ntwo\n")
+    assert page["has_more"] is False
+
+    status = client.get(f"/executions/{execution_id}/status").json()
+    assert status["status"] == "queued"
+    assert status["log_cursor"] == page["next_cursor"]
+    assert "logs" not in status
+
+
+def test_log_pages_are_bounded_by_bytes(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "log_page_max_bytes", 10)
+    client = TestClient(create_app())
+    execution_id = _create_execution(client)
+    with session_scope() as session:
+        execution = get_execution(session, execution_id)
+        for lines in (["one", "two"], ["three"], ["four"]):
+            append_execution_log_lines(session, execution, lines)
+
+    pages, params = [], {}
+    while True:
+        page = client.get(f"/executions/{execution_id}/logs", params=params).json()
+        pages.append((page["lines"], page["has_more"]))
+        if not page["has_more"]:
+            break
+        params = {"after": page["next_cursor"]}
+    assert pages == [(["one", "two"], True), (["three"], True), (["four"], False)]
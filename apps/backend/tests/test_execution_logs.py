@@ -0,0 +1,108 @@
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.persistence.log_buffer import BufferedExecutionLog
+from app.persistence.migrations import migrate_legacy_execution_logs
+from app.persistence.models import Execution
+from app.persistence.repositories import (
+    append_execution_log,
+    append_execution_log_lines,
+    list_execution_log_chunks,
+    read_execution_log,
+)
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def test_append_writes_sequential_chunks_with_byte_offsets() -> None:
+    with _session() as session:
+        execution = Execution(plan_id=1)
+        session.add(execution)
+        session.commit()
+
+        append_execution_log(session, execution, "first")
+        append_execution_log_lines(session, execution, ["✓ second", "third"])
+
+        chunks = list_execution_log_chunks(session, execution.id)
+        assert [c.seq for c in chunks] == [0, 1]
+        assert [c.byte_offset for c in chunks] == [0, len(b"first\n")]
+        assert read_execution_log(session, execution) == "first\n✓ second\nthird\n"
+
+        assert [c.seq for c in list_execution_log_chunks(session, execution.id, after_seq=0)] == [1]
+
+
+def test_legacy_inline_logs_are_migrated_to_chunks() -> None:
+    with _session() as session:
+        execution = Execution(plan_id=1, logs="old line\n")
+        session.add(execution)
+        session.commit()
+        append_execution_log(session, execution, "new line")
+
+        assert migrate_legacy_execution_logs(session) == 1
+        assert migrate_legacy_execution_logs(session) == 0
+
+        chunks = list_execution_log_chunks(session, execution.id)
+        assert [c.payload for c in chunks] == ["old line\n", "new line\n"]
+        assert [c.byte_offset for c in chunks] == [0, len(b"old line\n")]
+        assert execution.logs == ""
+        assert read_execution_log(session, execution) == "old line\nnew line\n"
+
+
+def test_buffered_log_flushes_on_size_time_and_status() -> None:
+    now = [0.0]
+    with _session() as session:
+        execution = Execution(plan_id=1)
+        session.add(execution)
+        session.commit()
+
+        log = BufferedExecutionLog(session, execution, max_bytes=16, flush_interval=1.0, clock=lambda: now[0])
+        log.write("abc")
+        log.write("def")
+        assert list_execution_log_chunks(session, execution.id) == []
+
+        log.write("0123456789")  # crosses max_bytes
+        assert len(list_execution_log_chunks(session, execution.id)) == 1
+
+        log.write("late")
+        now[0] = 1.5
+        log.write("later")  # crosses flush_interval
+        assert len(list_execution_log_chunks(session, execution.id)) == 2
+
+        log.write("before status")
+        log.set_status("succeeded")
+        assert read_execution_log(session, execution).endswith("later\nbefore status\n")
+        assert execution.status == "succeeded"
+
+
+def test_buffered_log_flushes_when_due_without_another_write() -> None:
+    now = [0.0]
+    with _session() as session:
+        execution = Execution(plan_id=1)
+        session.add(execution)
+        session.commit()
+
+        log = BufferedExecutionLog(session, execution, max_bytes=1 << 20, flush_interval=1.0, clock=lambda: now[0])
+        log.write("compiling...")
+        log.flush_if_due()
+        assert list_execution_log_chunks(session, execution.id) == []
+
+        now[0] = 1.5  # a silent build step: nothing else is written
+        log.flush_if_due()
+        assert read_execution_log(session, execution) == "compiling...\n"
+
+
+def test_buffered_log_flushes_pending_lines_on_exception() -> None:
+    with _session() as session:
+        execution = Execution(plan_id=1)
+        session.add(execution)
+        session.commit()
+
+        with pytest.raises(RuntimeError), BufferedExecutionLog(session, execution, max_bytes=1 << 20, flush_interval=60) as log:
+            log.write("step 1")
+            raise RuntimeError("boom")
+
+        assert read_execution_log(session, execution) == "step 1\n"
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import fakeredis
+import fakeredis.aioredis
+from fastapi.testclient import TestClient
+from rq import Queue
+
+from app.api.routes.executions import get_event_broker
+from app.main import create_app
+from app.persistence.db import session_scope
+from app.persistence.repositories import (
+    append_execution_log_lines,
+    create_execution,
+    get_execution,
+    set_execution_status,
+)
+from app.queue.events import ExecutionEventBroker, ExecutionEventPublisher, execution_stream_key
+
+
+def _parse_sse(body: str) -> list[dict]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append({**fields, "data": json.loads(fields["data"])})
+    return events
+
+
+def _create_execution(client: TestClient) -> int:
+    project = client.post("/projects", json={"name": "demo", "repo_path": "C:/tmp/demo"}).json()
+    plan = client.post(
+        "/commands/parse",
+        json={"project_id": project["id"], "text": "Deploy v1.6 to staging"},
+    ).json()
+    with session_scope() as session:
+        return create_execution(session, plan["plan_id"]).id
+
+
+def test_stream_replays_events_and_resumes_after_last_event_id() -> None:
+    server = fakeredis.FakeServer()
+    publisher = ExecutionEventPublisher(fakeredis.FakeRedis(server=server))
+    broker = ExecutionEventBroker(fakeredis.aioredis.FakeRedis(server=server), block_ms=50)
+
+    app = create_app()
+    app.dependency_overrides[get_event_broker] = lambda: broker
+    with TestClient(app) as client:
+        execution_id = _create_execution(client)
+        publisher.publish_status(execution_id, "queued")
+        publisher.publish_status(execution_id, "running")
+        publisher.publish_log(execution_id, ["step 1", "step 2"])
+        publisher.publish_status(execution_id, "succeeded")
+
+        events = _parse_sse(client.get(f"/executions/{execution_id}/stream").text)
+        assert [e["event"] for e in events] == ["status", "status", "log", "status"]
+        assert events[2]["data"] == {"lines": ["step 1", "step 2"]}
+        assert events[-1]["data"] == {"status": "succeeded"}
+
+        resumed = _parse_sse(
+            client.get(
+                f"/executions/{execution_id}/stream",
+                headers={"Last-Event-ID": events[1]["id"]},
+            ).text
+        )
+        assert [e["id"] for e in resumed] == [e["id"] for e in events[2:]]
+
+
+def test_queued_is_published_before_a_worker_can_take_the_job(monkeypatch) -> None:
+    redis = fakeredis.FakeRedis()
+    seen_at_enqueue: list[int] = []
+
+    class _Queue(Queue):
+        def enqueue(self, f, execution_id, **kwargs):
+            seen_at_enqueue.append(redis.xlen(execution_stream_key(execution_id)))
+            return super().enqueue(f, execution_id, **kwargs)
+
+    monkeypatch.setattr("app.api.routes.executions.get_queue", lambda lane="default": _Queue(connection=redis))
+    client = TestClient(create_app())
+    project = client.post("/projects", json={"name": "demo", "repo_path": "C:/tmp/demo"}).json()
+    plan = client.post("/commands/parse", json={"project_id": project["id"], "text": "Deploy v1.7 to staging"}).json()
+
+    client.post(f"/executions/approve/{plan['plan_id']}")
+    assert seen_at_enqueue == [1]
+
+
+def test_reconnecting_to_a_finished_execution_ends_with_its_final_status() -> None:
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeRedis(server=server)
+    publisher = ExecutionEventPublisher(redis)
+    broker = ExecutionEventBroker(fakeredis.aioredis.FakeRedis(server=server), block_ms=50)
+
+    app = create_app()
+    app.dependency_overrides[get_event_broker] = lambda: broker
+    with TestClient(app) as client:
+        execution_id = _create_execution(client)
+        with session_scope() as session:
+            execution = get_execution(session, execution_id)
+            append_execution_log_lines(session, execution, ["step 1", "step 2"])
+            set_execution_status(session, execution, "succeeded")
+        publisher.publish_log(execution_id, ["step 1", "step 2"])
+        publisher.publish_status(execution_id, "succeeded")
+        last_id = redis.xrevrange(execution_stream_key(execution_id), count=1)[0][0].decode()
+
+        # Caught up: only the final status, no repeated log lines.
+        caught_up = _parse_sse(
+            client.get(f"/executions/{execution_id}/stream", headers={"Last-Event-ID": last_id}).text
+        )
+        assert [(e["event"], e["data"]) for e in caught_up] == [("status", {"status": "succeeded"})]
+
+        # The stream expired while the browser was away: the log comes from the database.
+        redis.delete(execution_stream_key(execution_id))
+        expired = _parse_sse(
+            client.get(f"/executions/{execution_id}/stream", headers={"Last-Event-ID": last_id}).text
+        )
+        assert [(e["event"], e["data"]) for e in expired] == [
+            ("log", {"lines": ["step 1", "step 2"]}),
+            ("status", {"status": "succeeded"}),
+        ]
+
+
+def test_live_subscribers_share_one_feed() -> None:
+    server = fakeredis.FakeServer()
+    publisher = ExecutionEventPublisher(fakeredis.FakeRedis(server=server))
+
+    async def scenario() -> list[list[dict]]:
+        broker = ExecutionEventBroker(fakeredis.aioredis.FakeRedis(server=server), block_ms=50)
+
+        async def watch() -> list[dict]:
+            return [e.data async for e in broker.subscribe(42) if e is not None]
+
+        viewers = [asyncio.create_task(watch()) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        assert len(broker._feeds) == 1
+
+        publisher.publish_log(42, ["hello"])
+        publisher.publish_status(42, "failed")
+        results = await asyncio.wait_for(asyncio.gather(*viewers), timeout=5)
+        assert broker._feeds == {}
+        await broker.close()
+        return results
+
+    for events in asyncio.run(scenario()):
+        assert events == [{"lines": ["hello"]}, {"status": "failed"}]
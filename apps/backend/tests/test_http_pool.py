@@ -0,0 +1,40 @@
+import httpx
+
+from app.common.settings import settings
+from app.services.deployers import close_http_clients, get_deployer, get_http_client
+from app.services.deployers import http as http_pool
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.method == "GET" and request.url.path == "/v6/deployments":
+        return httpx.Response(200, json={"deployments": [{"uid": "dpl_1", "url": "app.vercel.app"}]})
+    if request.method == "GET":
+        return httpx.Response(200, json={"readyState": "READY", "url": "app.vercel.app"})
+    return httpx.Response(200, json={"id": "dpl_2", "url": "app-new.vercel.app"})
+
+
+def test_deployers_reuse_one_pooled_client_per_base_url(monkeypatch) -> None:
+    built: list[httpx.MockTransport] = []
+
+    def build_transport() -> httpx.BaseTransport:
+        built.append(httpx.MockTransport(_handler))
+        return built[-1]
+
+    monkeypatch.setattr(http_pool, "_build_transport", build_transport)
+    monkeypatch.setattr(settings, "vercel_token", "token")
+    monkeypatch.setattr(settings, "vercel_project_id", "prj_1")
+    close_http_clients()
+
+    try:
+        for _ in range(3):
+            assert get_deployer("vercel").deploy(project_name="demo", environment="staging").success
+        assert get_deployer("vercel").get_deployment_status("dpl_2").success
+        assert len(built) == 1
+        assert get_http_client("https://api.render.com/v1") is not get_http_client("https://api.vercel.com")
+        assert len(built) == 2
+
+        close_http_clients()
+        assert get_deployer("vercel").get_deployment_status("dpl_2").success
+        assert len(built) == 3
+    finally:
+        close_http_clients()
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import fakeredis
+import httpx
+from fastapi.testclient import TestClient
+
+from app.common.settings import settings
+from app.main import create_app
+from app.queue.redis_conn import get_redis
+from app.services.deployers import RenderDeployer, VercelDeployer, throttle
+from app.services.deployers.http import ApiRequest
+
+
+def _configure(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "vercel_token", "token")
+    monkeypatch.setattr(settings, "vercel_project_id", "prj_1")
+    monkeypatch.setattr(settings, "render_api_key", "key")
+    monkeypatch.setattr(settings, "render_service_id", "srv_1")
+    monkeypatch.setattr(settings, "http_rate_limit_backend", "local")
+    monkeypatch.setattr(settings, "http_retry_base_delay_seconds", 0.01)
+    monkeypatch.setattr(throttle, "_policies", {})
+
+
+def test_429_is_retried_after_retry_after(monkeypatch) -> None:
+    _configure(monkeypatch)
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if request.method == "POST" and calls.count("POST") == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"error": "rate limited"})
+        if request.method == "GET":
+            return httpx.Response(200, json={"deployments": [{"uid": "dpl_1", "url": "app.vercel.app"}]})
+        return httpx.Response(200, json={"id": "dpl_2", "url": "app.vercel.app"})
+
+    deployer = VercelDeployer(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    result = deployer.deploy(project_name="demo", environment="staging")
+
+    assert result.success
+    assert calls.count("POST") == 2
+    metrics = throttle.get_request_policy("vercel").metrics()
+    assert (metrics.rate_limited, metrics.retries, metrics.retries_exhausted) == (1, 1, 0)
+
+
+def test_gateway_errors_are_only_retried_for_idempotent_requests(monkeypatch) -> None:
+    _configure(monkeypatch)
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503, json={"message": "unavailable"})
+
+    deployer = RenderDeployer(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    assert not deployer.deploy(project_name="demo").success
+    # A deploy POST may have been accepted; never send it twice.
+    assert calls == ["POST"]
+
+    calls.clear()
+    assert not deployer.get_deployment_status("dep_1").success
+    assert calls == ["GET"] * (settings.http_max_retries + 1)
+
+
+def test_retry_budget_stops_retry_storms(monkeypatch) -> None:
+    _configure(monkeypatch)
+    policy = throttle.get_request_policy("vercel")
+    request = ApiRequest("GET", "/v13/deployments/dpl_1")
+    error = httpx.ConnectError("refused")
+
+    allowed = 0
+    for _ in range(20):
+        if policy.retry_delay(request, 0, error=error) is not None:
+            allowed += 1
+    assert allowed == 4
+    assert policy.metrics().retries_exhausted == 16
+
+
+def test_token_bucket_limits_rate_and_falls_back_without_redis() -> None:
+    now = [0.0]
+    bucket = throttle.LocalTokenBucket(clock=lambda: now[0])
+    assert [bucket.reserve(1.0, 2) for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve(1.0, 2) == 1.0
+    now[0] = 1.0
+    assert bucket.reserve(1.0, 2) == 0.0
+
+    # Redis is down, so the in-process bucket takes over.
+    server = fakeredis.FakeServer()
+    server.connected = False
+    fallback = throttle.LocalTokenBucket(clock=lambda: 0.0)
+    shared = throttle.RedisTokenBucket(fakeredis.FakeRedis(server=server), "bucket", fallback)
+    assert [shared.reserve(1.0, 1) for _ in range(2)] == [0.0, 1.0]
+
+
+def test_redis_token_bucket_is_shared_between_processes() -> None:
+    redis = fakeredis.FakeRedis()
+    fallback = throttle.LocalTokenBucket(clock=lambda: 0.0)
+    workers = [throttle.RedisTokenBucket(redis, "bucket", fallback) for _ in range(2)]
+
+    assert [worker.reserve(1.0, 2) for worker in workers] == [0.0, 0.0]
+    assert 0.9 < workers[0].reserve(1.0, 2) <= 1.0
+    assert 0 < redis.pttl("bucket") <= 3000
+    # The script ran on Redis; the fallback bucket was never touched.
+    assert fallback.reserve(1.0, 1) == 0.0
+
+
+def test_metrics_endpoint_sums_flushed_counters(monkeypatch) -> None:
+    _configure(monkeypatch)
+    monkeypatch.setattr(settings, "http_rate_limit_backend", "redis")
+    redis = fakeredis.FakeRedis()
+    for _ in range(2):
+        policy = throttle.RequestPolicy("render", redis=redis)
+        policy.retry_delay(ApiRequest("GET", "/services"), 0, response=httpx.Response(429))
+        policy.flush_metrics()
+
+    app = create_app()
+    app.dependency_overrides[get_redis] = lambda: redis
+    response = TestClient(app).get("/metrics/deployers")
+
+    assert response.status_code == 200
+    assert response.json()["render"]["rate_limited"] == 2
+    assert response.json()["render"]["retries"] == 2
+    assert response.json()["vercel"]["requests"] == 0
+
+
+def test_metrics_are_flushed_off_the_request_path(monkeypatch) -> None:
+    _configure(monkeypatch)
+    monkeypatch.setattr(settings, "http_rate_limit_backend", "redis")
+    monkeypatch.setattr(throttle, "_METRICS_FLUSH_SECONDS", 0.0)
+    release = threading.Event()
+
+    class SlowRedis(fakeredis.FakeRedis):
+        def pipeline(self, *args, **kwargs):
+            assert release.wait(5), "flush blocked the request path"
+            return super().pipeline(*args, **kwargs)
+
+    redis = SlowRedis()
+    policy = throttle.RequestPolicy("render", redis=redis)
+    for _ in range(3):
+        policy.retry_delay(ApiRequest("GET", "/services"), 0, response=httpx.Response(429))
+    assert policy.metrics().rate_limited == 3
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while not redis.hget(throttle.http_metrics_key("render"), "rate_limited") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    policy.flush_metrics()
+    assert redis.hget(throttle.http_metrics_key("render"), "rate_limited") == b"3"
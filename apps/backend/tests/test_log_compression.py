@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from app.main import create_app
+from app.persistence.db import session_scope
+from app.persistence.log_codec import IDENTITY, compress_log, decompress_log_bytes
+from app.persistence.models import Execution, ExecutionLogChunk
+from app.persistence.repositories import (
+    append_execution_log_lines,
+    create_execution,
+    get_execution_log_cursor,
+    list_execution_log_chunks,
+    read_execution_log,
+    set_execution_status,
+)
+
+LOG = "npm ci\n✓ added 812 packages\nnpm run build\nbuild ok\n"
+
+
+def _finished_execution(client: TestClient) -> int:
+    project_id = client.post("/projects", json={"name": "logs", "repo_path": "C:/tmp/demo"}).json()["id"]
+    plan_id = client.post("/commands/parse", json={"project_id": project_id, "text": "Deploy to staging"}).json()[
+        "plan_id"
+    ]
+    with session_scope() as session:
+        execution = create_execution(session, plan_id)
+        append_execution_log_lines(session, execution, ["npm ci", "✓ added 812 packages"])
+        append_execution_log_lines(session, execution, ["npm run build"])
+        append_execution_log_lines(session, execution, ["build ok"])
+        set_execution_status(session, execution, "succeeded")
+    return execution.id
+
+
+def test_finished_log_is_compressed_and_chunk_cursors_keep_working() -> None:
+    execution_id = _finished_execution(TestClient(create_app()))
+
+    with session_scope() as session:
+        execution = session.get(Execution, execution_id)
+        assert execution.log_encoding in ("zstd", "gzip")
+        assert execution.log_size == len(LOG.encode("utf-8"))
+        assert not session.exec(select(ExecutionLogChunk).where(ExecutionLogChunk.execution_id == execution_id)).all()
+        assert read_execution_log(session, execution) == LOG
+        assert get_execution_log_cursor(session, execution_id) == 2
+
+        chunks = list_execution_log_chunks(session, execution_id, after_seq=0, limit=1)
+        assert [(c.seq, c.byte_offset, c.payload) for c in chunks] == [
+            (1, len("npm ci\n✓ added 812 packages\n".encode()), "npm run build\n")
+        ]
+        assert [c.seq for c in list_execution_log_chunks(session, execution_id, max_bytes=1)] == [0]
+
+        # A late line (e.g. from the tracker) goes after the folded chunks.
+        append_execution_log_lines(session, execution, ["late"])
+        assert [c.seq for c in list_execution_log_chunks(session, execution_id, after_seq=1)] == [2, 3]
+        assert read_execution_log(session, execution) == LOG + "late\n"
+
+
+
+def test_log_prefix_is_decompressed_as_bytes() -> None:
+    raw = LOG.encode()
+    for encoding in ("zstd", "gzip", IDENTITY):
+        blob, _ = compress_log(LOG, encoding)
+        assert decompress_log_bytes(blob, encoding) == raw
+        # Ends inside the three-byte "✓", so it must not be decoded on its own.
+        assert decompress_log_bytes(blob, encoding, 8) == raw[:8]
+        assert decompress_log_bytes(blob, encoding, 10_000) == raw
+
+
+def test_raw_log_is_passed_through_when_the_encoding_is_accepted() -> None:
+    client = TestClient(create_app())
+    execution_id = _finished_execution(client)
+
+    with session_scope() as session:
+        encoding = session.get(Execution, execution_id).log_encoding
+
+    response = client.get(f"/executions/{execution_id}/logs/raw", headers={"Accept-Encoding": f"{encoding}, br"})
+    assert response.headers["content-encoding"] == encoding
+    assert response.text == LOG  # decoded by the client
+
+    response = client.get(f"/executions/{execution_id}/logs/raw", headers={"Accept-Encoding": f"{encoding};q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.text == LOG
+
+    page = client.get(f"/executions/{execution_id}/logs", params={"after": 1}).json()
+    assert (page["lines"], page["next_cursor"], page["has_more"]) == (["build ok"], 2, False)
+    assert client.get(f"/executions/{execution_id}").json()["logs"] == LOG
@@ -0,0 +1,77 @@
+import json
+
+import fakeredis
+import httpx
+
+from app.common.settings import settings
+from app.services.deployers import RenderDeployer, VercelDeployer
+from app.services.deployers.metadata_cache import MetadataCache
+
+
+def test_vercel_redeploys_list_latest_deployment_once(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "vercel_token", "token")
+    monkeypatch.setattr(settings, "vercel_project_id", "prj_1")
+    monkeypatch.setattr(settings, "http_rate_limit_backend", "local")
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(200, json={"deployments": [{"uid": "dpl_0", "url": "app-0.vercel.app"}]})
+        new_id = f"dpl_{sum(r.method == 'POST' for r in requests)}"
+        return httpx.Response(200, json={"id": new_id, "url": f"{new_id}.vercel.app"})
+
+    deployer = VercelDeployer(client=httpx.Client(transport=httpx.MockTransport(handler)), cache=MetadataCache())
+    results = [deployer.deploy(project_name="demo", environment="staging") for _ in range(3)]
+
+    assert [r.deployment_id for r in results] == ["dpl_1", "dpl_2", "dpl_3"]
+    assert [r.method for r in requests] == ["GET", "POST", "POST", "POST"]
+    # Each redeploy starts from the deployment created just before it.
+    sources = [json.loads(r.content)["deploymentId"] for r in requests if r.method == "POST"]
+    assert sources == ["dpl_0", "dpl_1", "dpl_2"]
+
+
+def test_render_service_metadata_is_revalidated_with_etag(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "render_api_key", "key")
+    monkeypatch.setattr(settings, "render_service_id", "srv_1")
+    monkeypatch.setattr(settings, "http_rate_limit_backend", "local")
+    now = [1000.0]
+    service_gets: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(201, json={"id": "dep_1", "status": "created"})
+        service_gets.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        body = {"service": {"serviceDetails": {"url": "https://demo.onrender.com"}}}
+        return httpx.Response(200, json=body, headers={"ETag": '"v1"'})
+
+    deployer = RenderDeployer(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        cache=MetadataCache(clock=lambda: now[0]),
+    )
+    urls = [deployer.deploy(project_name="demo").deployment_url]
+    urls.append(deployer.deploy(project_name="demo").deployment_url)
+    assert len(service_gets) == 1
+
+    now[0] += settings.provider_cache_ttl_seconds + 1
+    urls.append(deployer.deploy(project_name="demo").deployment_url)
+
+    assert urls == ["https://demo.onrender.com"] * 3
+    assert len(service_gets) == 2
+    assert service_gets[-1].headers["If-None-Match"] == '"v1"'
+
+
+def test_redis_backing_shares_entries_between_processes(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "provider_cache_backend", "redis")
+    redis = fakeredis.FakeRedis()
+    first, second = MetadataCache(redis=redis), MetadataCache(redis=redis)
+
+    first.set("render:service:srv_1", {"url": "https://demo.onrender.com"}, ttl=60, etag='"v1"')
+    entry = second.get("render:service:srv_1")
+    assert entry is not None and entry.data == {"url": "https://demo.onrender.com"}
+
+    first.invalidate("render:service:srv_1")
+    second.clear()
+    assert second.get("render:service:srv_1") is None
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.persistence.db import engine, session_scope
+from app.persistence.repositories import create_execution, set_execution_status
+
+
+def _pages(client: TestClient, path: str, **params) -> list[list[dict]]:
+    pages, after = [], None
+    while True:
+        body = client.get(path, params={**params, **({"after": after} if after else {})}).json()
+        pages.append(body["items"])
+        after = body["next_cursor"]
+        if after is None:
+            return pages
+
+
+def test_list_endpoints_page_newest_first_with_filters() -> None:
+    client = TestClient(create_app())
+    project_ids = [
+        client.post("/projects", json={"name": f"p{i}", "repo_path": "C:/tmp/demo"}).json()["id"]
+        for i in range(2)
+    ]
+    plan_ids = [
+        client.post("/commands/parse", json={"project_id": project_ids[0], "text": f"Deploy v1.{i} to staging"}).json()[
+            "plan_id"
+        ]
+        for i in range(5)
+    ]
+    client.post("/commands/parse", json={"project_id": project_ids[1], "text": "Deploy v2 to staging"})
+    with session_scope() as session:
+        execution_ids = [create_execution(session, plan_id).id for plan_id in plan_ids]
+        set_execution_status(session, create_execution(session, plan_ids[0]), "running")
+
+    listed = [p["id"] for page in _pages(client, "/projects", limit=1) for p in page]
+    assert listed.index(project_ids[1]) < listed.index(project_ids[0])
+    assert len(listed) == len(set(listed))
+
+    pages = _pages(client, "/plans", project_id=project_ids[0], limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [p["id"] for page in pages for p in page] == plan_ids[::-1]
+    assert pages[0][0]["environments"] == ["staging"]
+
+    pages = _pages(client, "/executions", project_id=project_ids[0], status="queued", limit=3)
+    assert [e["id"] for page in pages for e in page] == execution_ids[::-1]
+    assert pages[0][0]["command"] == "Deploy v1.4 to staging"
+
+    assert client.get("/executions", params={"after": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.sqlite_only
+def test_filtered_page_is_an_index_range_scan() -> None:
+    with engine.connect() as connection:
+        plan = connection.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM execution WHERE project_id = 1 "
+                "AND (created_at, id) < ('2030-01-01', 10) ORDER BY created_at DESC, id DESC LIMIT 51"
+            )
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_execution_project_id_created_at_id" in details
+    assert "TEMP B-TREE" not in details
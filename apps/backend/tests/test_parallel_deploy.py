@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from app.common.settings import settings
+from app.persistence.models import Plan, Project
+from app.services.deployers import BaseDeployer, DeploymentResult
+from app.services.orchestrator import Orchestrator
+
+
+class _MemoryLog:
+    flush_interval = 0.05
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+    def flush(self) -> None:
+        pass
+
+    def flush_if_due(self) -> None:
+        pass
+
+
+class _FakeDeployer(BaseDeployer):
+    def __init__(self, fail: set[str] | None = None) -> None:
+        self.fail = fail or set()
+        self.started: dict[str, float] = {}
+        self.finished: dict[str, float] = {}
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return "Fake"
+
+    def deploy(self, *, project_name, repo_path=None, repo_url=None, environment="production", version=None):
+        with self._lock:
+            self.started[environment] = time.monotonic()
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+            self.finished[environment] = time.monotonic()
+        if environment in self.fail:
+            return DeploymentResult(success=False, message="boom")
+        return DeploymentResult(success=True, message="ok", logs=[f"deployed {environment}"])
+
+    def get_deployment_status(self, deployment_id):
+        raise NotImplementedError
+
+    def rollback(self, deployment_id):
+        raise NotImplementedError
+
+
+_PROJECT = Project(id=1, name="demo", repo_url="https://example.com/demo.git")
+_PLAN = Plan(id=1, project_id=1, raw_command="", action="deploy", environments=[], post_steps=[])
+
+
+def test_environments_deploy_concurrently_with_production_gated(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "deploy_max_parallelism", 4)
+    deployer = _FakeDeployer()
+    log = _MemoryLog()
+
+    summary = Orchestrator(deployer=deployer)._deploy_to_cloud(
+        _PROJECT, _PLAN, log, ["dev", "staging", "production"]
+    )
+
+    assert summary.success
+    assert set(summary.metadata["environments"]) == {"dev", "staging", "production"}
+    assert deployer.max_running == 2
+    assert deployer.started["production"] >= max(deployer.finished["dev"], deployer.finished["staging"])
+    assert "[staging] deployed staging" in log.lines
+
+
+def test_failed_environment_skips_gated_production(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "deploy_max_parallelism", 4)
+    deployer = _FakeDeployer(fail={"staging"})
+    log = _MemoryLog()
+
+    with pytest.raises(RuntimeError, match="staging"):
+        Orchestrator(deployer=deployer)._deploy_to_cloud(_PROJECT, _PLAN, log, ["dev", "staging", "production"])
+
+    assert "production" not in deployer.started
+    assert any(line.startswith("[production] ✗") for line in log.lines)
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.persistence.db import engine, session_scope
+from app.persistence.repositories import get_plan
+
+
+def test_plans_round_trip_lists_and_filter_by_environment() -> None:
+    client = TestClient(create_app())
+    project_id = client.post("/projects", json={"name": "demo", "repo_path": "C:/tmp/demo"}).json()["id"]
+    prod, staging, both = (
+        client.post("/commands/parse", json={"project_id": project_id, "text": text}).json()["plan_id"]
+        for text in ("Deploy v1 to prod", "Deploy v1 to staging with smoke tests", "Deploy v2 to staging and production")
+    )
+
+    with session_scope() as session:
+        plan = get_plan(session, staging)
+        assert plan.environments == ["staging"]
+        assert plan.post_steps == ["run_tests", "smoke_tests"]
+
+    def listed(environment: str) -> list[int]:
+        params = {"project_id": project_id, "environment": environment}
+        return [p["id"] for p in client.get("/plans", params=params).json()["items"]]
+
+    assert listed("production") == [both, prod]
+    assert listed("staging") == [both, staging]
+    assert listed("dev") == []
+
+
+@pytest.mark.sqlite_only
+def test_production_filter_uses_generated_column_index() -> None:
+    with engine.connect() as connection:
+        plan = connection.execute(
+            text(
+                'EXPLAIN QUERY PLAN SELECT id FROM "plan" WHERE targets_production = 1 '
+                "ORDER BY created_at DESC, id DESC LIMIT 51"
+            )
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_plan_targets_production_created_at_id" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,59 @@
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from rq import Queue
+
+from app.main import create_app
+from app.persistence.models import Plan
+from app.queue.queue import lane_for_plan, queue_name, worker_queue_names
+
+
+@pytest.mark.parametrize(
+    ("action", "environments", "lane"),
+    [
+        ("deploy", ["staging", "production"], "critical"),
+        ("rollback", ["staging"], "critical"),
+        ("deploy", ["staging"], "default"),
+        ("deploy", ["dev", "staging"], "default"),
+        ("deploy", ["dev"], "bulk"),
+    ],
+)
+def test_lane_follows_action_and_environments(action: str, environments: list[str], lane: str) -> None:
+    plan = Plan(project_id=1, raw_command="", action=action, environments=environments)
+    assert lane_for_plan(plan) == lane
+
+
+def test_workers_listen_in_strict_priority_order() -> None:
+    assert worker_queue_names() == [
+        "ai-devops:critical",
+        "ai-devops:default",
+        "ai-devops:bulk",
+        "ai-devops",  # jobs enqueued before lanes existed
+    ]
+    assert worker_queue_names(["critical"]) == ["ai-devops:critical"]
+    with pytest.raises(ValueError):
+        worker_queue_names(["urgent"])
+
+
+def test_production_jobs_overtake_a_bulk_backlog(monkeypatch) -> None:
+    redis = fakeredis.FakeRedis()
+    monkeypatch.setattr(
+        "app.api.routes.executions.get_queue", lambda lane="default": Queue(queue_name(lane), connection=redis)
+    )
+    client = TestClient(create_app())
+    project_id = client.post("/projects", json={"name": "lanes", "repo_path": "C:/tmp/demo"}).json()["id"]
+
+    def plan(text: str) -> int:
+        return client.post("/commands/parse", json={"project_id": project_id, "text": text}).json()["plan_id"]
+
+    bulk = [plan(f"Deploy v0.{i} to dev") for i in range(3)]
+    results = client.post("/executions/approve", json={"plan_ids": bulk}).json()["results"]
+    urgent = client.post(f"/executions/approve/{plan('Deploy v9 to production')}").json()
+
+    queues = [Queue(name, connection=redis) for name in worker_queue_names()]
+    assert [len(queue) for queue in queues] == [1, 0, 3, 0]
+    # What an RQ worker does on each iteration: take from the first non-empty queue.
+    job, queue = Queue.dequeue_any(queues, None, connection=redis)
+    assert (job.id, queue.name) == (urgent["rq_job_id"], "ai-devops:critical")
+    job, queue = Queue.dequeue_any(queues, None, connection=redis)
+    assert (job.id, queue.name) == (results[0]["rq_job_id"], "ai-devops:bulk")
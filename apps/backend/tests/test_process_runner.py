@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.common.settings import settings
+from app.services.deployers.local import LocalDeployer
+from app.services.process_runner import run_streaming
+
+SCRIPT = """
+import sys
+for i in range(200):
+    print(f"out {i}", flush=True)
+    print(f"err {i}", file=sys.stderr, flush=True)
+sys.exit(3)
+"""
+
+
+def test_streams_both_pipes_and_spills_past_buffer_cap(tmp_path: Path) -> None:
+    seen: list[str] = []
+    result = run_streaming(
+        [sys.executable, "-c", SCRIPT],
+        cwd=tmp_path,
+        env=dict(os.environ),
+        on_line=seen.append,
+        max_buffer_bytes=256,
+    )
+
+    assert result.returncode == 3
+    assert len(seen) == 400
+    assert sorted(line for line in seen if line.startswith("out")) == sorted(f"out {i}" for i in range(200))
+    assert sum(len(line) + 1 for line in result.tail) <= 256
+    assert result.tail[-1] in {"out 199", "err 199"}
+
+    assert result.truncated and result.spill_path is not None
+    try:
+        assert result.spill_path.read_text(encoding="utf-8").splitlines() == seen
+    finally:
+        result.spill_path.unlink()
+
+
+def test_small_output_stays_in_memory(tmp_path: Path) -> None:
+    result = run_streaming(
+        [sys.executable, "-c", "print('hello')"],
+        cwd=tmp_path,
+        env=dict(os.environ),
+    )
+
+    assert result.returncode == 0
+    assert result.tail == ["hello"]
+    assert result.spill_path is None and not result.truncated
+
+
+def test_spill_file_is_removed_when_the_run_fails(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "spill"))
+    (tmp_path / "spill").mkdir()
+    seen: list[str] = []
+
+    def on_line(line: str) -> None:
+        seen.append(line)
+        if len(seen) == 100:
+            raise RuntimeError("log store unavailable")
+
+    with pytest.raises(RuntimeError):
+        run_streaming(
+            [sys.executable, "-c", SCRIPT], cwd=tmp_path, env=dict(os.environ), on_line=on_line, max_buffer_bytes=256
+        )
+
+    assert list((tmp_path / "spill").iterdir()) == []
+
+
+def test_local_deployer_keeps_the_tail_without_leaving_files(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "spill"))
+    (tmp_path / "spill").mkdir()
+    monkeypatch.setattr(settings, "process_output_buffer_bytes", 256)
+    logs: list[str] = []
+
+    ok = LocalDeployer()._run_command([sys.executable, "-c", SCRIPT], tmp_path, dict(os.environ), logs)
+
+    assert not ok
+    assert logs[-2].startswith("Output truncated to the last ")
+    assert logs[-1] == "Command failed with exit code 3"
+    assert list((tmp_path / "spill").iterdir()) == []
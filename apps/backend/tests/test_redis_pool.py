@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from app.common.settings import settings
+from app.queue import redis_conn
+from app.queue.queue import get_queue
+from app.queue.redis_conn import close_redis_pool, get_redis, get_redis_pool
+
+
+def test_clients_and_queues_share_one_pool(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "redis_max_connections", 7)
+    close_redis_pool()
+    try:
+        pool = get_redis_pool()
+        assert get_redis().connection_pool is pool
+        assert get_queue().connection.connection_pool is pool
+        assert pool.max_connections == 7
+        assert pool.connection_kwargs["socket_keepalive"] is True
+        assert pool.connection_kwargs["decode_responses"] is False
+
+        close_redis_pool()
+        assert get_redis_pool() is not pool
+    finally:
+        close_redis_pool()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_builds_its_own_pool() -> None:
+    parent_pool = get_redis_pool()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child: report whether the inherited pool was dropped
+        os.write(write_end, b"1" if redis_conn._pool is None and get_redis_pool() is not parent_pool else b"0")
+        os._exit(0)
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    assert os.read(read_end, 1) == b"1"
+    assert get_redis_pool() is parent_pool
+    close_redis_pool()
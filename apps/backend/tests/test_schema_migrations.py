@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import event, inspect, text
+
+from app.common.settings import settings
+from app.persistence.db import create_db_engine
+from app.persistence.schema import current_revision, ensure_schema, head_revision
+
+
+def test_fresh_database_is_migrated_then_only_checked(tmp_path) -> None:
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    ensure_schema(engine)
+    assert current_revision(engine) == head_revision()
+    assert {"project", "plan", "execution", "executionlogchunk", "trackeddeployment"} <= set(
+        inspect(engine).get_table_names()
+    )
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    ensure_schema(engine)
+    assert statements == ["SELECT version_num FROM alembic_version"]
+
+
+def test_database_created_before_migrations_is_adopted(tmp_path) -> None:
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        # Tables as create_all made them before project_id, JSON columns and log chunks.
+        connection.execute(
+            text(
+                "CREATE TABLE plan (id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL, raw_command VARCHAR NOT NULL, "
+                "action VARCHAR NOT NULL, version VARCHAR, environments_json VARCHAR NOT NULL, "
+                "post_steps_json VARCHAR NOT NULL, warnings_json VARCHAR NOT NULL, status VARCHAR NOT NULL, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE execution (id INTEGER PRIMARY KEY, plan_id INTEGER NOT NULL, status VARCHAR NOT NULL, "
+                "logs VARCHAR NOT NULL, started_at DATETIME, finished_at DATETIME, created_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO plan VALUES (1, 7, 'Deploy to prod', 'deploy', NULL, '[\"production\"]', '[]', '[]', "
+                "'succeeded', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO execution VALUES (1, 1, 'succeeded', 'old log\n', NULL, NULL, '2024-01-01 00:00:00')")
+        )
+
+    ensure_schema(engine)
+
+    assert current_revision(engine) == head_revision()
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT project_id, logs FROM execution")).one() == (7, "")
+        assert connection.execute(text("SELECT payload FROM executionlogchunk")).scalar() == "old log\n"
+        assert connection.execute(text("SELECT targets_production FROM plan")).scalar() == 1
+
+
+def test_pending_migrations_fail_startup_when_auto_migrate_is_off(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_auto_migrate", False)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    with pytest.raises(RuntimeError, match="app.persistence.schema upgrade"):
+        ensure_schema(engine)
@@ -0,0 +1,40 @@
+import time
+
+from sqlmodel import Session, SQLModel
+
+from app.common.settings import settings
+from app.persistence.db import create_db_engine
+from app.persistence.models import Execution
+from app.persistence.repositories import get_execution
+
+
+def test_performance_profile_applies_pragmas(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "sqlite_profile", "performance")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'perf.db'}")
+
+    with engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()  # noqa: E731
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == settings.sqlite_busy_timeout_ms
+        assert pragma("cache_size") == -settings.sqlite_cache_size_kib
+
+
+def test_readers_are_not_blocked_by_an_open_write(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "sqlite_profile", "performance")
+    monkeypatch.setattr(settings, "sqlite_busy_timeout_ms", 2000)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Execution(plan_id=1))
+        session.commit()
+
+    with engine.connect() as writer:
+        writer.exec_driver_sql("BEGIN IMMEDIATE")
+        writer.exec_driver_sql("UPDATE execution SET status = 'running'")
+
+        start = time.perf_counter()
+        with Session(engine) as reader:
+            assert get_execution(reader, 1).status == "queued"
+        assert time.perf_counter() - start < 0.5
+        writer.exec_driver_sql("COMMIT")
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+
+import fakeredis
+from fastapi.testclient import TestClient
+from rq import Queue
+from sqlalchemy import event
+
+from app.main import create_app
+from app.persistence.db import async_engine
+
+
+@contextmanager
+def _count_statements():
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_write_endpoints_issue_one_statement_per_change(monkeypatch) -> None:
+    queue = Queue("test", connection=fakeredis.FakeRedis())
+    monkeypatch.setattr("app.api.routes.executions.get_queue", lambda lane="default": queue)
+    client = TestClient(create_app())
+
+    with _count_statements() as statements:
+        project = client.post("/projects", json={"name": "demo", "repo_path": "C:/tmp/demo"}).json()
+    assert len(statements) == 1, statements
+
+    with _count_statements() as statements:
+        plan = client.post(
+            "/commands/parse", json={"project_id": project["id"], "text": "Deploy v1.6 to staging"}
+        ).json()
+    # SELECT project, INSERT plan
+    assert len(statements) == 2, statements
+
+    with _count_statements() as statements:
+        approved = client.post(f"/executions/approve/{plan['plan_id']}").json()
+    # SELECT plan, UPDATE plan, INSERT execution
+    assert len(statements) == 3, statements
+
+    with _count_statements() as statements:
+        status = client.get(f"/executions/{approved['execution_id']}/status").json()
+    assert status["status"] == "queued"
+    assert len(statements) == 2, statements
@@ -0,0 +1,33 @@
+import fakeredis
+from fastapi.testclient import TestClient
+from rq import Queue
+from rq.worker import SimpleWorker
+
+from app.main import create_app
+from app.queue.queue import queue_name, worker_queue_names
+from app.queue.worker import build_worker
+
+
+def test_warm_worker_runs_jobs_in_process_and_stops_to_recycle(monkeypatch) -> None:
+    redis = fakeredis.FakeRedis()
+    monkeypatch.setattr(
+        "app.api.routes.executions.get_queue", lambda lane="default": Queue(queue_name(lane), connection=redis)
+    )
+    monkeypatch.setattr("app.queue.tasks.get_redis", lambda: redis)
+    client = TestClient(create_app())
+    project_id = client.post("/projects", json={"name": "warm", "repo_path": "C:/tmp/demo"}).json()["id"]
+    plan_ids = [
+        client.post("/commands/parse", json={"project_id": project_id, "text": f"Deploy v4.{i} to staging"}).json()[
+            "plan_id"
+        ]
+        for i in range(3)
+    ]
+    results = client.post("/executions/approve", json={"plan_ids": plan_ids}).json()["results"]
+
+    worker = build_worker(worker_queue_names(), redis, "warm")
+    assert type(worker) is SimpleWorker
+    worker.work(burst=True, max_jobs=2)
+
+    statuses = [client.get(f"/executions/{r['execution_id']}/status").json()["status"] for r in results]
+    assert statuses == ["succeeded", "succeeded", "queued"]
+    assert Queue(queue_name("default"), connection=redis).count == 1
@@ -0,0 +1,139 @@
+from datetime import UTC, datetime, timedelta
+
+import fakeredis
+from rq import Queue
+
+from app.queue.queue import queue_name
+from app.queue.supervisor import WorkerSupervisor
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime.now(UTC)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class _Process:
+    pids = iter(range(10_000, 20_000))
+
+    def __init__(self) -> None:
+        self.pid = next(self.pids)
+        self.returncode: int | None = None
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def terminate(self) -> None:
+        self.returncode = 0
+
+    def wait(self) -> int | None:
+        return self.returncode
+
+
+def test_supervisor_scales_with_the_backlog_and_restarts_crashed_workers() -> None:
+    redis = fakeredis.FakeRedis()
+    clock = _Clock()
+    spawned: list[_Process] = []
+
+    def spawn(lanes: str, mode: str) -> _Process:
+        assert (lanes, mode) == ("critical,default,bulk", "fork")
+        spawned.append(_Process())
+        return spawned[-1]
+
+    supervisor = WorkerSupervisor(
+        lanes="critical,default,bulk",
+        min_processes=1,
+        max_processes=4,
+        connection=redis,
+        spawn=spawn,
+        clock=clock,
+    )
+    supervisor.tick()
+    assert supervisor.processes == 1
+
+    bulk = Queue(queue_name("bulk"), connection=redis)
+    for _ in range(6):
+        bulk.enqueue("time.sleep", 1)
+    supervisor.tick()
+    assert supervisor.processes == 1  # jobs only just arrived
+
+    clock.advance(5)
+    depth, oldest_wait = supervisor.backlog()
+    assert depth == 6 and 4 < oldest_wait <= 5
+    supervisor.tick()
+    assert supervisor.processes == 4
+
+    clock.advance(30)
+    spawned[1].returncode = -9
+    supervisor.tick()
+    assert supervisor.processes == 4 and len(spawned) == 5
+
+    redis.delete(bulk.key)
+    supervisor.tick()
+    assert supervisor.processes == 4  # not idle for long enough yet
+    clock.advance(61)
+    supervisor.tick()
+    assert supervisor.processes == 1
+    assert sum(process.returncode == 0 for process in spawned) == 3
+
+    supervisor.shutdown()
+    assert all(process.returncode is not None for process in spawned)
+
+
+def test_crash_looping_workers_are_restarted_with_backoff() -> None:
+    clock = _Clock()
+    spawned: list[_Process] = []
+
+    def spawn(lanes: str, mode: str) -> _Process:
+        spawned.append(_Process())
+        return spawned[-1]
+
+    supervisor = WorkerSupervisor(
+        lanes="default", min_processes=1, max_processes=1, connection=fakeredis.FakeRedis(), spawn=spawn, clock=clock
+    )
+    supervisor.tick()
+    for backoff in (1, 2, 4):
+        spawned[-1].returncode = 1
+        supervisor.tick()
+        assert supervisor.processes == 0
+        clock.advance(backoff)
+        supervisor.tick()
+        assert supervisor.processes == 1
+    assert len(spawned) == 4
+
+    spawned[-1].returncode = 0  # a warm worker recycling itself
+    supervisor.tick()
+    assert supervisor.processes == 1 and len(spawned) == 5
+
+
+def test_pool_grows_to_the_demand_and_replaces_workers_that_recycle() -> None:
+    redis = fakeredis.FakeRedis()
+    clock = _Clock()
+    spawned: list[_Process] = []
+
+    def spawn(lanes: str, mode: str) -> _Process:
+        spawned.append(_Process())
+        return spawned[-1]
+
+    supervisor = WorkerSupervisor(
+        lanes="default", min_processes=1, max_processes=16, connection=redis, spawn=spawn, clock=clock
+    )
+    queue = Queue(queue_name("default"), connection=redis)
+    for _ in range(6):
+        queue.enqueue("time.sleep", 1)
+
+    # The new workers are still starting up; the jobs keep waiting meanwhile.
+    for _ in range(4):
+        clock.advance(5)
+        supervisor.tick()
+        assert supervisor.processes == 6
+
+    redis.delete(queue.key)
+    spawned[3].returncode = 0  # recycled above the minimum, before the pool is idle long enough
+    supervisor.tick()
+    assert supervisor.processes == 6 and len(spawned) == 7
@@ -1,11 +1,10 @@
 "use client";
 
-import { useCallback, useEffect, useMemo, useState, useTransition } from "react";
+import { useCallback, useEffect, useState, useTransition } from "react";
 import { Check, Loader2, Send } from "lucide-react";
 
-import { approvePlan, fetchExecution, parseCommand } from "@/lib/api";
-import { POLL_INTERVAL_MS } from "@/lib/config";
-import type { ExecutionDetail, PlanPreview, Project } from "@/lib/types";
+import { approvePlan, executionStreamUrl, parseCommand } from "@/lib/api";
+import type { ExecutionStatus, PlanPreview, Project } from "@/lib/types";
 import { cn } from "@/lib/utils";
 import { LiveLog } from "./live-log";
 import { StatusPill } from "./status-pill";
@@ -18,10 +17,11 @@ export function CommandConsole({ projects }: CommandConsoleProps) {
   const [selectedProject, setSelectedProject] = useState(() => projects.at(0)?.id ?? 0);
   const [commandText, setCommandText] = useState("Deploy the api service to staging and smoke test afterwards");
   const [planPreview, setPlanPreview] = useState<PlanPreview | null>(null);
-  const [execution, setExecution] = useState<ExecutionDetail | null>(null);
-  const [pollingId, setPollingId] = useState<number | null>(null);
+  const [execution, setExecution] = useState<{ id: number; status: ExecutionStatus } | null>(null);
+  const [logLines, setLogLines] = useState<string[]>([]);
+  const [streamingId, setStreamingId] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
-  const [isPolling, setIsPolling] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const [isPending, startTransition] = useTransition();
 
   useEffect(() => {
@@ -31,40 +31,42 @@ export function CommandConsole({ projects }: CommandConsoleProps) {
   }, [projects, selectedProject]);
 
   useEffect(() => {
-    if (!pollingId) {
-      setIsPolling(false);
+    if (!streamingId) {
+      setIsStreaming(false);
       return;
     }
 
-    setIsPolling(true);
-    let isCancelled = false;
+    setIsStreaming(true);
 
-    const poll = async () => {
-      try {
-        const data = await fetchExecution(pollingId);
-        if (!isCancelled) {
-          setExecution(data);
-          if (["failed", "succeeded", "rolled_back"].includes(data.status)) {
-            setIsPolling(false);
-            setPollingId(null);
-          }
-        }
-      } catch (pollError) {
-        if (!isCancelled) {
-          setError(pollError instanceof Error ? pollError.message : "Unable to fetch execution");
-          setIsPolling(false);
-        }
+    // The browser reconnects on its own and resumes via Last-Event-ID.
+    const source = new EventSource(executionStreamUrl(streamingId));
+
+    source.addEventListener("log", (event) => {
+      const { lines } = JSON.parse((event as MessageEvent<string>).data) as { lines: string[] };
+      setLogLines((prev) => [...prev, ...lines]);
+    });
+
+    source.addEventListener("status", (event) => {
+      const { status } = JSON.parse((event as MessageEvent<string>).data) as { status: ExecutionStatus };
+      setExecution({ id: streamingId, status });
+      if (["failed", "succeeded", "rolled_back"].includes(status)) {
+        source.close();
+        setIsStreaming(false);
+        setStreamingId(null);
       }
-    };
+    });
 
-    poll();
-    const id = setInterval(poll, POLL_INTERVAL_MS);
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        setError("Lost connection to the execution stream");
+        setIsStreaming(false);
+      }
+    };
 
     return () => {
-      isCancelled = true;
-      clearInterval(id);
+      source.close();
     };
-  }, [pollingId]);
+  }, [streamingId]);
 
   const handleParse = useCallback(() => {
     if (!selectedProject || !commandText.trim()) {
@@ -79,7 +81,8 @@ export function CommandConsole({ projects }: CommandConsoleProps) {
         const plan = await parseCommand({ project_id: selectedProject, text: commandText.trim() });
         setPlanPreview(plan);
         setExecution(null);
-        setPollingId(null);
+        setLogLines([]);
+        setStreamingId(null);
       } catch (err) {
         setError(err instanceof Error ? err.message : "Unable to parse command");
       }
@@ -92,14 +95,13 @@ export function CommandConsole({ projects }: CommandConsoleProps) {
 
     try {
       const approval = await approvePlan(planPreview.plan_id);
-      setPollingId(approval.execution_id);
+      setLogLines([]);
+      setStreamingId(approval.execution_id);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Unable to approve plan");
     }
   }, [planPreview]);
 
-  const logLines = useMemo(() => (execution?.logs ? execution.logs.trim().split("\n") : []), [execution?.logs]);
-
   return (
     <div className="grid gap-6 lg:grid-cols-2">
       <div className="rounded-3xl border border-white/5 bg-surface-800/70 p-6 shadow-card">
@@ -182,13 +184,13 @@ export function CommandConsole({ projects }: CommandConsoleProps) {
             <button
               type="button"
               onClick={handleApprove}
-              disabled={!planPreview || isPolling}
+              disabled={!planPreview || isStreaming}
               className={cn(
                 "flex w-full items-center justify-center gap-2 rounded-2xl border border-accent-400/50 bg-transparent px-4 py-3 text-sm font-semibold uppercase tracking-wide text-accent-300 transition",
-                (!planPreview || isPolling) && "opacity-40"
+                (!planPreview || isStreaming) && "opacity-40"
               )}
             >
-              {isPolling ? <Loader2 className="h-4 w-4 animate-spin" /> : <Check className="h-4 w-4" />} Approve & Execute
+              {isStreaming ? <Loader2 className="h-4 w-4 animate-spin" /> : <Check className="h-4 w-4" />} Approve & Execute
             </button>
           </div>
         ) : (
@@ -1,31 +1,53 @@
+"use client";
+
+import { useEffect, useState } from "react";
 import { Clock } from "lucide-react";
 
-import { mockHistory } from "@/lib/mock-history";
+import { fetchExecutions } from "@/lib/api";
+import type { ExecutionSummary } from "@/lib/types";
 import { StatusPill } from "../status-pill";
 
+function formatTimestamp(value: string): string {
+  // The API returns naive UTC timestamps.
+  const date = new Date(value.endsWith("Z") || value.includes("+") ? value : `${value}Z`);
+  return date.toLocaleString(undefined, { dateStyle: "medium", timeStyle: "short" });
+}
+
 export function HistoryPanel() {
+  const [executions, setExecutions] = useState<ExecutionSummary[]>([]);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    fetchExecutions({ limit: 5 })
+      .then((page) => setExecutions(page.items))
+      .catch((err) => setError(err instanceof Error ? err.message : "Unable to load executions"));
+  }, []);
+
   return (
     <section className="rounded-3xl border border-white/5 bg-surface-800/70 p-6 shadow-card">
       <div className="flex items-center gap-3">
         <Clock className="h-5 w-5 text-accent-300" />
         <div>
           <p className="text-xs uppercase tracking-[0.3em] text-white/60">Latest Executions</p>
-          <p className="text-white/70">Live data coming once /executions history endpoint lands.</p>
+          <p className="text-white/70">Most recent runs across all projects.</p>
         </div>
       </div>
+      {error ? <p className="mt-6 text-sm text-red-300">{error}</p> : null}
+      {!error && executions.length === 0 ? (
+        <p className="mt-6 text-sm text-white/60">No executions yet. Approve a plan to start one.</p>
+      ) : null}
       <ol className="mt-6 space-y-5">
-        {mockHistory.map((entry) => (
+        {executions.map((entry) => (
           <li key={entry.id} className="flex items-start gap-4">
             <div className="relative flex h-12 w-12 items-center justify-center rounded-2xl border border-white/10 bg-black/30">
               <span className="text-sm text-white/80">#{entry.id}</span>
             </div>
             <div className="flex-1 space-y-1">
               <div className="flex flex-wrap items-center gap-3">
-                <p className="font-display text-lg text-white">{entry.label}</p>
+                <p className="font-display text-lg text-white">{entry.command ?? `Plan #${entry.plan_id}`}</p>
                 <StatusPill status={entry.status} />
               </div>
-              <p className="text-sm text-white/70">{entry.summary}</p>
-              <p className="text-xs uppercase tracking-[0.3em] text-white/40">{entry.timestamp}</p>
+              <p className="text-xs uppercase tracking-[0.3em] text-white/40">{formatTimestamp(entry.created_at)}</p>
             </div>
           </li>
         ))}
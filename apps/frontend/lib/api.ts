@@ -1,5 +1,13 @@
 import { API_BASE_URL } from "./config";
-import type { ExecutionDetail, PlanPreview, Project } from "./types";
+import type {
+  ExecutionDetail,
+  ExecutionLogPage,
+  ExecutionStatusDetail,
+  ExecutionSummary,
+  Page,
+  PlanPreview,
+  Project
+} from "./types";
 
 async function handleResponse<T>(res: Response): Promise<T> {
   if (!res.ok) {
@@ -10,12 +18,13 @@ async function handleResponse<T>(res: Response): Promise<T> {
   return res.json() as Promise<T>;
 }
 
-export async function fetchProjects(): Promise<Project[]> {
-  const res = await fetch(`${API_BASE_URL}/projects`, { cache: "no-store" });
+export async function fetchProjects(limit = 200): Promise<Project[]> {
+  const res = await fetch(`${API_BASE_URL}/projects?limit=${limit}`, { cache: "no-store" });
   if (res.status === 404) {
     return [];
   }
-  return handleResponse<Project[]>(res);
+  const page = await handleResponse<Page<Project>>(res);
+  return page.items;
 }
 
 export async function createProject(payload: {
@@ -45,7 +54,40 @@ export async function approvePlan(planId: number): Promise<{ execution_id: numbe
   return handleResponse(res);
 }
 
+export async function fetchExecutions(
+  params: { project_id?: number; status?: string; after?: string | null; limit?: number } = {}
+): Promise<Page<ExecutionSummary>> {
+  const query = new URLSearchParams({ limit: String(params.limit ?? 20) });
+  if (params.project_id !== undefined) query.set("project_id", String(params.project_id));
+  if (params.status) query.set("status", params.status);
+  if (params.after) query.set("after", params.after);
+  const res = await fetch(`${API_BASE_URL}/executions?${query}`, { cache: "no-store" });
+  return handleResponse(res);
+}
+
 export async function fetchExecution(executionId: number): Promise<ExecutionDetail> {
   const res = await fetch(`${API_BASE_URL}/executions/${executionId}`, { cache: "no-store" });
   return handleResponse(res);
 }
+
+export async function fetchExecutionStatus(executionId: number): Promise<ExecutionStatusDetail> {
+  const res = await fetch(`${API_BASE_URL}/executions/${executionId}/status`, { cache: "no-store" });
+  return handleResponse(res);
+}
+
+export async function fetchExecutionLogs(
+  executionId: number,
+  after?: number | null,
+  limit = 200
+): Promise<ExecutionLogPage> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (after !== undefined && after !== null) {
+    params.set("after", String(after));
+  }
+  const res = await fetch(`${API_BASE_URL}/executions/${executionId}/logs?${params}`, { cache: "no-store" });
+  return handleResponse(res);
+}
+
+export function executionStreamUrl(executionId: number): string {
+  return `${API_BASE_URL}/executions/${executionId}/stream`;
+}
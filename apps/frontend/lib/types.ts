@@ -6,7 +6,7 @@ export type PlanStatus =
   | "rolled_back"
   | "succeeded";
 
-export type ExecutionStatus = "queued" | "running" | "failed" | "succeeded" | "rolled_back";
+export type ExecutionStatus = "queued" | "running" | "deploying" | "failed" | "succeeded" | "rolled_back";
 
 export interface Project {
   id: number;
@@ -15,6 +15,22 @@ export interface Project {
   repo_url?: string | null;
 }
 
+export interface Page<T> {
+  items: T[];
+  next_cursor?: string | null;
+}
+
+export interface ExecutionSummary {
+  id: number;
+  plan_id: number;
+  project_id?: number | null;
+  command?: string | null;
+  status: ExecutionStatus;
+  created_at: string;
+  started_at?: string | null;
+  finished_at?: string | null;
+}
+
 export interface PlanPreview {
   plan_id: number;
   action: string;
@@ -31,3 +47,21 @@ export interface ExecutionDetail {
   status: ExecutionStatus | PlanStatus;
   logs: string;
 }
+
+export interface ExecutionStatusDetail {
+  id: number;
+  plan_id: number;
+  status: ExecutionStatus;
+  started_at?: string | null;
+  finished_at?: string | null;
+  log_cursor?: number | null;
+}
+
+export interface ExecutionLogPage {
+  execution_id: number;
+  status: ExecutionStatus;
+  lines: string[];
+  byte_offset?: number | null;
+  next_cursor?: number | null;
+  has_more: boolean;
+}